@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+キャッシュウォーマーのテスト
+"""
+
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import yaml
+
+from tools.config_service import get_config_service
+from tools.cache_warmer import CacheWarmer, collect_targets, extract_asins
+from tools.pa_api_client import PAAPIClient, MAX_ITEMS_PER_REQUEST
+
+
+def _write_project(projects_dir, name, meta=None, article=None):
+    project_dir = projects_dir / name
+    (project_dir / 'meta').mkdir(parents=True)
+    if meta is not None:
+        with open(project_dir / 'meta' / 'project.yaml', 'w', encoding='utf-8') as f:
+            yaml.dump(meta, f, allow_unicode=True)
+    if article is not None:
+        (project_dir / 'articles').mkdir()
+        (project_dir / 'articles' / 'article.md').write_text(article, encoding='utf-8')
+
+
+class TestCollectTargets:
+    """参照ASIN・キーワード収集のテスト"""
+
+    def test_extract_asins(self):
+        """Amazon商品URLとASIN表記から重複なく抽出する"""
+        text = (
+            "[商品A](https://www.amazon.co.jp/dp/B0AAAAAAA1?tag=x) "
+            "https://www.amazon.com/Some-Product/dp/B0AAAAAAA2/ref=sr_1 "
+            "https://www.amazon.co.jp/gp/product/B0AAAAAAA1 "
+            "asin： b0aaaaaaa3 / B0TOOLONG123"
+        )
+        assert extract_asins(text) == ['B0AAAAAAA1', 'B0AAAAAAA2', 'B0AAAAAAA3']
+
+    def test_targets_are_ordered_by_publish_date(self):
+        """公開予定が近い順、次に最近公開、公開日不明は最後"""
+        projects_dir = Path(tempfile.mkdtemp()) / 'projects'
+        _write_project(projects_dir, 'published-2025-09-01', article="ASIN: B0PUB00001")
+        _write_project(projects_dir, 'undated', meta={'keywords': ['マウス']})
+        _write_project(projects_dir, 'upcoming', meta={'publish_date': '2025-09-20', 'keywords': 'キーボード'},
+                       article="https://www.amazon.co.jp/dp/B0UPC00001")
+        _write_project(projects_dir, 'soon-2025-09-12', article="https://www.amazon.co.jp/dp/B0SOON0001")
+        _write_project(projects_dir, 'empty-2025-09-11', meta={'project_id': 'empty'})
+
+        targets = collect_targets(projects_dir, today=date(2025, 9, 10))
+
+        assert [t.project_id for t in targets] == ['soon-2025-09-12', 'upcoming', 'published-2025-09-01', 'undated']
+        assert targets[1].asins == ['B0UPC00001']
+        assert targets[1].keywords == ['キーボード']
+        assert targets[3].publish_date is None
+
+    def test_category_is_used_when_keywords_are_missing(self):
+        """keywordsが無いプロジェクトはcategoryを検索キーワードにする"""
+        projects_dir = Path(tempfile.mkdtemp()) / 'projects'
+        _write_project(projects_dir, 'earphones', meta={'category': 'ワイヤレスイヤホン'})
+        _write_project(projects_dir, 'monitor', meta={'category': 'モニター', 'keywords': ['格闘ゲーム']})
+
+        targets = {t.project_id: t for t in collect_targets(projects_dir)}
+
+        assert targets['earphones'].keywords == ['ワイヤレスイヤホン']
+        assert targets['monitor'].keywords == ['格闘ゲーム']
+
+    def test_project_meta_is_loaded_through_config_service(self):
+        """project.yamlは設定サービス経由で読み込み、2回目の走査は解析済みの結果を使う"""
+        projects_dir = Path(tempfile.mkdtemp()) / 'projects'
+        _write_project(projects_dir, 'keyboard', meta={'keywords': ['キーボード']})
+        _write_project(projects_dir, 'broken')
+        (projects_dir / 'broken' / 'meta' / 'project.yaml').write_text('- a\n- b\n', encoding='utf-8')
+        service = get_config_service()
+        service.clear()
+
+        targets = collect_targets(projects_dir)
+        parsed = service.stats()['parsed']
+        collect_targets(projects_dir)
+
+        assert [t.project_id for t in targets] == ['keyboard']
+        assert service.stats()['parsed'] == parsed
+
+
+class TestCacheWarmer:
+    """CacheWarmerのテスト"""
+
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        self.projects_dir = Path(self.temp_dir) / "projects"
+
+        _write_project(self.projects_dir, 'monitor-2025-09-12', meta={'keywords': ['ゲーミングモニター']},
+                       article="https://www.amazon.co.jp/dp/B0WARM0001\nASIN: B0WARM0002")
+        _write_project(self.projects_dir, 'keyboard-2025-09-01', article="ASIN: B0WARM0002\nASIN: B0WARM0003")
+
+    def _write_settings(self, **overrides):
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 1,
+                'requests_per_second': 1000,
+                'cache_path': str(Path(self.temp_dir) / 'cache.sqlite3'),
+                'quota_ledger_path': str(Path(self.temp_dir) / 'quota.sqlite3'),
+                **overrides
+            }
+        }
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+
+    def _mock_api(self, mock_client):
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: {
+            'data': {'ItemsResult': {'Items': [{'ASIN': asin} for asin in items]}}
+        }
+        mock_instance.search_items.return_value = {'data': {'SearchResult': {'Items': []}}}
+        mock_client.return_value = mock_instance
+        return mock_instance
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_warm_prefetches_into_cache(self, mock_client):
+        """参照ASINとキーワードを取得し、記事生成時の呼び出しがキャッシュに当たる"""
+        self._write_settings(requests_per_day=100)
+        mock_instance = self._mock_api(mock_client)
+        client = PAAPIClient(config_path=self.settings_file, priority='low')
+
+        stats = CacheWarmer(client, projects_dir=self.projects_dir).warm(today=date(2025, 9, 10))
+
+        assert stats == {'projects': 2, 'asins': 3, 'keywords': 1, 'failed': 0, 'stopped_early': False}
+        fetched = [c.kwargs['items'] for c in mock_instance.get_items.call_args_list]
+        assert fetched == [['B0WARM0001', 'B0WARM0002'], ['B0WARM0003']]
+        assert mock_instance.search_items.call_args.kwargs['item_count'] == MAX_ITEMS_PER_REQUEST
+
+        # ASIN単位でもキャッシュされるため、チャンクの分け方が違う呼び出しも通信しない
+        assert client.get_product_details('B0WARM0002')['asin'] == 'B0WARM0002'
+        assert [p['asin'] for p in client.batch_lookup(['B0WARM0003', 'B0WARM0001'])] == [
+            'B0WARM0003', 'B0WARM0001'
+        ]
+        # search_productsの既定件数とprocess_affiliate_workflowの既定商品数（上限で丸められる）の検索も通信しない
+        client.search_products('ゲーミングモニター')
+        client.search_products('ゲーミングモニター', max_results=15)
+        assert mock_instance.get_items.call_count == 2
+        assert mock_instance.search_items.call_count == 1
+
+        # 2回目はキャッシュ済みのため通信しない
+        CacheWarmer(client, projects_dir=self.projects_dir).warm(today=date(2025, 9, 10))
+        assert mock_instance.get_items.call_count == 2
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_stops_when_quota_is_exhausted(self, mock_client):
+        """クォータの残りが無くなったら公開日が近い分だけ取得して打ち切る"""
+        self._write_settings(requests_per_day=2)
+        mock_instance = self._mock_api(mock_client)
+        client = PAAPIClient(config_path=self.settings_file)
+
+        stats = CacheWarmer(client, projects_dir=self.projects_dir).warm(today=date(2025, 9, 10))
+
+        assert stats['stopped_early'] is True
+        assert stats['asins'] == 2
+        assert stats['keywords'] == 1
+        fetched = [c.kwargs['items'] for c in mock_instance.get_items.call_args_list]
+        assert fetched == [['B0WARM0001', 'B0WARM0002']]
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_disabled_cache_is_a_no_op(self, mock_client):
+        """応答キャッシュが無効なら取得しない"""
+        self._write_settings(cache_enabled=False, quota_ledger_enabled=False)
+        mock_instance = self._mock_api(mock_client)
+        client = PAAPIClient(config_path=self.settings_file)
+
+        stats = CacheWarmer(client, projects_dir=self.projects_dir, interval=0.01).warm()
+
+        assert stats['asins'] == 0
+        mock_instance.get_items.assert_not_called()
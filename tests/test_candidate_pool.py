@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+候補プールのテスト
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import yaml
+
+from tools.candidate_pool import CandidatePool
+from tools.pa_api_client import PAAPIClient
+
+
+def _item(asin, reviews=1000, rating='4.5'):
+    return {
+        'ASIN': asin,
+        'ItemInfo': {'Title': {'DisplayValue': f'Product {asin}'}},
+        'CustomerReviews': {'StarRating': {'DisplayValue': rating}, 'Count': reviews}
+    }
+
+
+def _search_response(asins):
+    return {'data': {'SearchResult': {'Items': [_item(asin) for asin in asins]}}}
+
+
+class TestCandidatePool:
+    """CandidatePoolのテスト"""
+
+    def test_merge_extracts_unknown_asins_only(self):
+        """既知のASINは抽出せずプール済みの商品を返す"""
+        pool = CandidatePool()
+        extracted = []
+
+        def extract(items):
+            extracted.append([item['ASIN'] for item in items])
+            return [{'asin': item['ASIN']} for item in items]
+
+        first = pool.merge_items([_item('B0POOL0001'), _item('B0POOL0002')], extract, keyword='モニター')
+        second = pool.merge_items([_item('B0POOL0002'), _item('B0POOL0003'), _item('B0POOL0002'), {}],
+                                  extract, keyword='格闘ゲーム モニター')
+
+        assert extracted == [['B0POOL0001', 'B0POOL0002'], ['B0POOL0003']]
+        assert [p['asin'] for p in second] == ['B0POOL0002', 'B0POOL0003']
+        assert second[0] == first[1] and second[0] is not first[1]
+        assert pool.keywords_for('B0POOL0002') == ['モニター', '格闘ゲーム モニター']
+        assert len(pool) == 3 and 'B0POOL0003' in pool
+        assert pool.stats() == {'candidates': 3, 'added': 3, 'reused': 1, 'stage_computed': 0, 'stage_reused': 0}
+
+    def test_returned_products_are_copies(self):
+        """返した商品辞書を変更してもプールや他のキーワードの結果は変わらない（raw_dataは共有）"""
+        pool = CandidatePool()
+
+        def extract(items):
+            return [{'asin': item['ASIN'], 'price': 3000, 'features': ['A'], 'raw_data': item}
+                    for item in items]
+
+        first = pool.merge_items([_item('B0POOL0001')], extract, keyword='モニター')
+        first[0]['price'] = 9999
+        first[0]['features'].append('B')
+
+        second = pool.merge_items([_item('B0POOL0001')], extract, keyword='格闘ゲーム モニター')
+        assert {k: v for k, v in second[0].items() if k != 'raw_data'} == {
+            'asin': 'B0POOL0001', 'price': 3000, 'features': ['A']
+        }
+        # SDKのアイテム全体は複製せずに共有する
+        assert second[0]['raw_data'] is first[0]['raw_data']
+        pool.get('B0POOL0001')['price'] = 1
+        assert pool.products()[0]['price'] == 3000
+
+    def test_run_stage_computes_each_asin_once(self):
+        """後段処理は未処理のASINだけを計算し、欠けた結果は次回再計算する"""
+        pool = CandidatePool()
+        calls = []
+
+        def compute(asins):
+            calls.append(list(asins))
+            return {asin: f'result-{asin}' for asin in asins if asin != 'B0FAIL0001'}
+
+        assert pool.run_stage('sakura', ['B0STG00001', 'B0FAIL0001'], compute) == {'B0STG00001': 'result-B0STG00001'}
+        assert pool.run_stage('sakura', ['B0STG00002', 'B0STG00001', 'B0FAIL0001'], compute) == {
+            'B0STG00002': 'result-B0STG00002', 'B0STG00001': 'result-B0STG00001'
+        }
+        # 処理名ごとに結果は独立
+        pool.run_stage('playwright', ['B0STG00001'], compute)
+
+        assert calls == [['B0STG00001', 'B0FAIL0001'], ['B0STG00002', 'B0FAIL0001'], ['B0STG00001']]
+        assert pool.stats()['stage_reused'] == 1
+
+
+class TestSearchWithPool:
+    """search_productsとワークフローでの候補プール共有のテスト"""
+
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'requests_per_second': 100,
+                'cache_enabled': False,
+                'quota_ledger_enabled': False
+            }
+        }
+
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_overlapping_keywords_share_candidates(self, mock_client):
+        """重複するASINは1回だけ抽出され、品質基準は呼び出しごとに適用される"""
+        responses = {
+            'ゲーミングモニター': _search_response(['B0SHR00001', 'B0SHR00002']),
+            '格闘ゲーム モニター': _search_response(['B0SHR00002', 'B0SHR00003']),
+        }
+        mock_instance = MagicMock()
+        mock_instance.search_items.side_effect = lambda keywords, **kwargs: responses[keywords]
+        mock_client.return_value = mock_instance
+
+        client = PAAPIClient(config_path=self.settings_file)
+        pool = CandidatePool()
+        first = client.search_products('ゲーミングモニター', pool=pool)
+        with patch('tools.item_extractor.ItemExtractor.extract', autospec=True,
+                   side_effect=lambda self, items: [{'asin': i['ASIN'], 'review_count': 1000, 'rating': 4.5}
+                                                    for i in items]) as mock_extract:
+            second = client.search_products('格闘ゲーム モニター', pool=pool)
+
+        assert [i['ASIN'] for i in mock_extract.call_args.args[1]] == ['B0SHR00003']
+        assert second[0] == first[1]
+        assert pool.keywords_for('B0SHR00002') == ['ゲーミングモニター', '格闘ゲーム モニター']
+        assert client.search_products('格闘ゲーム モニター', min_reviews=5000, pool=pool) == []
+
+    @patch('tools.pa_api_client.PAAPIClient')
+    def test_concurrent_workflow_analyses_each_asin_once(self, mock_client_class):
+        """複数キーワードのワークフローでサクラ検出・チェックは各ASIN1回"""
+        from tools.models import IntegratedAffiliateLinkGenerator
+
+        def product(asin):
+            return SimpleNamespace(asin=asin, name=asin, price=3000, rating=4.5,
+                                   reviews_count=1000, affiliate_url=None)
+
+        shared = product('B0WF000002')
+        results = {'A': [product('B0WF000001'), shared], 'B': [shared, product('B0WF000003')]}
+        generator = IntegratedAffiliateLinkGenerator()
+        generator.paapi_client = MagicMock()
+        generator.paapi_client.search_products.side_effect = lambda keyword, **kwargs: results[keyword]
+        generator.sakura_detector = MagicMock()
+        generator.sakura_detector.batch_analyze.side_effect = lambda products: [
+            SimpleNamespace(product_asin=p.asin, sakura_score=0.1) for p in products
+        ]
+        generator.playwright_automation = MagicMock()
+        generator.playwright_automation.batch_check.side_effect = lambda asins: [
+            SimpleNamespace(asin=asin, sakura_score=0.1) for asin in asins
+        ]
+
+        result = generator.process_concurrent_workflow(['A', 'B'])
+
+        analysed = [[p.asin for p in c.args[0]] for c in generator.sakura_detector.batch_analyze.call_args_list]
+        checked = [c.args[0] for c in generator.playwright_automation.batch_check.call_args_list]
+        assert analysed == [['B0WF000001', 'B0WF000002'], ['B0WF000003']]
+        assert checked == [['B0WF000001', 'B0WF000002'], ['B0WF000003']]
+        assert [p['asin'] for p in result['concurrent_results'][1]['result']['products']] == [
+            'B0WF000002', 'B0WF000003'
+        ]
+        assert result['candidate_pool']['stage_reused'] == 2
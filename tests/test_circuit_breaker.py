@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+サーキットブレーカーのテスト
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from tools.circuit_breaker import CircuitBreaker, STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN
+from tools.pa_api_client import PAAPICircuitOpenError
+
+
+class FakeClock:
+    """テスト用の手動で進める時計"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """CircuitBreakerのテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10.0, clock=self.clock)
+    
+    def _fail(self, times):
+        for _ in range(times):
+            assert self.breaker.allow_request()
+            self.breaker.record_failure()
+    
+    def test_opens_after_consecutive_failures(self):
+        """連続失敗が閾値に達すると開く"""
+        self._fail(2)
+        assert self.breaker.state == STATE_CLOSED
+        
+        self._fail(1)
+        assert self.breaker.state == STATE_OPEN
+        assert not self.breaker.allow_request()
+        assert self.breaker.retry_after() == pytest.approx(10.0)
+    
+    def test_success_resets_failure_count(self):
+        """成功すると連続失敗数はリセットされる"""
+        self._fail(2)
+        assert self.breaker.allow_request()
+        self.breaker.record_success()
+        self._fail(2)
+        
+        assert self.breaker.state == STATE_CLOSED
+    
+    def test_half_open_allows_single_probe(self):
+        """半開状態では同時に1件だけプローブを通す"""
+        self._fail(3)
+        self.clock.now += 10.0
+        assert self.breaker.state == STATE_HALF_OPEN
+        
+        assert self.breaker.allow_request()
+        assert not self.breaker.allow_request()
+        
+        self.breaker.record_success()
+        assert self.breaker.state == STATE_CLOSED
+        assert self.breaker.allow_request()
+    
+    def test_failed_probe_reopens(self):
+        """プローブが失敗すると再び開き、回復待ちをやり直す"""
+        self._fail(3)
+        self.clock.now += 10.0
+        assert self.breaker.allow_request()
+        self.breaker.record_failure()
+        
+        assert self.breaker.state == STATE_OPEN
+        self.clock.now += 5.0
+        assert not self.breaker.allow_request()
+    
+    def test_release_frees_probe_slot(self):
+        """送信しなかったプローブは成否を記録せず枠だけ解放する"""
+        self._fail(3)
+        self.clock.now += 10.0
+        assert self.breaker.allow_request()
+        self.breaker.release()
+        
+        assert self.breaker.allow_request()
+    
+    def test_invalid_threshold(self):
+        """failure_thresholdは1以上"""
+        with pytest.raises(ValueError):
+            CircuitBreaker(failure_threshold=0)
+
+
+class TestWorkflowCircuitOpen:
+    """ワークフローでの回路開放時の扱い"""
+    
+    @patch('tools.pa_api_client.PAAPIClient')
+    def test_workflow_retry_does_not_rerun_when_circuit_open(self, mock_client_class):
+        """回路が開いている場合はワークフロー全体を再実行しない"""
+        from tools.models import IntegratedAffiliateLinkGenerator
+        
+        generator = IntegratedAffiliateLinkGenerator(enable_playwright=False)
+        generator.paapi_client = MagicMock()
+        generator.paapi_client.search_products.side_effect = PAAPICircuitOpenError("停止中")
+        
+        with patch('time.sleep') as mock_sleep:
+            result = generator.process_affiliate_workflow_with_retry("テスト", max_retries=3)
+        
+        assert result['error_type'] == 'circuit_open'
+        assert generator.paapi_client.search_products.call_count == 1
+        mock_sleep.assert_not_called()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+設定サービスのテスト
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import yaml
+
+from tools.config_service import ConfigService, get_config_service
+from tools.pa_api_client import PAAPIClient, PAAPIConfigError
+from tools.affiliate_link_generator_integrated import ProjectSettings
+
+
+class TestConfigService:
+    """ConfigServiceのテスト"""
+
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.config_dir = self.temp_dir / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        self._write({'pa_api': {'associate_tag': 'tag-22', 'cache_ttl': {'Offers': 600}},
+                     'research': {'categories': ['モニター', 'キーボード']}})
+
+    def _write(self, settings, age=10.0):
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            yaml.dump(settings, f, allow_unicode=True)
+        # 更新時刻を過去にずらし、内容比較なしでキャッシュを使える状態にする
+        mtime = self.settings_file.stat().st_mtime - age
+        os.utime(self.settings_file, (mtime, mtime))
+
+    def test_parses_once_and_returns_immutable_view(self):
+        """同じファイルは1回だけ解析し、変更できないビューを返す"""
+        service = ConfigService()
+        with patch('tools.config_service.yaml.safe_load', wraps=yaml.safe_load) as mock_load:
+            first = service.load(self.settings_file)
+            second = service.load(self.config_dir / ".." / "config" / "settings.yaml")
+
+        assert mock_load.call_count == 1
+        assert first is second
+        assert first['research']['categories'] == ('モニター', 'キーボード')
+        with pytest.raises(TypeError):
+            first['pa_api']['associate_tag'] = 'other'
+        assert service.stats()['hits'] == 1
+
+    def test_reloads_when_file_changes(self):
+        """更新時刻・サイズが変わった場合と直後の書き換えは読み直す"""
+        service = ConfigService()
+        assert service.load(self.settings_file)['pa_api']['associate_tag'] == 'tag-22'
+
+        self._write({'pa_api': {'associate_tag': 'tag-99-long'}})
+        assert service.load(self.settings_file)['pa_api']['associate_tag'] == 'tag-99-long'
+
+        # 同じサイズ・同じ更新時刻の書き換えも内容比較で検出する
+        self._write({'pa_api': {'associate_tag': 'tag-00-long'}}, age=0.0)
+        assert service.load(self.settings_file)['pa_api']['associate_tag'] == 'tag-00-long'
+        stat = self.settings_file.stat()
+        with open(self.settings_file, 'w', encoding='utf-8') as f:
+            yaml.dump({'pa_api': {'associate_tag': 'tag-11-long'}}, f)
+        os.utime(self.settings_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert service.load(self.settings_file)['pa_api']['associate_tag'] == 'tag-11-long'
+
+        with pytest.raises(ValueError):
+            self.settings_file.write_text("- not\n- a mapping\n", encoding='utf-8')
+            service.load(self.settings_file)
+
+    def test_find_config_path_walks_up(self):
+        """親ディレクトリ方向に設定ファイルを探索する"""
+        service = ConfigService()
+        nested = self.temp_dir / "projects" / "sample" / "articles"
+        nested.mkdir(parents=True)
+
+        assert service.find_config_path(nested) == self.settings_file
+        assert service.find_project_root(nested) == self.temp_dir
+        assert service.find_config_path(Path(tempfile.mkdtemp())) is None
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_tools_share_parsed_settings(self, mock_client):
+        """PAAPIClientとProjectSettingsが同じ解析結果を共有する"""
+        self._write({
+            'pa_api': {'access_key': 'test_access_key', 'secret_key': 'test_secret_key',
+                       'associate_tag': 'test_tag', 'cache_enabled': False,
+                       'quota_ledger_enabled': False},
+            'affiliate': {'amazon_associate_id': 'test_tag'}
+        })
+        get_config_service().clear()
+
+        with patch('tools.config_service.yaml.safe_load', wraps=yaml.safe_load) as mock_load:
+            PAAPIClient(config_path=self.settings_file)
+            PAAPIClient(config_path=self.settings_file)
+            settings = ProjectSettings(self.temp_dir)
+
+        assert mock_load.call_count == 1
+        assert settings.get_associate_id() == 'test_tag'
+
+        self.settings_file.write_text(": broken: [", encoding='utf-8')
+        with pytest.raises(PAAPIConfigError):
+            PAAPIClient(config_path=self.settings_file)
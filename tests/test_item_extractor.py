@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+テーブル駆動アイテム抽出器のテスト
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+
+import pytest
+
+from tools.item_extractor import ItemExtractor, FieldSpec, CompressedItem, get_extractor
+from tools.models import Product
+
+
+FULL_ITEM = {
+    'ASIN': 'B08N5WRWNW',
+    'ItemInfo': {
+        'Title': {'DisplayValue': 'ASUS TUF Gaming VG27AQ'},
+        'ByLineInfo': {'Brand': {'DisplayValue': 'ASUS'}},
+        'ManufactureInfo': {'ItemPartNumber': {'DisplayValue': 'VG27AQ'}}
+    },
+    'CustomerReviews': {
+        'StarRating': {'DisplayValue': '4.5'},
+        'Count': {'DisplayValue': '2500'}
+    },
+    'Offers': {
+        'Listings': [{'Price': {'Amount': 35000, 'DisplayAmount': '￥35,000'}}]
+    },
+    'Images': {'Primary': {'Medium': {'URL': 'https://example.com/image.jpg'}}}
+}
+
+
+class TestItemExtractor:
+    """ItemExtractorのテスト"""
+    
+    def test_detail_profile(self):
+        """詳細プロファイルで全フィールドを抽出"""
+        result = get_extractor('detail').extract_one(FULL_ITEM)
+        
+        assert result == {
+            'asin': 'B08N5WRWNW',
+            'title': 'ASUS TUF Gaming VG27AQ',
+            'brand': 'ASUS',
+            'part_number': 'VG27AQ',
+            'rating': 4.5,
+            'review_count': 2500,
+            'price': 35000,
+            'price_display': '￥35,000',
+            'image_url': 'https://example.com/image.jpg',
+            'raw_data': FULL_ITEM
+        }
+    
+    def test_defaults_and_conversion_errors(self):
+        """欠損は既定値、変換失敗はon_errorの値になる"""
+        item = {
+            'ASIN': 'B0TEST0001',
+            'CustomerReviews': {'StarRating': {'DisplayValue': 'N/A'}, 'Count': 'many'},
+            'Offers': {'Listings': []}
+        }
+        result = get_extractor('summary', raw_data='none').extract_one(item)
+        
+        assert result == {
+            'asin': 'B0TEST0001',
+            'title': 'Unknown',
+            'rating': 0.0,
+            'review_count': 0,
+            'price': None,
+            'price_display': None
+        }
+    
+    def test_required_field_missing_skips_item(self):
+        """ASINの無いアイテムや辞書でない要素は除外される"""
+        extractor = get_extractor('search')
+        
+        assert extractor.extract_one({'ItemInfo': {}}) is None
+        assert extractor.extract([{'ASIN': ''}, None, FULL_ITEM]) == [extractor.extract_one(FULL_ITEM)]
+    
+    def test_columnar_output(self):
+        """列指向の出力"""
+        items = [FULL_ITEM, {'ASIN': 'B0TEST0002'}, {'no_asin': True}]
+        columns = get_extractor('search', raw_data='none').extract_columns(items)
+        
+        assert columns['asin'] == ['B08N5WRWNW', 'B0TEST0002']
+        assert columns['rating'] == [4.5, 0.0]
+        assert columns['price'] == [35000, None]
+        assert 'raw_data' not in columns
+    
+    def test_unrequested_resources_are_not_walked(self):
+        """要求していないリソースのフィールドは既定値になる"""
+        extractor = get_extractor('detail', resources=['CustomerReviews.Count', 'Offers.Listings.Price'])
+        result = extractor.extract_one(FULL_ITEM)
+        
+        assert result['review_count'] == 2500
+        assert result['price'] == 35000
+        assert result['title'] == 'Unknown'
+        assert result['rating'] == 0.0
+    
+    def test_extractor_is_cached_per_profile_and_resources(self):
+        """抽出器はプロファイルとリソースの組ごとに一度だけ構築される"""
+        assert get_extractor('detail') is get_extractor('detail')
+        assert (get_extractor('detail', resources=['ItemInfo.Title', 'Offers.Listings.Price']) is
+                get_extractor('detail', resources=['Offers.Listings.Price', 'ItemInfo.Title']))
+        
+        with pytest.raises(ValueError):
+            get_extractor('no-such-profile')
+    
+    def test_custom_field_table(self):
+        """任意のフィールド表から抽出器を構築できる"""
+        extractor = ItemExtractor(
+            [FieldSpec('first_listing_price', ('Offers', 'Listings', 0, 'Price', 'Amount'))],
+            raw_data='none'
+        )
+        
+        assert extractor.extract_one(FULL_ITEM) == {'first_listing_price': 35000}
+    
+    def test_raw_data_modes(self):
+        """raw_dataは保持しない・圧縮して保持する設定を選べる"""
+        assert 'raw_data' not in get_extractor('detail', raw_data='none').extract_one(FULL_ITEM)
+        assert get_extractor('detail').extract_one(FULL_ITEM)['raw_data'] is FULL_ITEM
+        
+        raw = get_extractor('detail', raw_data='compressed').extract_one(FULL_ITEM)['raw_data']
+        assert isinstance(raw, CompressedItem)
+        assert raw == FULL_ITEM
+        assert raw['ItemInfo']['ByLineInfo']['Brand']['DisplayValue'] == 'ASUS'
+        assert raw.to_dict() == FULL_ITEM
+        assert raw.compressed_size < len(json.dumps(FULL_ITEM).encode('utf-8'))
+        
+        with pytest.raises(ValueError, match="raw_data"):
+            get_extractor('detail', raw_data='lazy')
+    
+    def test_product_model_profile(self):
+        """Product.from_api_responseは抽出器の結果から生成される"""
+        product = Product.from_api_response(FULL_ITEM)
+        
+        assert product.brand == 'ASUS'
+        assert product.model == 'VG27AQ'
+        assert product.reviews_count == 2500
+        assert Product.from_api_response({'CustomerReviews': {'StarRating': {'DisplayValue': 'x'}}}).rating is None
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API非同期クライアントのテスト
+"""
+
+import sys
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import yaml
+from amazon_paapi.errors import TooManyRequests
+
+from tools.pa_api_async import AsyncPAAPIClient
+from tools.pa_api_client import PAAPIClient, PAAPIRateLimitError
+
+
+def _search_response():
+    """品質基準を満たす商品と満たさない商品を含むSearchItems応答"""
+    return {
+        'data': {
+            'SearchResult': {
+                'Items': [
+                    {
+                        'ASIN': 'B08N5WRWNW',
+                        'ItemInfo': {'Title': {'DisplayValue': 'Good Product'}},
+                        'CustomerReviews': {'StarRating': {'DisplayValue': '4.5'}, 'Count': 1200},
+                        'Offers': {'Listings': [{'Price': {'Amount': 2980}}]}
+                    },
+                    {
+                        'ASIN': 'B08N5WRWN2',
+                        'ItemInfo': {'Title': {'DisplayValue': 'Few Reviews'}},
+                        'CustomerReviews': {'StarRating': {'DisplayValue': '4.8'}, 'Count': 10}
+                    }
+                ]
+            }
+        }
+    }
+
+
+def _items_response(asins):
+    """ASINリストに対応するGetItems応答"""
+    return {
+        'data': {
+            'ItemsResult': {
+                'Items': [
+                    {'ASIN': asin, 'ItemInfo': {'Title': {'DisplayValue': f'Product {asin}'}}}
+                    for asin in asins
+                ]
+            }
+        }
+    }
+
+
+class TestAsyncPAAPIClient:
+    """AsyncPAAPIClientのテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 3,
+                'retry_delay': 0.01,
+                'requests_per_second': 100,
+                'cache_enabled': False
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_search_products_filters_like_sync_client(self, mock_client):
+        """非同期版でも同期版と同じ品質フィルタリングを行う"""
+        mock_instance = MagicMock()
+        mock_instance.search_items.return_value = _search_response()
+        mock_client.return_value = mock_instance
+        
+        client = AsyncPAAPIClient(config_path=self.settings_file)
+        products = asyncio.run(client.search_products("テスト商品"))
+        
+        assert [p['asin'] for p in products] == ['B08N5WRWNW']
+        assert products[0]['price'] == 2980
+        assert products == PAAPIClient(config_path=self.settings_file).search_products("テスト商品")
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_blocking_sdk_call_does_not_block_event_loop(self, mock_client):
+        """SDK呼び出し中も他のコルーチンが進行し、リクエスト同士も重なる"""
+        def slow_get_items(items, **kwargs):
+            time.sleep(0.2)
+            return _items_response(items)
+        
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = slow_get_items
+        mock_client.return_value = mock_instance
+        
+        client = AsyncPAAPIClient(config_path=self.settings_file)
+        ticks = []
+        
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+        
+        async def run():
+            return await asyncio.gather(
+                client.batch_lookup(['B08N5WRWNW']),
+                client.batch_lookup(['B08N5WRWN2']),
+                ticker()
+            )
+        
+        start = time.monotonic()
+        first, second, _ = asyncio.run(run())
+        elapsed = time.monotonic() - start
+        
+        assert first[0]['asin'] == 'B08N5WRWNW'
+        assert second[0]['asin'] == 'B08N5WRWN2'
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.2
+        assert elapsed < 0.35
+    
+    @patch('tools.pa_api_client.time.sleep', side_effect=AssertionError("同期sleepが呼ばれました"))
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_retry_backoff_is_async(self, mock_client, mock_sleep):
+        """リトライ時のバックオフはasyncio.sleepで待機する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = [
+            TooManyRequests("Rate limit exceeded"),
+            _items_response(['B08N5WRWNW'])
+        ]
+        mock_client.return_value = mock_instance
+        
+        client = AsyncPAAPIClient(config_path=self.settings_file)
+        product = asyncio.run(client.get_product_details('B08N5WRWNW'))
+        
+        assert product['asin'] == 'B08N5WRWNW'
+        assert mock_instance.get_items.call_count == 2
+        mock_sleep.assert_not_called()
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_shares_rate_limiter_with_sync_client(self, mock_client):
+        """同期クライアントとレートリミッターを共有する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        sync_client = PAAPIClient(config_path=self.settings_file)
+        sync_client.config.requests_per_day = 1
+        sync_client.config.rate_limit_max_wait = 0.1
+        sync_client.batch_lookup(['B08N5WRWNW'])
+        
+        client = AsyncPAAPIClient(client=sync_client)
+        with pytest.raises(PAAPIRateLimitError):
+            asyncio.run(client.batch_lookup(['B08N5WRWN2']))
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_country_selects_marketplace(self, mock_client):
+        """countryを指定するとそのマーケットプレイスに送信する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = AsyncPAAPIClient(config_path=self.settings_file)
+        products = asyncio.run(client.batch_lookup(['B08N5WRWNW'], country='US'))
+        
+        assert products[0]['asin'] == 'B08N5WRWNW'
+        mock_client.assert_called_once_with('US')
+        assert 'US' in client.sync_client.get_rate_limit_status()
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_attempts_go_through_sync_client(self, mock_client):
+        """各試行は同期クライアントのattempt_requestで行う"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = [
+            TooManyRequests("Rate limit exceeded"),
+            _items_response(['B08N5WRWNW'])
+        ]
+        mock_client.return_value = mock_instance
+        
+        client = AsyncPAAPIClient(config_path=self.settings_file)
+        with patch.object(client.sync_client, 'attempt_request',
+                          wraps=client.sync_client.attempt_request) as attempt:
+            asyncio.run(client.get_items(['B08N5WRWNW']))
+        
+        assert attempt.call_count == 2
+        assert all(call.kwargs == {'rate_limit_acquired': True} for call in attempt.call_args_list)
+    
+    def test_batch_lookup_validates_size(self):
+        """11件以上のASINはValueError"""
+        client = AsyncPAAPIClient(config_path=self.settings_file)
+        
+        with pytest.raises(ValueError):
+            asyncio.run(client.batch_lookup([f'B0000000{i:02d}' for i in range(11)]))
+        assert asyncio.run(client.batch_lookup([])) == []
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API応答永続キャッシュのテスト
+"""
+
+import sys
+import sqlite3
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from tools.pa_api_cache import PAAPIResponseCache, normalize_params
+
+
+class FakeClock:
+    """テスト用の手動で進める時計"""
+    
+    def __init__(self):
+        self.now = 1_700_000_000.0
+    
+    def __call__(self):
+        return self.now
+
+
+RESPONSE = {'data': {'ItemsResult': {'Items': [{'ASIN': 'B08N5WRWNW'}]}}}
+
+
+class TestCacheKey:
+    """キャッシュキー生成のテスト"""
+    
+    def test_asin_order_and_case_do_not_matter(self):
+        """ASINの順序・大文字小文字・重複はキーに影響しない"""
+        key1 = PAAPIResponseCache.make_key('get_items', {'items': ['b0a', 'B0B']}, 'JP')
+        key2 = PAAPIResponseCache.make_key('get_items', {'items': ['B0B', 'B0A', 'B0A']}, 'JP')
+        
+        assert key1 == key2
+    
+    def test_keywords_whitespace_normalized(self):
+        """キーワードの余分な空白と大文字小文字は正規化される"""
+        params = normalize_params({'keywords': '  Gaming   Monitor ', 'item_page': 1})
+        
+        assert params == {'keywords': 'gaming monitor', 'item_page': 1}
+    
+    def test_marketplace_and_operation_distinguish_keys(self):
+        """マーケットプレイスと操作名が異なれば別キー"""
+        params = {'items': ['B0A']}
+        
+        assert (PAAPIResponseCache.make_key('get_items', params, 'JP') !=
+                PAAPIResponseCache.make_key('get_items', params, 'US'))
+        assert (PAAPIResponseCache.make_key('get_items', params, 'JP') !=
+                PAAPIResponseCache.make_key('search_items', params, 'JP'))
+
+
+class TestPAAPIResponseCache:
+    """PAAPIResponseCacheのテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / "cache" / "responses.sqlite3"
+        self.clock = FakeClock()
+        self.cache = PAAPIResponseCache(self.path, clock=self.clock)
+    
+    def test_roundtrip_and_persistence(self):
+        """保存した応答が別インスタンスからも取得できる"""
+        self.cache.set('k1', 'get_items', RESPONSE)
+        self.cache.close()
+        
+        reopened = PAAPIResponseCache(self.path, clock=self.clock)
+        assert reopened.get('k1') == RESPONSE
+    
+    def test_per_resource_freshness(self):
+        """価格は短時間で期限切れ、タイトルは長く有効"""
+        resources = ['ItemInfo.Title', 'Offers.Listings.Price']
+        self.cache.set('k1', 'get_items', RESPONSE, resources)
+        
+        self.clock.now += 2 * 3600
+        
+        assert self.cache.get('k1', ['Offers.Listings.Price']) is None
+        assert self.cache.get('k1', ['ItemInfo.Title']) == RESPONSE
+        
+        self.clock.now += 3 * 86400
+        assert self.cache.get('k1', ['ItemInfo.Title']) is None
+    
+    def test_narrower_entry_does_not_satisfy_broader_request(self):
+        """保存時より多くのリソースを要求した場合はミス"""
+        self.cache.set('k1', 'get_items', RESPONSE, ['ItemInfo.Title'])
+        
+        assert self.cache.get('k1', ['ItemInfo.Title', 'Images.Primary.Medium']) is None
+        assert self.cache.get('k1') is None
+    
+    def test_narrower_entry_does_not_replace_broader_one(self):
+        """狭いリソースの応答を保存しても広いリソースの応答は残る"""
+        detail = ['ItemInfo.Title', 'Images.Primary.Large', 'Offers.Listings.Price']
+        offers_only = {'data': {'ItemsResult': {'Items': [{'ASIN': 'B08N5WRWNW', 'Offers': {}}]}}}
+        self.cache.set('k1', 'get_items', RESPONSE, detail)
+        self.clock.now += 60
+        self.cache.set('k1', 'get_items', offers_only, ['Offers.Listings.Price'])
+        
+        assert self.cache.get('k1', detail) == RESPONSE
+        # 両方を満たす要求には新しい方を返す
+        assert self.cache.get('k1', ['Offers.Listings.Price']) == offers_only
+        assert self.cache.stats()['entries'] == 2
+    
+    def test_broader_entry_supersedes_narrower_ones(self):
+        """広いリソースの応答を保存すると、それに含まれる狭いエントリは削除される"""
+        self.cache.set('k1', 'get_items', RESPONSE, ['Offers.Listings.Price'])
+        self.cache.set('k1', 'get_items', RESPONSE, ['ItemInfo.Title', 'Offers.Listings.Price'])
+        assert self.cache.stats()['entries'] == 1
+        
+        self.cache.set('k1', 'get_items', RESPONSE)
+        assert self.cache.stats()['entries'] == 1
+    
+    def test_legacy_table_is_recreated(self):
+        """キーのみを主キーとする旧形式のデータベースは作り直す"""
+        legacy_path = Path(self.temp_dir) / "legacy.sqlite3"
+        conn = sqlite3.connect(str(legacy_path))
+        conn.execute(
+            "CREATE TABLE responses (key TEXT PRIMARY KEY, operation TEXT NOT NULL,"
+            " resources TEXT NOT NULL, created_at REAL NOT NULL, payload BLOB NOT NULL)"
+        )
+        conn.commit()
+        conn.close()
+        
+        cache = PAAPIResponseCache(legacy_path, clock=self.clock)
+        cache.set('k1', 'get_items', RESPONSE, ['ItemInfo.Title'])
+        cache.set('k1', 'get_items', RESPONSE, ['Offers.Listings.Price'])
+        assert cache.stats()['entries'] == 2
+        cache.close()
+    
+    def test_ttl_override(self):
+        """TTLはリソース種別ごとに上書きできる"""
+        cache = PAAPIResponseCache(Path(self.temp_dir) / "other.sqlite3",
+                                   resource_ttls={'Offers': 60}, clock=self.clock)
+        
+        assert cache.ttl_for(['Offers.Listings.Price']) == 60
+        assert cache.ttl_for(['ItemInfo.Title', 'Offers.Listings.Price']) == 60
+    
+    def test_unserializable_response_is_skipped(self):
+        """JSONに変換できない応答は保存しない"""
+        assert self.cache.set('k1', 'get_items', {'data': object()}) is False
+        assert self.cache.get('k1') is None
+    
+    def test_purge_expired_and_stats(self):
+        """期限切れエントリの削除と統計"""
+        self.cache.set('k1', 'get_items', RESPONSE)
+        self.cache.get('k1')
+        self.cache.get('missing')
+        
+        stats = self.cache.stats()
+        assert stats['entries'] == 1
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        
+        self.clock.now += 30 * 86400
+        assert self.cache.purge_expired() == 1
@@ -9,11 +9,15 @@ Red-Green-Refactor サイクルで進めます。
 
 import os
 import pytest
+import sqlite3
 import tempfile
+import threading
+import time
 import yaml
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from botocore.exceptions import ClientError, BotoCoreError
+from amazon_paapi.errors import TooManyRequests, RequestError
 
 # 実装済みのクラスをインポート（TDD Green段階）
 import sys
@@ -23,10 +27,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from tools.pa_api_client import (
     PAAPIClient, 
     PAAPIConfig,
+    AmazonApiPool,
+    RESOURCE_PROFILES,
+    DEFAULT_SEARCH_RESOURCES,
+    resolve_resources,
     PAAPIAuthenticationError,
     PAAPIConfigError,
     PAAPIRateLimitError,
-    PAAPINetworkError
+    PAAPINetworkError,
+    PAAPICircuitOpenError
 )
 
 
@@ -695,5 +704,1086 @@ class TestErrorHandling:
         assert results[0]['title'] == 'Found Product'
 
 
+
+class TestClientPool:
+    """AmazonApi接続プールのテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        self.test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 3,
+                'retry_delay': 0.01,
+                'requests_per_second': 100,
+                'cache_enabled': False
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(self.test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_client_reused_across_calls(self, mock_client):
+        """複数回の呼び出しでAmazonApiが再利用されることを確認"""
+        mock_client.return_value = MagicMock()
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        client.search_items(keywords="monitor")
+        client.search_items(keywords="keyboard")
+        client.get_items(asins=['B08N5WRWNW'])
+        
+        assert mock_client.call_count == 1
+        mock_client.assert_called_with('JP')
+        assert client.get_pool_stats()['reused'] == 2
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_client_recreated_only_after_connection_error(self, mock_client):
+        """接続エラー時のみインスタンスが再生成されることを確認"""
+        mock_instance = MagicMock()
+        mock_instance.search_items.side_effect = [
+            ConnectionError("connection reset"),
+            {'data': {'SearchResult': {'Items': []}}},
+            {'data': {'SearchResult': {'Items': []}}}
+        ]
+        mock_client.return_value = mock_instance
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        client.search_items(keywords="monitor")
+        client.search_items(keywords="monitor")
+        
+        # 初回生成 + 接続エラー後の再生成の2回のみ
+        assert mock_client.call_count == 2
+        assert client.get_pool_stats()['discarded'] == 1
+    
+    def test_pool_is_thread_safe(self):
+        """並行取得時にインスタンスが重複して貸し出されないことを確認"""
+        
+        created = []
+        pool = AmazonApiPool(lambda country: created.append(country) or object(), max_size=4)
+        in_use = set()
+        lock = threading.Lock()
+        errors = []
+        
+        def worker():
+            for _ in range(50):
+                with pool.connection('JP') as api:
+                    with lock:
+                        if id(api) in in_use:
+                            errors.append(api)
+                        in_use.add(id(api))
+                    with lock:
+                        in_use.discard(id(api))
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert errors == []
+        assert pool.stats()['idle']['JP'] <= 4
+        assert len(created) <= 8
+
+
+class TestRateLimiting:
+    """送信前レート制限のテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        self.test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'requests_per_day': 2,
+                'requests_per_second': 100,
+                'rate_limit_max_wait': 1.0
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(self.test_settings, f)
+    
+    def test_config_loads_rate_limit_settings(self):
+        """レート制限設定が読み込まれることを確認"""
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        assert client.config.requests_per_second == 100
+        assert client.config.rate_limit_max_wait == 1.0
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_daily_quota_enforced_before_sending(self, mock_client):
+        """1日の上限を超える呼び出しは送信前に失敗する"""
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        client.search_items(keywords="monitor")
+        client.search_items(keywords="monitor")
+        with pytest.raises(PAAPIRateLimitError, match="レート制限"):
+            client.search_items(keywords="monitor")
+        
+        assert mock_instance.search_items.call_count == 2
+        assert client.get_rate_limit_status()['JP']['daily_tokens'] < 1
+
+
+class TestResponseCaching:
+    """応答キャッシュとクライアントの統合テスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        self.test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'requests_per_second': 100,
+                'requests_per_day': 1
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(self.test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_cache_hit_skips_network_and_quota(self, mock_client):
+        """キャッシュヒット時は通信もクォータ消費も行わない"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        first = client.get_items(asins=['B08N5WRWNW'])
+        # 1日の上限（1件）を使い切っていてもキャッシュからは取得できる
+        second = client.get_items(asins=['B08N5WRWNW'])
+        
+        assert first == second
+        assert mock_instance.get_items.call_count == 1
+        assert client.get_cache_stats()['hits'] == 1
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_multi_asin_response_is_cached_per_asin(self, mock_client):
+        """複数ASINの応答はASIN単位でも再利用でき、欠けたASINがあれば通信する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        self.test_settings['pa_api']['requests_per_day'] = 100
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(self.test_settings, f)
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        client.get_items(asins=['B0CACHE001', 'B0CACHE002', 'B0CACHE003'])
+        single = client.get_items(asins=['B0CACHE002'])
+        pair = client.get_items(asins=['B0CACHE003', 'B0CACHE001'])
+        assert mock_instance.get_items.call_count == 1
+        assert [i['ASIN'] for i in single['data']['ItemsResult']['Items']] == ['B0CACHE002']
+        assert [i['ASIN'] for i in pair['data']['ItemsResult']['Items']] == ['B0CACHE003', 'B0CACHE001']
+        
+        client.get_items(asins=['B0CACHE001', 'B0CACHE004'])
+        assert mock_instance.get_items.call_count == 2
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_cache_survives_client_restart(self, mock_client):
+        """別プロセス相当の新しいクライアントでもキャッシュを再利用する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        PAAPIClient(config_path=self.settings_file).get_items(asins=['B08N5WRWNW'])
+        restarted = PAAPIClient(config_path=self.settings_file)
+        restarted.get_items(asins=['B08N5WRWNW'])
+        
+        assert mock_instance.get_items.call_count == 1
+        assert (Path(self.temp_dir) / ".cache" / "pa_api" / "responses.sqlite3").exists()
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_use_cache_false_bypasses_read(self, mock_client):
+        """use_cache=Falseでは常に通信する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        self.test_settings['pa_api']['requests_per_day'] = 100
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(self.test_settings, f)
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        client.get_items(asins=['B08N5WRWNW'])
+        client.get_items(asins=['B08N5WRWNW'], use_cache=False)
+        
+        assert mock_instance.get_items.call_count == 2
+
+
+
+def _sdk_request_error(status, reason="Service Unavailable"):
+    """SDK 5.0.1がHTTPエラー応答から送出するRequestErrorを生成"""
+    from amazon_paapi.helpers.requests import _manage_response_exceptions
+    from amazon_paapi.sdk.rest import ApiException
+    try:
+        try:
+            raise ApiException(status=status, reason=reason)
+        except ApiException as exc:
+            _manage_response_exceptions(exc)
+    except RequestError as error:
+        return error
+
+
+def _items_response(asins):
+    """ASINリストに対応するGetItems応答（新しいSDK形式）を生成"""
+    return {
+        'data': {
+            'ItemsResult': {
+                'Items': [
+                    {
+                        'ASIN': asin,
+                        'ItemInfo': {'Title': {'DisplayValue': f'Product {asin}'}},
+                        'CustomerReviews': {
+                            'StarRating': {'DisplayValue': '4.5'},
+                            'Count': 1000
+                        }
+                    }
+                    for asin in asins
+                ]
+            }
+        }
+    }
+
+
+class TestBulkLookup:
+    """任意件数ASINの一括取得テスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        self.test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 1,
+                'retry_delay': 0.01,
+                'requests_per_second': 100
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(self.test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_bulk_lookup_chunks_and_deduplicates(self, mock_client):
+        """重複排除と10件単位の分割を確認"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        asins = [f"B0TEST{i:04d}" for i in range(25)]
+        results = list(client.bulk_lookup(asins + asins[:5]))
+        
+        assert sorted(r['asin'] for r in results) == sorted(asins)
+        assert mock_instance.get_items.call_count == 3
+        for call in mock_instance.get_items.call_args_list:
+            assert len(call.kwargs['items']) <= 10
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_bulk_lookup_streams_results(self, mock_client):
+        """結果がジェネレータとして逐次返されることを確認"""
+        import types
+        
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        stream = client.bulk_lookup([f"B0TEST{i:04d}" for i in range(30)], max_workers=2)
+        
+        assert isinstance(stream, types.GeneratorType)
+        first = next(stream)
+        assert first['asin'].startswith("B0TEST")
+        stream.close()
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_bulk_lookup_skips_failed_chunks(self, mock_client):
+        """raise_on_error=Falseでは失敗チャンクをスキップすることを確認"""
+        def get_items(items, **kwargs):
+            if "B0TEST0000" in items:
+                raise TooManyRequests("throttled")
+            return _items_response(items)
+        
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = get_items
+        mock_client.return_value = mock_instance
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        asins = [f"B0TEST{i:04d}" for i in range(20)]
+        results = list(client.bulk_lookup(asins, raise_on_error=False))
+        
+        assert len(results) == 10
+        with pytest.raises(PAAPIRateLimitError):
+            list(client.bulk_lookup(asins))
+
+
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
+
+
+class TestOfferRefresh:
+    """価格の差分更新のテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'requests_per_second': 100,
+                'cache_path': str(Path(self.temp_dir) / 'cache.sqlite3'),
+                'quota_ledger_enabled': False
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_merges_offers_and_reports_changes(self, mock_client):
+        """価格とレビュー数のみを取得し、変更のあったASINを報告する"""
+        prices = {'B0OFR00001': 30000, 'B0OFR00002': 12000}
+        
+        def get_items(items, resources, **kwargs):
+            return {'data': {'ItemsResult': {'Items': [
+                {
+                    'ASIN': asin,
+                    'CustomerReviews': {'Count': 800},
+                    'Offers': {'Listings': [{'Price': {'Amount': prices[asin],
+                                                       'DisplayAmount': f"￥{prices[asin]:,}"}}]}
+                }
+                for asin in items if asin in prices
+            ]}}}
+        
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = get_items
+        mock_client.return_value = mock_instance
+        
+        records = [
+            {'asin': 'B0OFR00001', 'title': 'Monitor', 'price': 35000, 'price_display': '￥35,000',
+             'review_count': 750},
+            {'asin': 'B0OFR00002', 'title': 'Mouse', 'price': 12000, 'price_display': '￥12,000',
+             'review_count': 800},
+            {'asin': 'B0OFR00003', 'title': 'Gone', 'price': 5000, 'price_display': '￥5,000',
+             'review_count': 10},
+        ]
+        client = PAAPIClient(config_path=self.settings_file)
+        result = client.refresh_offers(records)
+        
+        assert result['changed'] == ['B0OFR00001']
+        assert result['unchanged'] == ['B0OFR00002']
+        assert result['missing'] == ['B0OFR00003']
+        assert result['changes']['B0OFR00001'] == {
+            'price': (35000, 30000),
+            'price_display': ('￥35,000', '￥30,000'),
+            'review_count': (750, 800)
+        }
+        # 価格以外のフィールドは保持される
+        assert records[0]['title'] == 'Monitor'
+        assert records[0]['price'] == 30000
+        assert records[2]['price'] == 5000
+        assert mock_instance.get_items.call_args.kwargs['resources'] == RESOURCE_PROFILES['offers-refresh']
+        
+        # キャッシュを使わずに毎回取得し直す
+        client.refresh_offers(records)
+        assert mock_instance.get_items.call_count == 2
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_refresh_keeps_cached_details(self, mock_client):
+        """価格の更新が記事用の詳細取得のキャッシュを上書きしない"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        detail_resources = RESOURCE_PROFILES['article-detail']
+        client.get_items(asins=['B0OFR00001'], resources=detail_resources)
+        client.refresh_offers([{'asin': 'B0OFR00001'}])
+        client.get_items(asins=['B0OFR00001'], resources=detail_resources)
+        
+        assert mock_instance.get_items.call_count == 2
+        client.close()
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_close_closes_databases(self, mock_client):
+        """close()で応答キャッシュと使用量台帳の接続を閉じる"""
+        mock_client.return_value = MagicMock()
+        
+        with PAAPIClient(config_path=self.settings_file) as client:
+            cache = client._response_cache
+        
+        with pytest.raises(sqlite3.ProgrammingError):
+            cache.stats()
+
+
+class TestMarketplaceFanOut:
+    """マーケットプレイス横断取得のテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test-22',
+                'associate_tags': {'us': 'test-20', 'UK': 'test-21'},
+                'region': 'ap-northeast-1',
+                'retry_attempts': 1,
+                'requests_per_second': 100,
+                'cache_enabled': False,
+                'circuit_failure_threshold': 0
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_merges_per_asin_across_countries(self, mock_client):
+        """国ごとの結果がASIN単位にまとめられ、国ごとに独立したレート制限を使う"""
+        catalog = {'JP': {'B0MKT00001', 'B0MKT00002'}, 'US': {'B0MKT00001'}, 'UK': set()}
+        instances = {}
+        
+        def create(country):
+            instance = MagicMock()
+            instance.get_items.side_effect = lambda items, **kwargs: _items_response(
+                [asin for asin in items if asin in catalog[country]]
+            )
+            instances[country] = instance
+            return instance
+        
+        mock_client.side_effect = create
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        results = client.lookup_across_marketplaces(['b0mkt00002', 'B0MKT00001'])
+        
+        assert list(results) == ['B0MKT00002', 'B0MKT00001']
+        assert list(results['B0MKT00001']) == ['JP', 'US', 'UK']
+        assert results['B0MKT00001']['US']['asin'] == 'B0MKT00001'
+        assert results['B0MKT00002']['US'] is None
+        assert results['B0MKT00001']['UK'] is None
+        assert set(client.get_rate_limit_status()) == {'JP', 'US', 'UK'}
+        assert client._quota_scope('US') == 'test-20:US'
+        assert client._quota_scope('JP') == 'test-22:JP'
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_runs_countries_concurrently_and_skips_failures(self, mock_client):
+        """国ごとのリクエストは並行実行され、失敗した国は除外できる"""
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def create(country):
+            instance = MagicMock()
+            if country == 'UK':
+                instance.get_items.side_effect = _sdk_request_error(503)
+            else:
+                def get_items(items, **kwargs):
+                    # JPとUSが同時に実行中でなければタイムアウトする
+                    barrier.wait()
+                    return _items_response(items)
+                instance.get_items.side_effect = get_items
+            return instance
+        
+        mock_client.side_effect = create
+        client = PAAPIClient(config_path=self.settings_file)
+        
+        results = client.lookup_across_marketplaces(['B0MKT00001'], raise_on_error=False)
+        assert list(results['B0MKT00001']) == ['JP', 'US']
+        
+        with pytest.raises(PAAPINetworkError):
+            client.lookup_across_marketplaces(['B0MKT00001'], countries=['UK'])
+        with pytest.raises(ValueError):
+            client.lookup_across_marketplaces(['B0MKT00001'], countries=[])
+
+
+class TestResourceSelection:
+    """リソース指定の転送とプロファイルのテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'requests_per_second': 100,
+                'cache_enabled': False
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    def test_resolve_resources(self):
+        """プロファイル名・リスト・未指定の解決"""
+        assert resolve_resources('ranking-minimal', []) == [
+            "CustomerReviews.StarRating",
+            "CustomerReviews.Count",
+            "Offers.Listings.Price"
+        ]
+        assert resolve_resources(None, DEFAULT_SEARCH_RESOURCES) == DEFAULT_SEARCH_RESOURCES
+        assert resolve_resources(['ItemInfo.Title', 'ItemInfo.Title'], []) == ['ItemInfo.Title']
+        
+        with pytest.raises(ValueError, match="未知のリソースプロファイル"):
+            resolve_resources('no-such-profile', [])
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_resources_forwarded_to_sdk(self, mock_client):
+        """指定したリソースがSDKに渡される"""
+        mock_instance = MagicMock()
+        mock_instance.search_items.return_value = {'data': {'SearchResult': {'Items': []}}}
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        client.search_items("テスト")
+        client.get_items(asins=['B08N5WRWNW'], resources='ranking-minimal')
+        
+        assert mock_instance.search_items.call_args.kwargs['resources'] == DEFAULT_SEARCH_RESOURCES
+        assert mock_instance.get_items.call_args.kwargs['resources'] == RESOURCE_PROFILES['ranking-minimal']
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_detail_lookup_uses_article_profile(self, mock_client):
+        """詳細取得はブランド・型番を含むarticle-detailプロファイルを使う"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        client.batch_lookup(['B08N5WRWNW'])
+        requested = mock_instance.get_items.call_args.kwargs['resources']
+        assert "ItemInfo.ByLineInfo" in requested
+        assert "ItemInfo.ManufactureInfo" in requested
+        
+        list(client.bulk_lookup(['B08N5WRWNW'], resources='ranking-minimal'))
+        assert mock_instance.get_items.call_args.kwargs['resources'] == RESOURCE_PROFILES['ranking-minimal']
+    
+    def test_real_sdk_request_carries_narrowed_resources(self):
+        """実際のSDKで送信されるリクエストのResourcesが要求したリソースに絞られる"""
+        from types import SimpleNamespace
+        from amazon_paapi.sdk.api.default_api import DefaultApi
+        
+        sent = []
+        
+        def fake_send(api, request):
+            sent.append(request)
+            return SimpleNamespace(items_result=SimpleNamespace(items=[]),
+                                   search_result=SimpleNamespace(items=[]))
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        # リクエストの組み立てはSDKのまま、HTTP送信だけを差し替える
+        with patch.object(DefaultApi, 'get_items', autospec=True, side_effect=fake_send), \
+                patch.object(DefaultApi, 'search_items', autospec=True, side_effect=fake_send):
+            client.get_items(asins=['B08N5WRWNW'], resources='ranking-minimal')
+            client.search_items("テスト", resources='offers-refresh')
+        
+        assert [type(request).__name__ for request in sent] == ['GetItemsRequest', 'SearchItemsRequest']
+        assert sent[0].item_ids == ['B08N5WRWNW']
+        assert sent[0].resources == RESOURCE_PROFILES['ranking-minimal']
+        assert sent[1].keywords == "テスト"
+        assert sent[1].resources == RESOURCE_PROFILES['offers-refresh']
+    
+    def test_plain_sdk_does_not_receive_resources(self):
+        """resourcesを受け付けない素のAmazonApiにはresourcesを渡さない"""
+        from amazon_paapi import AmazonApi
+        from amazon_paapi.helpers import requests as sdk_requests
+        
+        built = []
+        
+        def fake_response(amazon_api, request):
+            built.append(request)
+            return []
+        
+        client = PAAPIClient(
+            config_path=self.settings_file,
+            transport=lambda country: AmazonApi('key', 'secret', 'tag', country, throttling=0)
+        )
+        with patch.object(sdk_requests, 'get_items_response', side_effect=fake_response):
+            client.get_items(asins=['B08N5WRWNW'], resources='ranking-minimal')
+        
+        assert built[0].item_ids == ['B08N5WRWNW']
+        assert built[0].resources  # SDKが設定した全リソース
+
+
+def _search_page(page, count=10, qualified=True):
+    """ページ番号に対応するSearchItems応答を生成"""
+    return {
+        'data': {
+            'SearchResult': {
+                'Items': [
+                    {
+                        'ASIN': f'B0P{page:02d}{i:05d}',
+                        'ItemInfo': {'Title': {'DisplayValue': f'Page {page} Item {i}'}},
+                        'CustomerReviews': {
+                            'StarRating': {'DisplayValue': '4.5'},
+                            'Count': 1000 if qualified and i % 2 == 0 else 10
+                        }
+                    }
+                    for i in range(count)
+                ]
+            }
+        }
+    }
+
+
+class TestRawDataMode:
+    """抽出結果のraw_data保持方法のテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'requests_per_second': 100,
+                'cache_enabled': False,
+                'raw_data_mode': 'none'
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_client_default_and_per_call_override(self, mock_client):
+        """クライアント単位の設定と呼び出しごとの上書き"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        assert client.config.raw_data_mode == 'none'
+        
+        lean = client.batch_lookup(['B0RAW00001', 'B0RAW00002'])
+        assert [p['asin'] for p in lean] == ['B0RAW00001', 'B0RAW00002']
+        assert all('raw_data' not in p for p in lean)
+        
+        compressed = client.get_product_details('B0RAW00003', raw_data='compressed')
+        assert compressed['raw_data']['ASIN'] == 'B0RAW00003'
+        
+        full = client.get_product_details('B0RAW00004', raw_data='full')
+        assert isinstance(full['raw_data'], dict)
+    
+    def test_invalid_mode_in_settings(self):
+        """不正なraw_data_modeは設定エラー"""
+        with open(self.settings_file) as f:
+            settings = yaml.safe_load(f)
+        settings['pa_api']['raw_data_mode'] = 'lazy'
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(settings, f)
+        
+        with pytest.raises(PAAPIConfigError, match="raw_data_mode"):
+            PAAPIClient(config_path=self.settings_file)
+
+
+class TestIterSearch:
+    """複数ページ検索ジェネレーターのテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'requests_per_second': 100,
+                'cache_enabled': False
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_stops_once_enough_products(self, mock_client):
+        """必要件数に達したら以降のページは取得しない"""
+        mock_instance = MagicMock()
+        mock_instance.search_items.side_effect = lambda item_page, **kwargs: _search_page(item_page)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        products = list(client.iter_search("テスト", max_results=12))
+        
+        # 1ページあたり5件が基準を満たすため3ページ目で打ち切り
+        assert len(products) == 12
+        assert all(p['review_count'] >= 500 for p in products)
+        assert [c.kwargs['item_page'] for c in mock_instance.search_items.call_args_list] == [1, 2, 3]
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_stops_at_last_page(self, mock_client):
+        """10件未満のページで終了し、max_pagesを超えない"""
+        mock_instance = MagicMock()
+        mock_instance.search_items.side_effect = (
+            lambda item_page, **kwargs: _search_page(item_page, count=10 if item_page < 2 else 4)
+        )
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        assert len(list(client.iter_search("テスト"))) == 7
+        assert mock_instance.search_items.call_count == 2
+        
+        mock_instance.search_items.reset_mock()
+        mock_instance.search_items.side_effect = lambda item_page, **kwargs: _search_page(item_page)
+        assert len(list(client.iter_search("テスト", max_pages=3))) == 15
+        assert mock_instance.search_items.call_count == 3
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_prefetches_next_page(self, mock_client):
+        """呼び出し側が処理している間に次ページを先読みする"""
+        page_two_requested = threading.Event()
+        
+        def search(item_page, **kwargs):
+            if item_page == 2:
+                page_two_requested.set()
+            return _search_page(item_page)
+        
+        mock_instance = MagicMock()
+        mock_instance.search_items.side_effect = search
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        iterator = client.iter_search("テスト", max_pages=2)
+        next(iterator)
+        
+        # 1ページ目の最初の商品を処理している間に2ページ目が要求される
+        assert page_two_requested.wait(timeout=2.0)
+        iterator.close()
+
+
+class TestRequestCoalescing:
+    """同一ASINの同時取得の集約テスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'requests_per_second': 100,
+                'cache_enabled': False,
+                'coalesce_linger': 0.1
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    def _run_concurrently(self, func, args_list):
+        """複数スレッドから同時に呼び出して結果を返す"""
+        results = [None] * len(args_list)
+        barrier = threading.Barrier(len(args_list))
+        
+        def worker(index, args):
+            barrier.wait()
+            results[index] = func(*args)
+        
+        threads = [threading.Thread(target=worker, args=(i, args)) for i, args in enumerate(args_list)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_concurrent_lookups_share_requests(self, mock_client):
+        """他の取得が進行中のとき、同じASINや少数のASINの同時取得が1リクエストにまとめられる"""
+        release = threading.Event()
+        
+        def get_items(items, **kwargs):
+            if 'B0HOLD0000' in items:
+                release.wait(5)
+            return _items_response(items)
+        
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = get_items
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        holder = threading.Thread(target=client.get_product_details, args=('B0HOLD0000',))
+        holder.start()
+        while mock_instance.get_items.call_count == 0:
+            time.sleep(0.001)
+        
+        results = self._run_concurrently(client.get_product_details, [
+            ('B08N5WRWNW',), ('B08N5WRWNW',), ('B0TEST0001',), ('b0test0002',)
+        ])
+        release.set()
+        holder.join()
+        
+        assert [r['asin'] for r in results] == ['B08N5WRWNW', 'B08N5WRWNW', 'B0TEST0001', 'B0TEST0002']
+        assert mock_instance.get_items.call_count == 2
+        assert sorted(mock_instance.get_items.call_args.kwargs['items']) == [
+            'B08N5WRWNW', 'B0TEST0001', 'B0TEST0002'
+        ]
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_uncontended_lookup_does_not_linger(self, mock_client):
+        """他に取得中の呼び出しが無ければ合流を待たずに送信する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        client.config.coalesce_linger = 1.0
+        started = time.monotonic()
+        client.get_product_details('B08N5WRWNW')
+        client.batch_lookup(['B0TEST0001', 'B0TEST0002'])
+        
+        assert time.monotonic() - started < 0.5
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_different_resources_are_not_merged(self, mock_client):
+        """リソース指定が異なる要求は別リクエストになる"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        self._run_concurrently(client.batch_lookup, [
+            (['B08N5WRWNW'],), (['B08N5WRWNW'], 'ranking-minimal')
+        ])
+        
+        assert mock_instance.get_items.call_count == 2
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_coalescing_can_be_disabled(self, mock_client):
+        """coalesce_enabled=Falseでは従来どおり個別に取得する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        client.config.coalesce_enabled = False
+        self._run_concurrently(client.get_product_details, [('B08N5WRWNW',), ('B08N5WRWNW',)])
+        
+        assert mock_instance.get_items.call_count == 2
+        assert client.get_coalescing_stats() == {}
+
+
+class TestQuotaLedgerIntegration:
+    """クライアントとクォータ台帳の統合テスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 1,
+                'requests_per_second': 100,
+                'requests_per_day': 5,
+                'cache_enabled': False,
+                'quota_low_priority_reserve': 0.4
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_clients_share_daily_quota(self, mock_client):
+        """別インスタンス（別プロセス相当）のクライアント間で日次枠を共有する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        bulk_job = PAAPIClient(config_path=self.settings_file, priority='low')
+        article_job = PAAPIClient(config_path=self.settings_file)
+        
+        # 低優先度は予備枠（40%）を残して3件で打ち切られる
+        for i in range(3):
+            bulk_job.get_items(asins=[f'B0TEST000{i}'])
+        with pytest.raises(PAAPIRateLimitError, match="クォータ"):
+            bulk_job.get_items(asins=['B0TEST0009'])
+        
+        # 通常優先度は残りの予備枠を使える
+        article_job.get_items(asins=['B0TEST0010'])
+        article_job.get_items(asins=['B0TEST0011'])
+        with pytest.raises(PAAPIRateLimitError):
+            article_job.get_items(asins=['B0TEST0012'])
+        
+        status = article_job.get_quota_status()
+        assert status['used'] == 5
+        assert status['remaining'] == 0
+        assert mock_instance.get_items.call_count == 5
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_quota_failure_refunds_rate_limit_token(self, mock_client):
+        """クォータの予約に失敗した場合は確保済みのトークンを返却する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file, priority='low')
+        for i in range(3):
+            client.get_items(asins=[f'B0TEST000{i}'])
+        before = client.get_rate_limit_status()['JP']['daily_tokens']
+        
+        for _ in range(3):
+            with pytest.raises(PAAPIRateLimitError, match="クォータ"):
+                client.get_items(asins=['B0TEST0009'])
+        
+        assert client.get_rate_limit_status()['JP']['daily_tokens'] == pytest.approx(before, abs=0.01)
+        assert mock_instance.get_items.call_count == 3
+    
+    def test_quota_ledger_can_be_disabled(self):
+        """quota_ledger_enabled=Falseでは台帳を作らない"""
+        with open(self.settings_file) as f:
+            settings = yaml.safe_load(f)
+        settings['pa_api']['quota_ledger_enabled'] = False
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(settings, f)
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        assert client.get_quota_status() == {'enabled': False}
+    
+    def test_invalid_priority(self):
+        """未知の優先度はValueError"""
+        with pytest.raises(ValueError):
+            PAAPIClient(config_path=self.settings_file, priority='urgent')
+
+
+class TestCircuitBreakerIntegration:
+    """クライアントとサーキットブレーカーの統合テスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 3,
+                'retry_delay': 0.01,
+                'requests_per_second': 100,
+                'cache_enabled': False,
+                'circuit_failure_threshold': 4,
+                'circuit_recovery_timeout': 0.2
+            }
+        }
+        
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_fails_fast_while_open_and_recovers_after_probe(self, mock_client):
+        """連続失敗で回路が開き、回復待ち後のプローブ成功で閉じる"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = _sdk_request_error(503)
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        with pytest.raises(PAAPINetworkError):
+            client.get_items(asins=['B08N5WRWNW'])
+        # 2回目の呼び出しの途中（通算4回目の失敗）で回路が開き、残りのリトライは行わない
+        with pytest.raises(PAAPICircuitOpenError):
+            client.get_items(asins=['B08N5WRWNW'])
+        assert mock_instance.get_items.call_count == 4
+        
+        # 開いている間はSDKを呼ばずに即座に失敗
+        with patch('tools.pa_api_client.time.sleep') as mock_sleep:
+            with pytest.raises(PAAPICircuitOpenError):
+                client.get_items(asins=['B08N5WRWNW'])
+            mock_sleep.assert_not_called()
+        assert mock_instance.get_items.call_count == 4
+        assert client.get_circuit_status()['JP']['state'] == 'open'
+        
+        time.sleep(0.25)
+        mock_instance.get_items.side_effect = lambda items, **kwargs: _items_response(items)
+        assert client.get_items(asins=['B08N5WRWNW'])['data']['ItemsResult']['Items']
+        assert client.get_circuit_status()['JP']['state'] == 'closed'
+    
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_throttling_does_not_open_circuit(self, mock_client):
+        """レート制限（TooManyRequests）は障害として数えない"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = TooManyRequests("Rate limit exceeded")
+        mock_client.return_value = mock_instance
+        
+        client = PAAPIClient(config_path=self.settings_file)
+        for _ in range(3):
+            with pytest.raises(PAAPIRateLimitError):
+                client.get_items(asins=['B08N5WRWNW'])
+        
+        assert client.get_circuit_status()['JP']['state'] == 'closed'
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API計測のテスト
+"""
+
+import sys
+import json
+import random
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import yaml
+from amazon_paapi.errors import TooManyRequests
+
+from tools.pa_api_metrics import Histogram, PAAPIMetrics, LATENCY_BUCKETS
+from tools.pa_api_client import PAAPIClient, PAAPIRateLimitError
+
+
+class TestHistogram:
+    """ヒストグラムのテスト"""
+
+    def test_quantiles_are_within_bucket_error(self):
+        """パーセンタイルの近似誤差はバケット幅（25%）以内"""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(-1.5, 0.8) for _ in range(5000))
+        histogram = Histogram(LATENCY_BUCKETS)
+        for value in values:
+            histogram.observe(value)
+
+        summary = histogram.summary()
+        assert summary['count'] == 5000
+        assert summary['min'] == values[0] and summary['max'] == values[-1]
+        for key, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            exact = values[int(q * len(values)) - 1]
+            assert summary[key] == pytest.approx(exact, rel=0.25)
+
+        assert Histogram(LATENCY_BUCKETS).summary()['p99'] is None
+
+    def test_prometheus_text(self):
+        """Prometheusのテキスト形式は累積バケットとカウンターを出力する"""
+        metrics = PAAPIMetrics()
+        metrics.observe_request('get_items', 0.2, payload_bytes=2048)
+        metrics.observe_request('get_items', 3.0, error=True)
+        metrics.increment('get_items', 'retries')
+
+        text = metrics.to_prometheus(quota={'enabled': True, 'priority': 'normal', 'used': 3,
+                                            'remaining': 7, 'limit': 10, 'low_priority_remaining': 5})
+
+        assert 'paapi_request_duration_seconds_bucket{operation="get_items",le="+Inf"} 2' in text
+        assert 'paapi_request_duration_seconds_count{operation="get_items"} 2' in text
+        assert 'paapi_response_payload_bytes_count{operation="get_items"} 1' in text
+        assert 'paapi_errors_total{operation="get_items"} 1' in text
+        assert 'paapi_retries_total{operation="get_items"} 1' in text
+        assert 'paapi_quota_remaining{priority="normal"} 7' in text
+        buckets = [int(line.rsplit(' ', 1)[1]) for line in text.splitlines()
+                   if line.startswith('paapi_request_duration_seconds_bucket')]
+        assert buckets == sorted(buckets)
+
+
+class TestClientMetrics:
+    """PAAPIClientの計測のテスト"""
+
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 2,
+                'retry_delay': 0.01,
+                'retry_max_delay': 0.01,
+                'requests_per_second': 100,
+                'cache_path': str(Path(self.temp_dir) / 'cache.sqlite3'),
+                'quota_ledger_path': str(Path(self.temp_dir) / 'quota.sqlite3'),
+                'circuit_failure_threshold': 0
+            }
+        }
+
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_get_metrics_counts_requests_cache_and_retries(self, mock_client):
+        """レイテンシ・ペイロード・キャッシュ・リトライ・スロットリングを集計する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: {
+            'data': {'ItemsResult': {'Items': [{'ASIN': asin} for asin in items]}}
+        }
+        mock_instance.search_items.side_effect = TooManyRequests("Rate limit exceeded")
+        mock_client.return_value = mock_instance
+
+        client = PAAPIClient(config_path=self.settings_file)
+        client.get_items(asins=['B0MET00001'])
+        client.get_items(asins=['B0MET00001'])
+        with patch('tools.pa_api_client.time.sleep'):
+            with pytest.raises(PAAPIRateLimitError):
+                client.search_items(keywords='テスト')
+
+        metrics = client.get_metrics()
+        get_items = metrics['operations']['get_items']
+        search = metrics['operations']['search_items']
+        assert (get_items['requests'], get_items['cache_hits'], get_items['cache_misses']) == (1, 1, 1)
+        assert get_items['latency_seconds']['count'] == 1
+        assert get_items['latency_seconds']['p99'] is not None
+        assert get_items['payload_bytes']['max'] > 0
+        assert (search['requests'], search['errors'], search['throttles'], search['retries']) == (2, 2, 2, 1)
+        assert metrics['totals']['requests'] == 3
+        assert metrics['quota']['used'] == 3
+
+        dumped = json.loads(client.dump_metrics(path=Path(self.temp_dir) / 'metrics' / 'paapi.json'))
+        assert dumped['totals'] == metrics['totals']
+        assert (Path(self.temp_dir) / 'metrics' / 'paapi.json').exists()
+        assert 'paapi_throttles_total{operation="search_items"} 2' in client.dump_metrics('prometheus')
+        with pytest.raises(ValueError):
+            client.dump_metrics('csv')
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_metrics_can_be_disabled(self, mock_client):
+        """metrics_enabled: falseでは計測しない"""
+        with open(self.settings_file) as f:
+            settings = yaml.safe_load(f)
+        settings['pa_api']['metrics_enabled'] = False
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(settings, f)
+        mock_client.return_value = MagicMock()
+
+        client = PAAPIClient(config_path=self.settings_file)
+        client.get_items(asins=['B0MET00001'])
+
+        assert client.get_metrics() == {'enabled': False}
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+記録・再生トランスポートとローカル代替サーバーのテスト
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import yaml
+from amazon_paapi.errors import AsinNotFound, TooManyRequests
+
+from tools.pa_api_client import PAAPIClient, PAAPIRateLimitError
+from tools.pa_api_transport import (
+    FixtureStore,
+    ReplayApi,
+    HttpApi,
+    PAAPIStandInServer,
+    FixtureNotFoundError,
+)
+
+
+def _item(asin):
+    return {
+        'ASIN': asin,
+        'ItemInfo': {'Title': {'DisplayValue': f'Product {asin}'}},
+        'CustomerReviews': {'StarRating': {'DisplayValue': '4.5'}, 'Count': 1000}
+    }
+
+
+def _search_response(asins):
+    return {'data': {'SearchResult': {'Items': [_item(asin) for asin in asins]}}}
+
+
+class TestFixtureStore:
+    """フィクスチャ置き場のテスト"""
+
+    def setup_method(self):
+        """テスト前の準備"""
+        self.store = FixtureStore(Path(tempfile.mkdtemp()) / 'fixtures')
+
+    def test_search_round_trip_ignores_resources(self):
+        """検索応答は正規化したパラメータで保存・再生される"""
+        response = _search_response(['B0FIX00001'])
+        self.store.save_search({'keywords': 'Gaming  Monitor', 'item_page': 1,
+                                'resources': ['ItemInfo.Title']}, response)
+
+        assert self.store.load_search({'keywords': 'gaming monitor', 'item_page': 1}) == response
+        assert self.store.load_search({'keywords': 'gaming monitor', 'item_page': 2}) is None
+        assert next((self.store.root / 'search_items').iterdir()).name.endswith('.json.gz')
+
+    def test_items_are_stored_per_asin(self):
+        """GetItemsのアイテムはASIN単位で保存される"""
+        assert self.store.save_items([_item('B0FIX00002'), _item('b0fix00001'), {'no_asin': 1}]) == 2
+
+        assert self.store.asins() == ['B0FIX00001', 'B0FIX00002']
+        assert self.store.load_item('b0fix00002')['ASIN'] == 'B0FIX00002'
+        assert self.store.load_item('B0MISSING0') is None
+
+
+class TestReplayApi:
+    """再生用オブジェクトのテスト"""
+
+    def setup_method(self):
+        """テスト前の準備"""
+        self.store = FixtureStore(Path(tempfile.mkdtemp()) / 'fixtures')
+        self.store.save_items([_item('B0REP00001'), _item('B0REP00002')])
+        self.store.save_search({'keywords': 'monitor'}, _search_response(['B0REP00001']))
+
+    def test_get_items_recombines_recorded_asins(self):
+        """記録時と異なるバッチでもASIN単位で再生される"""
+        api = ReplayApi(self.store)
+
+        response = api.get_items(items=['B0REP00002', 'B0UNKNOWN0', 'B0REP00001'])
+        assert [i['ASIN'] for i in response['data']['ItemsResult']['Items']] == ['B0REP00002', 'B0REP00001']
+
+        with pytest.raises(AsinNotFound):
+            api.get_items(items=['B0UNKNOWN0'])
+        with pytest.raises(FixtureNotFoundError):
+            api.search_items(keywords='keyboard')
+        assert api.stats()['missing'] == 3
+
+    def test_latency_error_injection_and_throttling(self):
+        """遅延・エラー注入・スロットリングの再現"""
+        sleeps = []
+        api = ReplayApi(self.store, latency=0.05, error_rates={'TooManyRequests': 1.0}, sleep=sleeps.append)
+        with pytest.raises(TooManyRequests):
+            api.search_items(keywords='monitor')
+        assert sleeps == [0.05]
+        assert api.stats()['injected'] == 1
+
+        throttled = ReplayApi(self.store, throttle='paapi-default')
+        throttled.get_items(items=['B0REP00001'])
+        with pytest.raises(TooManyRequests):
+            throttled.get_items(items=['B0REP00001'])
+        assert throttled.stats()['throttled'] == 1
+
+        with pytest.raises(ValueError):
+            ReplayApi(self.store, error_rates={'InvalidArgument': 0.1})
+        with pytest.raises(ValueError):
+            ReplayApi(self.store, throttle='no-such-profile')
+
+
+class TestClientTransport:
+    """PAAPIClientへの組み込みテスト"""
+
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+        self.fixtures_path = Path(self.temp_dir) / "fixtures"
+        self._write_settings('record')
+
+    def _write_settings(self, transport_mode, **overrides):
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 2,
+                'retry_delay': 0.01,
+                'requests_per_second': 1000,
+                'cache_enabled': False,
+                'quota_ledger_enabled': False,
+                'transport_mode': transport_mode,
+                'fixtures_path': str(self.fixtures_path),
+                **overrides
+            }
+        }
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+
+    @patch('tools.pa_api_client.ResourceAwareAmazonApi')
+    def test_record_then_replay_offline(self, mock_amazon_api):
+        """実APIの応答を記録し、認証なしで再生できる"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = lambda items, **kwargs: {
+            'data': {'ItemsResult': {'Items': [_item(asin) for asin in items]}}
+        }
+        mock_amazon_api.return_value = mock_instance
+
+        recorded = PAAPIClient(config_path=self.settings_file).batch_lookup(['B0REC00001', 'B0REC00002'])
+        assert FixtureStore(self.fixtures_path / 'JP').asins() == ['B0REC00001', 'B0REC00002']
+
+        self._write_settings('replay')
+        mock_amazon_api.reset_mock()
+        replayed = PAAPIClient(config_path=self.settings_file).batch_lookup(['B0REC00002', 'B0REC00001'])
+
+        mock_amazon_api.assert_not_called()
+        assert {p['asin'] for p in replayed} == {p['asin'] for p in recorded}
+
+    def test_stand_in_server_end_to_end(self):
+        """代替サーバーにHTTPで接続し、スロットリングがレート制限エラーになる"""
+        store = FixtureStore(self.fixtures_path / 'JP')
+        store.save_items([_item(f'B0HTTP000{i}') for i in range(5)])
+        store.save_search({'keywords': 'monitor', 'search_index': 'All', 'item_count': 10, 'item_page': 1},
+                          _search_response(['B0HTTP0000', 'B0HTTP0001']))
+        self._write_settings('live')
+
+        with PAAPIStandInServer(ReplayApi(store)) as server:
+            client = PAAPIClient(config_path=self.settings_file,
+                                 transport=lambda country: HttpApi(server.endpoint))
+
+            products = client.batch_lookup([f'B0HTTP000{i}' for i in range(5)])
+            assert sorted(p['asin'] for p in products) == [f'B0HTTP000{i}' for i in range(5)]
+            assert client.get_product_details('B0NOTHERE0') is None
+            assert [p['asin'] for p in client.search_products('monitor', min_reviews=0)] == [
+                'B0HTTP0000', 'B0HTTP0001'
+            ]
+            assert server.backend.stats()['calls'] == 3
+
+        throttled = ReplayApi(store, error_rates={'TooManyRequests': 1.0})
+        with PAAPIStandInServer(throttled) as server:
+            client = PAAPIClient(config_path=self.settings_file,
+                                 transport=lambda country: HttpApi(server.endpoint))
+            with pytest.raises(PAAPIRateLimitError):
+                client.batch_lookup(['B0HTTP0000'])
+            assert throttled.stats()['calls'] == 2
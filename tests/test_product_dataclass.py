@@ -319,5 +319,268 @@ class TestSakuraScoreDataclass:
         assert low_sakura.should_exclude() is False
 
 
+def _unslotted_copy(cls):
+    """比較用に同じフィールドを持つ__dict__付きのデータクラスを生成"""
+    import dataclasses
+    spec = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            spec.append((f.name, f.type, dataclasses.field(default=f.default)))
+        else:
+            spec.append((f.name, f.type))
+    return dataclasses.make_dataclass(f"Unslotted{cls.__name__}", spec)
+
+
+def _allocated_bytes(factory, keys):
+    """キーごとのインスタンス生成で確保されたメモリ量（キー自体は含まない）"""
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [factory(key) for key in keys]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert len(instances) == len(keys)
+    return allocated
+
+
+class TestSlottedModels:
+    """__slots__付きモデルのテスト"""
+    
+    def test_models_have_no_instance_dict(self):
+        """インスタンスは__dict__を持たず、定義外の属性は追加できない"""
+        from tools.models import Product, ProductReview, SakuraScore
+        
+        product = Product(asin="B08N5WRWNW", name="Monitor", model="M1", brand="B", rating=9.0)
+        review = ProductReview("R1", "B08N5WRWNW", "山田", 5, "t", "c", datetime(2024, 1, 1), True)
+        score = SakuraScore("B08N5WRWNW", 10, 1, 0.9, [0, 0, 1, 4, 5], 1.0, 0.9)
+        
+        for instance in (product, review, score):
+            assert not hasattr(instance, '__dict__')
+            with pytest.raises(AttributeError):
+                instance.unknown_attribute = 1
+        
+        # __post_init__による正規化と既存の公開メソッドはそのまま
+        assert product.rating is None
+        product.sakura_score = 0.6
+        assert product.is_suspicious() is True
+        assert Product(**product.to_dict()) == product
+    
+    def test_memory_and_construction_benchmark(self):
+        """大量生成時のメモリ使用量が__dict__付きより小さく、生成速度も劣化しない"""
+        import time
+        from tools.models import ProductReview
+        
+        legacy_cls = _unslotted_copy(ProductReview)
+        date = datetime(2024, 1, 1)
+        
+        def slotted(review_id):
+            return ProductReview(review_id, "B08N5WRWNW", "山田", 5, "t", "c", date, True)
+        
+        def legacy(review_id):
+            return legacy_cls(review_id, "B08N5WRWNW", "山田", 5, "t", "c", date, True)
+        
+        review_ids = [f"R{i}" for i in range(20000)]
+        slotted_bytes = _allocated_bytes(slotted, review_ids)
+        legacy_bytes = _allocated_bytes(legacy, review_ids)
+        # Python 3.12の__dict__は値をインライン保持するため、差は1件あたり約40バイト
+        assert slotted_bytes < legacy_bytes * 0.85
+        
+        def best_of(factory, repeat=5):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for review_id in review_ids:
+                    factory(review_id)
+                timings.append(time.perf_counter() - started)
+            return min(timings)
+        
+        assert best_of(slotted) < best_of(legacy) * 1.25
+
+
+def _sakura_scores(count, seed=5):
+    """一括計算用のSakuraScoreを生成（分布が空・5段階以外・0件のものを含む）"""
+    import random
+    from tools.models import SakuraScore
+    rng = random.Random(seed)
+    scores = []
+    for i in range(count):
+        distribution = [rng.randint(0, 50) for _ in range(5)]
+        if i % 5 == 0:
+            distribution[4] = rng.randint(500, 1000)  # 5星集中
+        if i % 17 == 0:
+            distribution = [] if i % 2 else [0, 0, 0]
+        total = rng.randint(0, 3000) if i % 13 else 0
+        scores.append(SakuraScore(f"B{i:09d}", total, rng.randint(0, max(total, 1)), rng.random(),
+                                  distribution, rng.uniform(0, 40), rng.random()))
+    return scores
+
+
+class TestBatchScoring:
+    """スコアの一括計算とキャッシュのテスト"""
+    
+    def test_sakura_score_batch_matches_scalar(self):
+        """一括計算の結果は1件ずつの計算と一致し、キャッシュも設定される"""
+        from unittest.mock import patch
+        from tools.models import SakuraScore
+        
+        scores = _sakura_scores(2000)
+        expected = [score._compute_overall_score() for score in scores]
+        overall, levels = SakuraScore.score_batch(scores)
+        
+        assert overall.tolist() == expected
+        assert set(levels.tolist()) == {"LOW", "MEDIUM", "HIGH"}
+        with patch.object(SakuraScore, '_compute_overall_score') as mock_compute:
+            assert [score.get_risk_level() for score in scores] == levels.tolist()
+            assert [score.should_exclude() for score in scores] == (overall > 0.7).tolist()
+        mock_compute.assert_not_called()
+        assert SakuraScore.score_batch([])[0].shape == (0,)
+    
+    def test_review_batch_matches_scalar(self):
+        """レビューのサクラ確率の一括計算は1件ずつの計算と一致する"""
+        from tools.models import ProductReview, ReviewFrame
+        
+        names = ["田中一郎", "レビュアー", "購入者A", "山田"]
+        reviews = [
+            ProductReview(f"R{i}", "B08N5WRWNW", names[i % 4], i % 5 + 1, "t", "本文" * (i % 40),
+                          datetime(2024, 1, 1), i % 3 != 0, helpful_count=i % 7, total_votes=i % 11)
+            for i in range(1000)
+        ]
+        expected = [review._compute_sakura_probability() for review in reviews]
+        
+        probabilities, suspicious = ProductReview.score_batch(reviews)
+        assert probabilities.tolist() == expected
+        assert suspicious.tolist() == [review.is_suspicious() for review in reviews]
+        assert ProductReview.score_batch(ReviewFrame.from_reviews(reviews))[0].tolist() == expected
+    
+    def test_scalar_methods_use_cache(self):
+        """個別メソッドは入力が変わらない限り再計算せず、フィールドを変更すると再計算する"""
+        import dataclasses
+        from unittest.mock import patch
+        from tools.models import SakuraScore
+        
+        score = SakuraScore("B08N5WRWNW", 100, 90, 0.1, [0, 0, 0, 0, 100], 50.0, 0.1)
+        assert score.get_risk_level() == "HIGH"
+        assert "_score_cache" not in repr(score)
+        assert score == SakuraScore("B08N5WRWNW", 100, 90, 0.1, [0, 0, 0, 0, 100], 50.0, 0.1)
+        assert "_score_cache" not in [f.name for f in dataclasses.fields(score)]
+        assert "_score_cache" not in dataclasses.asdict(score)
+        with patch.object(SakuraScore, '_compute_overall_score') as mock_compute:
+            score.should_exclude()
+        mock_compute.assert_not_called()
+        
+        score.suspicious_reviews, score.verified_purchase_ratio = 0, 1.0
+        assert score.get_risk_level() == "MEDIUM"
+        score.review_velocity, score.merchant_reliability = 1.0, 1.0
+        assert score.calculate_overall_score() == pytest.approx(0.2)
+        score.rating_distribution[:] = [20] * 5  # リスト内の変更も検出する
+        assert score.calculate_overall_score() == 0.0
+    
+    def test_review_cache_follows_field_changes(self):
+        """レビューのサクラ確率もフィールドの変更と一括計算の後に正しい値を返す"""
+        import dataclasses
+        from tools.models import ProductReview
+        
+        review = ProductReview("R1", "B08N5WRWNW", "山田", 5, "t", "c", datetime(2024, 1, 1), False)
+        ProductReview.score_batch([review])
+        assert review.is_suspicious() is True
+        assert "_score_cache" not in dataclasses.asdict(review)
+        
+        review.verified_purchase = True
+        review.content = "十分な長さの本文" * 10
+        assert review.calculate_sakura_probability() == review._compute_sakura_probability()
+        assert review.is_suspicious() is False
+
+
+def _api_item(asin, rating='4.5', count=1200, price=19800):
+    """PA-APIアイテム辞書を生成"""
+    item = {
+        'ASIN': asin,
+        'ItemInfo': {
+            'Title': {'DisplayValue': f'商品 {asin}'},
+            'ByLineInfo': {'Brand': {'DisplayValue': 'ASUS'}},
+            'ManufactureInfo': {'ItemPartNumber': {'DisplayValue': 'VG27AQ'}}
+        },
+        'CustomerReviews': {'Count': count},
+        'Offers': {'Listings': [{'Price': {'Amount': price}}]}
+    }
+    if rating is not None:
+        item['CustomerReviews']['StarRating'] = {'DisplayValue': rating}
+    return item
+
+
+class TestBulkConversion:
+    """Product.bulk_from_api_itemsのテスト"""
+    
+    def test_matches_per_item_conversion(self):
+        """1件ずつの変換と同じ商品を生成し、警告は出さず要約にまとめる"""
+        from unittest.mock import patch
+        from tools.models import Product, ProductTable
+        
+        items = [_api_item(f"B0BULK{i:04d}", rating=('4.2', '7.5', 'x', None)[i % 4]) for i in range(40)]
+        items.insert(3, "不正なアイテム")
+        expected = [Product.from_api_response(item) for item in items if isinstance(item, dict)]
+        
+        with patch('tools.models.logger') as mock_logger:
+            products, summary = Product.bulk_from_api_items(iter(items))
+        
+        assert products == expected
+        mock_logger.warning.assert_not_called()
+        assert mock_logger.info.call_count == 1
+        assert summary['items'] == 41 and summary['converted'] == 40 and summary['skipped'] == 1
+        # 範囲外の7.5と評価なし（0.0）が補正対象、解析できない'x'は抽出時にNone
+        assert summary['invalid'] == {'rating': 20, 'sakura_score': 0, 'reviews_count': 0}
+        assert summary['invalid_asins'] == {'rating': ['B0BULK0001', 'B0BULK0003', 'B0BULK0005',
+                                                       'B0BULK0007', 'B0BULK0009']}
+        
+        table, table_summary = Product.bulk_from_api_items(items, as_table=True)
+        assert isinstance(table, ProductTable)
+        assert table.to_products() == expected
+        assert table_summary == summary
+    
+    def test_fractional_price_matches_between_list_and_table(self):
+        """小数の価格はテーブル経由でも切り捨てず、整数の価格は整数のまま返す"""
+        from tools.models import Product
+        
+        items = [_api_item('B0PRICE001', price=29.99), _api_item('B0PRICE002', price=19800),
+                 _api_item('B0PRICE003', price=None)]
+        products, _ = Product.bulk_from_api_items(items)
+        table, _ = Product.bulk_from_api_items(items, as_table=True)
+        
+        assert [p.price for p in products] == [29.99, 19800, None]
+        assert [row.price for row in table] == [p.price for p in products]
+        assert type(table[1].price) is int
+        assert table.to_products() == products
+    
+    def test_empty_page(self):
+        """空のページは空の結果を返し、ログを出さない"""
+        from unittest.mock import patch
+        from tools.models import Product
+        
+        with patch('tools.models.logger') as mock_logger:
+            products, summary = Product.bulk_from_api_items([])
+            table, _ = Product.bulk_from_api_items([], as_table=True)
+        
+        assert products == [] and len(table) == 0
+        assert summary['converted'] == 0 and summary['invalid_asins'] == {}
+        mock_logger.info.assert_not_called()
+
+
+class TestModelImports:
+    """tools.modelsの依存関係のテスト"""
+    
+    def test_import_does_not_load_workflow_modules(self):
+        """モデルの読み込みで候補プール・抽出器を読み込まない"""
+        import subprocess
+        
+        code = (
+            "import sys; import tools.models; "
+            "print(sorted(m for m in sys.modules if m.startswith('tools.')))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=str(Path(__file__).parent.parent), check=True)
+        assert result.stdout.strip() == "['tools.models']"
+
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
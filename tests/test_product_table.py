@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ProductTable（列指向の商品コンテナ）のテスト
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+from tools.models import Product, ProductTable, ProductRow
+from tools.sakura_detector import SakuraDetector
+
+
+def _products():
+    return [
+        Product(asin='B0TBL00001', name='商品1', model='M1', brand='B1', price=12800,
+                rating=4.5, reviews_count=1200, merchant_id='M001'),
+        Product(asin='B0TBL00002', name='商品2', model='M2', brand='B2',
+                rating=None, reviews_count=30, sakura_score=0.7),
+        Product(asin='B0TBL00003', name='商品3', model='M3', brand='B3', price=5980,
+                rating=3.8, reviews_count=600, merchant_id='M001', sakura_score=0.1,
+                amazon_url='https://www.amazon.co.jp/dp/B0TBL00003'),
+        Product(asin='B0TBL00004', name='商品4', model='M4', brand='B4',
+                rating=4.9, reviews_count=5000, sakura_score=0.4),
+    ]
+
+
+class TestProductTable:
+    """ProductTableのテスト"""
+
+    def test_round_trip_and_columns(self):
+        """Productとの相互変換は無損失で、列は型付き配列と有効値マスクを持つ"""
+        products = _products()
+        table = ProductTable.from_products(products)
+
+        assert len(table) == 4
+        assert table.to_products() == products
+        assert table.column('rating').dtype == np.float64
+        assert table.column('reviews_count').dtype == np.int64
+        assert table.valid('rating').tolist() == [True, False, True, True]
+        assert table.valid_values('price').tolist() == [12800, 5980]
+        assert table.valid('reviews_count').all()
+        with pytest.raises(ValueError):
+            table.column('rating')[0] = 1.0
+        with pytest.raises(KeyError):
+            table.column('unknown')
+
+    def test_row_views_and_sub_tables(self):
+        """整数は行ビュー、スライス・マスクは部分テーブルを返す"""
+        table = ProductTable.from_products(_products())
+
+        row = table[-1]
+        assert isinstance(row, ProductRow)
+        assert (row.asin, row.rating, row.price, row.merchant_id) == ('B0TBL00004', 4.9, None, None)
+        assert row.to_product() == _products()[3]
+        assert [r.asin for r in table][:2] == ['B0TBL00001', 'B0TBL00002']
+        with pytest.raises(IndexError):
+            table[4]
+
+        merchant = table.filter(table.column('merchant_id') == 'M001')
+        assert [p.asin for p in merchant.to_products()] == ['B0TBL00001', 'B0TBL00003']
+        assert table[1:3].to_products() == _products()[1:3]
+
+    def test_quality_mask_matches_products(self):
+        """quality_maskはmeets_quality_criteriaと同じ判定になる"""
+        products = _products()
+        table = ProductTable.from_products(products)
+
+        for min_rating, min_reviews in ((4.0, 500), (3.5, 100), (4.8, 0)):
+            expected = [p.meets_quality_criteria(min_rating, min_reviews) for p in products]
+            assert table.quality_mask(min_rating, min_reviews).tolist() == expected
+
+    def test_invalid_values_are_masked(self):
+        """範囲外の評価・サクラ度は無効値、負のレビュー数は0になる"""
+        table = ProductTable({
+            'asin': ['B0BAD00001', 'B0BAD00002'],
+            'rating': [6.0, 4.0],
+            'reviews_count': [-5, 10],
+            'sakura_score': [0.5, 1.5],
+        })
+
+        assert table[0].rating is None and table[1].sakura_score is None
+        assert table.column('reviews_count').tolist() == [0, 10]
+        with pytest.raises(ValueError):
+            ProductTable({'asin': ['B0BAD00001'], 'reviews_count': [1, 2]})
+
+
+class TestDetectorWithTable:
+    """SakuraDetectorがProductTableを受け付けることのテスト"""
+
+    def test_results_match_list_input(self):
+        """リストとProductTableで同じ結果になる"""
+        detector = SakuraDetector()
+        products = _products()
+        table = ProductTable.from_products(products)
+        target = products[3]
+
+        assert detector.detect_statistical_anomaly(target, table) == \
+            detector.detect_statistical_anomaly(target, products)
+        assert detector.analyze_correlation_anomaly(target, table) == \
+            detector.analyze_correlation_anomaly(target, products)
+        merchant = table.filter(table.column('merchant_id') == 'M001')
+        assert detector.calculate_merchant_reliability('M001', merchant) == \
+            detector.calculate_merchant_reliability('M001', merchant.to_products())
+
+    def test_list_input_does_not_build_table(self, monkeypatch):
+        """リスト入力ではProductTableを組み立てずに統計を計算する"""
+        def fail(*args, **kwargs):
+            raise AssertionError('ProductTable.from_productsが呼ばれた')
+        monkeypatch.setattr(ProductTable, 'from_products', classmethod(fail))
+
+        detector = SakuraDetector()
+        products = _products()
+        anomaly = detector.detect_statistical_anomaly(products[3], products)
+
+        assert anomaly.category_mean_rating == pytest.approx(np.mean([4.5, 3.8, 4.9]))
+        assert detector.analyze_correlation_anomaly(products[3], products) >= 0.0
+        assert detector.calculate_merchant_reliability('M001', products[:1]) == 0.8
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+日次クォータ台帳のテスト
+"""
+
+import sys
+import tempfile
+import multiprocessing
+from datetime import datetime, timezone
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from tools.quota_ledger import QuotaLedger, PRIORITY_LOW
+
+
+class FakeClock:
+    """テスト用の手動で進める時計（2025-01-01 06:00 UTCから開始）"""
+    
+    def __init__(self):
+        self.now = datetime(2025, 1, 1, 6, 0, tzinfo=timezone.utc).timestamp()
+    
+    def __call__(self):
+        return self.now
+
+
+def _reserve_until_refused(path, results):
+    """別プロセスから枠が尽きるまで予約する"""
+    ledger = QuotaLedger(path, daily_limit=50)
+    granted = 0
+    while ledger.reserve('tag:JP'):
+        granted += 1
+    results.put(granted)
+
+
+class TestQuotaLedger:
+    """QuotaLedgerのテスト"""
+    
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / "quota.sqlite3"
+        self.clock = FakeClock()
+    
+    def test_limit_is_shared_between_instances(self):
+        """同じ台帳ファイルを使うインスタンス間で上限を共有する"""
+        first = QuotaLedger(self.path, daily_limit=3, clock=self.clock)
+        second = QuotaLedger(self.path, daily_limit=3, clock=self.clock)
+        
+        assert first.reserve('tag:JP')
+        assert second.reserve('tag:JP')
+        assert first.reserve('tag:JP')
+        assert not second.reserve('tag:JP')
+        assert first.remaining('tag:JP') == 0
+        # スコープが異なれば別集計
+        assert second.reserve('tag:US')
+    
+    def test_limit_is_shared_between_processes(self):
+        """複数プロセスから同時に予約しても上限を超えない"""
+        QuotaLedger(self.path, daily_limit=50)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_reserve_until_refused, args=(self.path, results))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=30)
+        
+        assert sum(results.get(timeout=5) for _ in processes) == 50
+    
+    def test_low_priority_yields_reserve(self):
+        """低優先度は予備枠に手を付けない"""
+        ledger = QuotaLedger(self.path, daily_limit=10, low_priority_reserve=0.3, clock=self.clock)
+        
+        granted = 0
+        while ledger.reserve(priority=PRIORITY_LOW):
+            granted += 1
+        
+        assert granted == 7
+        assert ledger.remaining(priority=PRIORITY_LOW) == 0
+        assert ledger.reserve()
+        assert ledger.remaining() == 2
+    
+    def test_new_day_resets_usage(self):
+        """UTCの日付が変わると使用数がリセットされる"""
+        ledger = QuotaLedger(self.path, daily_limit=1, clock=self.clock)
+        assert ledger.reserve()
+        assert not ledger.reserve()
+        
+        self.clock.now += 86400
+        assert ledger.reserve()
+    
+    def test_status_projects_exhaustion(self):
+        """0時からの消費ペースで枯渇時刻を見積もる"""
+        ledger = QuotaLedger(self.path, daily_limit=400, clock=self.clock)
+        for _ in range(100):
+            ledger.reserve()
+        
+        status = ledger.status()
+        # 6時間で100件 → 残り300件は18時間後（本日中には枯渇しない）
+        assert status['used'] == 100
+        assert status['remaining'] == 300
+        assert status['low_priority_remaining'] == 220
+        assert status['projected_exhaustion'] is None
+        
+        for _ in range(100):
+            ledger.reserve()
+        # 6時間で200件 → 残り200件は6時間後の12:00に枯渇
+        assert ledger.status()['projected_exhaustion'] == '2025-01-01T12:00:00+00:00'
+    
+    def test_invalid_arguments(self):
+        """不正な引数はValueError"""
+        with pytest.raises(ValueError):
+            QuotaLedger(self.path, daily_limit=0)
+        with pytest.raises(ValueError):
+            QuotaLedger(self.path, daily_limit=10).reserve(priority='urgent')
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+トークンバケット方式レートリミッターのテスト
+"""
+
+import sys
+import asyncio
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from tools.rate_limiter import TokenBucket, RateLimiter
+
+
+class FakeClock:
+    """テスト用の手動で進める時計"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """TokenBucketのテスト"""
+    
+    def test_burst_then_wait(self):
+        """容量分は即時、それ以降は補充レートに応じた待機時間を返す"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+        
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+    
+    def test_refill_over_time(self):
+        """時間経過でトークンが容量まで補充される"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=3, clock=clock)
+        for _ in range(3):
+            bucket.reserve()
+        
+        clock.now += 10
+        assert bucket.available() == pytest.approx(3.0)
+    
+    def test_max_wait_does_not_consume(self):
+        """max_waitを超える予約はトークンを消費しない"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=1, clock=clock)
+        bucket.reserve()
+        
+        assert bucket.reserve(max_wait=0.5) is None
+        assert bucket.reserve(max_wait=1.0) == pytest.approx(1.0)
+    
+    def test_invalid_arguments(self):
+        """不正なレート・容量はValueError"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, capacity=0)
+
+
+class TestRateLimiter:
+    """RateLimiterのテスト"""
+    
+    def test_smooths_to_tps(self):
+        """秒間上限に合わせて待機が発生する"""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_second=1.0, clock=clock, sleep=clock.sleep)
+        
+        for _ in range(5):
+            assert limiter.acquire() is True
+        
+        assert sum(clock.sleeps) == pytest.approx(4.0)
+    
+    def test_daily_quota_exhaustion(self):
+        """1日の上限を使い切ると待機上限内に確保できない"""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_second=100.0, requests_per_day=3,
+                              clock=clock, sleep=clock.sleep)
+        
+        for _ in range(3):
+            assert limiter.acquire(max_wait=60) is True
+        assert limiter.acquire(max_wait=60) is False
+        # 失敗した予約は秒間バケットにも残らない
+        assert limiter.snapshot()['second_tokens'] > 0
+    
+    def test_refund_returns_both_buckets(self):
+        """送信しなかった予約を返却すると秒間・日次の両方に戻る"""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_second=1.0, requests_per_day=3,
+                              clock=clock, sleep=clock.sleep)
+        
+        assert limiter.acquire(max_wait=60) is True
+        limiter.refund()
+        
+        assert limiter.snapshot()['second_tokens'] == pytest.approx(1.0)
+        assert limiter.snapshot()['daily_tokens'] == pytest.approx(3.0)
+    
+    def test_shared_between_threads(self):
+        """複数スレッドから共有しても予約総数が一致する"""
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_second=10.0, clock=clock)
+        waits = []
+        lock = threading.Lock()
+        
+        def worker():
+            for _ in range(25):
+                wait = limiter.reserve()
+                with lock:
+                    waits.append(wait)
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        # 100件を10TPSで捌くには最後の予約で約9秒待つ
+        assert len(waits) == 100
+        assert max(waits) == pytest.approx(9.0)
+    
+    def test_acquire_async(self):
+        """コルーチンからも同じリミッターを利用できる"""
+        limiter = RateLimiter(requests_per_second=1000.0)
+        
+        async def run():
+            return await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+        
+        assert asyncio.run(run()) == [True] * 5
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+リクエストコアレッサーのテスト
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from tools.request_coalescer import RequestCoalescer
+
+
+class RecordingFetcher:
+    """送信されたバッチを記録するフェッチ関数"""
+    
+    def __init__(self, delay=0.0, error=None):
+        self.batches = []
+        self.delay = delay
+        self.error = error
+        self.release = threading.Event()  # 'HOLD'を含むバッチはこのイベントまで返さない
+        self._lock = threading.Lock()
+    
+    def __call__(self, batch):
+        with self._lock:
+            self.batches.append(list(batch))
+        if 'HOLD' in batch:
+            self.release.wait(5)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {key: f"item-{key}" for key in batch if not key.startswith('missing')}
+
+
+def _hold_inflight(coalescer, fetcher):
+    """別スレッドで'HOLD'を取得中にし、他の呼び出し元がいる状態を作る"""
+    thread = threading.Thread(target=coalescer.fetch, args=(['HOLD'],))
+    thread.start()
+    deadline = time.monotonic() + 5
+    while coalescer.stats()['inflight'] == 0 or not fetcher.batches:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    return thread
+
+
+def _run_concurrently(coalescer, key_lists):
+    """複数スレッドから同時にfetchを呼び出して結果を返す"""
+    results = [None] * len(key_lists)
+    barrier = threading.Barrier(len(key_lists))
+    
+    def worker(index, keys):
+        barrier.wait()
+        results[index] = coalescer.fetch(keys)
+    
+    threads = [threading.Thread(target=worker, args=(i, keys)) for i, keys in enumerate(key_lists)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestRequestCoalescer:
+    """RequestCoalescerのテスト"""
+    
+    def test_single_caller(self):
+        """単独の呼び出しは1バッチで取得し、欠損キーはNone"""
+        fetcher = RecordingFetcher()
+        coalescer = RequestCoalescer(fetcher, linger=0)
+        
+        assert coalescer.fetch(['A', 'B', 'missing-1', 'A']) == {
+            'A': 'item-A', 'B': 'item-B', 'missing-1': None
+        }
+        assert fetcher.batches == [['A', 'B', 'missing-1']]
+    
+    def test_single_caller_does_not_linger(self):
+        """他の呼び出し元がいなければ満杯でないバッチも待たずに送信する"""
+        fetcher = RecordingFetcher()
+        coalescer = RequestCoalescer(fetcher, linger=1.0)
+        
+        started = time.monotonic()
+        assert coalescer.fetch(['A', 'B']) == {'A': 'item-A', 'B': 'item-B'}
+        
+        assert time.monotonic() - started < 0.5
+        assert fetcher.batches == [['A', 'B']]
+    
+    def test_inflight_keys_are_shared(self):
+        """取得中のキーを要求した呼び出し元は同じ結果を待つ"""
+        fetcher = RecordingFetcher(delay=0.1)
+        coalescer = RequestCoalescer(fetcher, linger=0.05)
+        
+        results = _run_concurrently(coalescer, [['A'] for _ in range(8)])
+        
+        assert all(result == {'A': 'item-A'} for result in results)
+        assert fetcher.batches == [['A']]
+        assert coalescer.stats()['coalesced'] == 7
+    
+    def test_pending_keys_are_merged_across_callers(self):
+        """異なる呼び出し元の未送信キーが共有バッチにまとめられる"""
+        fetcher = RecordingFetcher()
+        coalescer = RequestCoalescer(fetcher, batch_size=10, linger=0.1)
+        holder = _hold_inflight(coalescer, fetcher)
+        
+        results = _run_concurrently(coalescer, [[f'K{i}'] for i in range(6)])
+        fetcher.release.set()
+        holder.join()
+        
+        assert [list(result) for result in results] == [[f'K{i}'] for i in range(6)]
+        assert len(fetcher.batches) == 2
+        assert sorted(fetcher.batches[1]) == [f'K{i}' for i in range(6)]
+    
+    def test_batches_never_exceed_batch_size(self):
+        """バッチはbatch_sizeを超えない"""
+        fetcher = RecordingFetcher()
+        coalescer = RequestCoalescer(fetcher, batch_size=10, linger=0.05)
+        holder = _hold_inflight(coalescer, fetcher)
+        
+        _run_concurrently(coalescer, [[f'K{i}-{j}' for j in range(7)] for i in range(5)])
+        fetcher.release.set()
+        holder.join()
+        
+        batches = fetcher.batches[1:]
+        assert sum(len(batch) for batch in batches) == 35
+        assert all(len(batch) <= 10 for batch in batches)
+        assert len(batches) == 4
+    
+    def test_error_propagates_to_all_waiters(self):
+        """バッチ取得の例外は同じキーを待つ全呼び出し元に伝播し、次回は再取得する"""
+        fetcher = RecordingFetcher(delay=0.05, error=RuntimeError("API障害"))
+        coalescer = RequestCoalescer(fetcher, linger=0.02)
+        errors = []
+        
+        def worker():
+            try:
+                coalescer.fetch(['A'])
+            except RuntimeError as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(errors) == 3
+        assert coalescer.stats()['inflight'] == 0
+        
+        fetcher.error = None
+        assert coalescer.fetch(['A']) == {'A': 'item-A'}
+    
+    def test_invalid_batch_size(self):
+        """batch_sizeは1以上"""
+        with pytest.raises(ValueError):
+            RequestCoalescer(lambda batch: {}, batch_size=0)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+リトライポリシーのテスト
+"""
+
+import sys
+import random
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+import yaml
+from amazon_paapi.errors import TooManyRequests, RequestError, InvalidArgument
+from botocore.exceptions import ClientError, BotoCoreError
+
+from tools.retry_policy import (
+    RetryPolicy,
+    classify_error,
+    ERROR_THROTTLED,
+    ERROR_TRANSIENT,
+    ERROR_FATAL,
+)
+from tools.pa_api_client import PAAPIClient, PAAPIRateLimitError, PAAPINetworkError
+
+
+def _sdk_request_error(status, reason="Service Unavailable"):
+    """SDK 5.0.1がHTTPエラー応答から送出するRequestErrorを生成"""
+    from amazon_paapi.helpers.requests import _manage_response_exceptions
+    from amazon_paapi.sdk.rest import ApiException
+    try:
+        try:
+            raise ApiException(status=status, reason=reason)
+        except ApiException as exc:
+            _manage_response_exceptions(exc)
+    except RequestError as error:
+        return error
+
+
+class FakeClock:
+    """テスト用の手動で進める時計"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClassifyError:
+    """例外の分類のテスト"""
+
+    def test_classification(self):
+        """スロットリング・一時的障害・致命的エラーの分類"""
+        assert classify_error(TooManyRequests("429")) == ERROR_THROTTLED
+        assert classify_error(_sdk_request_error(503)) == ERROR_TRANSIENT
+        assert classify_error(_sdk_request_error(0, "ConnectTimeoutError")) == ERROR_TRANSIENT
+        assert classify_error(ConnectionError("reset")) == ERROR_TRANSIENT
+        assert classify_error(BotoCoreError()) == ERROR_TRANSIENT
+        assert classify_error(InvalidArgument("bad")) == ERROR_FATAL
+        assert classify_error(TypeError("bug")) == ERROR_FATAL
+        assert classify_error(KeyError('ASIN')) == ERROR_FATAL
+
+    def test_request_error_status(self):
+        """SDKのRequestErrorは認証失敗・4xxをリトライしない"""
+        assert classify_error(_sdk_request_error(401, "Unauthorized")) == ERROR_FATAL
+        assert classify_error(_sdk_request_error(400, "Bad Request")) == ERROR_FATAL
+        assert classify_error(RequestError("原因不明")) == ERROR_FATAL
+        try:
+            raise RequestError("接続できません") from ConnectionResetError("reset")
+        except RequestError as error:
+            assert classify_error(error) == ERROR_TRANSIENT
+
+    def test_client_error_codes(self):
+        """エラーコード付きの応答はコードとHTTPステータスで分類"""
+        def client_error(code, status):
+            return ClientError(
+                {'Error': {'Code': code, 'Message': ''}, 'ResponseMetadata': {'HTTPStatusCode': status}},
+                'SearchItems'
+            )
+
+        assert classify_error(client_error('TooManyRequests', 429)) == ERROR_THROTTLED
+        assert classify_error(client_error('InternalFailure', 503)) == ERROR_TRANSIENT
+        assert classify_error(client_error('UnrecognizedClientException', 401)) == ERROR_FATAL
+
+
+class TestRetryPolicy:
+    """RetryPolicyのテスト"""
+
+    def test_decorrelated_jitter_bounds(self):
+        """待機時間は基準値から前回の3倍までの範囲で、上限を超えない"""
+        policy = RetryPolicy(max_attempts=100, base_delay=0.5, max_delay=4.0, rng=random.Random(1))
+        previous = 0.5
+        for _ in range(50):
+            delay = policy.next_delay(previous)
+            assert 0.5 <= delay <= min(4.0, previous * 3)
+            previous = delay
+
+        # 同時に失敗した並行ワーカーの初回待機時間がばらける
+        first_delays = {round(policy.next_delay(0.5), 6) for _ in range(50)}
+        assert len(first_delays) == 50
+
+    def test_attempt_limit_and_fatal_errors(self):
+        """試行回数の上限と致命的エラーではリトライしない"""
+        retry = RetryPolicy(max_attempts=2, base_delay=0.0).start()
+        retry.record_attempt()
+        assert retry.next_delay(ERROR_FATAL) is None
+        assert retry.next_delay(ERROR_THROTTLED) is not None
+        retry.record_attempt()
+        assert retry.next_delay(ERROR_TRANSIENT) is None
+        assert retry.attempts == 2
+
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_deadline_caps_total_time(self):
+        """待機すると期限を超える場合はリトライしない"""
+        clock = FakeClock()
+        policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=1.0, deadline=2.5, clock=clock)
+        retry = policy.start()
+        retry.record_attempt()
+        assert retry.next_delay(ERROR_TRANSIENT) == 1.0
+
+        clock.now += 1.0
+        assert retry.remaining() == pytest.approx(1.5)
+        retry.record_attempt()
+        assert retry.next_delay(ERROR_TRANSIENT) == 1.0
+
+        clock.now += 1.0
+        retry.record_attempt()
+        assert retry.next_delay(ERROR_TRANSIENT) is None
+
+        # 呼び出しごとの期限は既定値より優先される
+        assert policy.start(deadline=None).remaining() == pytest.approx(2.5)
+        assert policy.start(deadline=10.0).remaining() == pytest.approx(10.0)
+        assert RetryPolicy().start().remaining() is None
+
+
+class TestClientRetry:
+    """PAAPIClientのリトライ動作のテスト"""
+
+    def setup_method(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        self.config_dir.mkdir()
+        self.settings_file = self.config_dir / "settings.yaml"
+
+        test_settings = {
+            'pa_api': {
+                'access_key': 'test_access_key',
+                'secret_key': 'test_secret_key',
+                'associate_tag': 'test_tag',
+                'region': 'ap-northeast-1',
+                'retry_attempts': 4,
+                'retry_delay': 0.01,
+                'retry_max_delay': 0.05,
+                'requests_per_second': 100,
+                'cache_enabled': False,
+                'circuit_failure_threshold': 0
+            }
+        }
+
+        with open(self.settings_file, 'w') as f:
+            yaml.dump(test_settings, f)
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_programming_errors_are_not_retried(self, mock_client):
+        """プログラムの誤りや不正なリクエストはリトライしない"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = TypeError("unexpected keyword")
+        mock_client.return_value = mock_instance
+
+        client = PAAPIClient(config_path=self.settings_file)
+        with pytest.raises(PAAPINetworkError) as exc_info:
+            client.get_items(asins=['B08N5WRWNW'])
+
+        assert mock_instance.get_items.call_count == 1
+        assert exc_info.value.attempts == 1
+        assert isinstance(exc_info.value.__cause__, TypeError)
+
+    @pytest.mark.parametrize('status', [401, 400])
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_auth_and_client_errors_are_not_retried(self, mock_client, status):
+        """SDKのRequestError（401・400）はリトライせず、インスタンスも破棄しない"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = _sdk_request_error(status, "Unauthorized")
+        mock_client.return_value = mock_instance
+
+        client = PAAPIClient(config_path=self.settings_file)
+        with patch('tools.pa_api_client.time.sleep') as mock_sleep:
+            for _ in range(2):
+                with pytest.raises(PAAPINetworkError) as exc_info:
+                    client.get_items(asins=['B08N5WRWNW'])
+
+        assert exc_info.value.attempts == 1
+        assert mock_instance.get_items.call_count == 2
+        mock_sleep.assert_not_called()
+        assert mock_client.call_count == 1
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_throttling_is_retried_with_jitter_and_reports_attempts(self, mock_client):
+        """スロットリングはジッター付きの待機でリトライし、試行回数を報告する"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = TooManyRequests("Rate limit exceeded")
+        mock_client.return_value = mock_instance
+
+        client = PAAPIClient(config_path=self.settings_file)
+        with patch('tools.pa_api_client.time.sleep') as mock_sleep:
+            with pytest.raises(PAAPIRateLimitError) as exc_info:
+                client.get_items(asins=['B08N5WRWNW'])
+
+        assert mock_instance.get_items.call_count == 4
+        assert exc_info.value.attempts == 4
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert len(delays) == 3
+        assert all(0.01 <= d <= 0.05 for d in delays)
+
+    @patch('tools.pa_api_client.PAAPIClient._create_paapi_client')
+    def test_per_call_deadline(self, mock_client):
+        """呼び出しごとの期限を超えるリトライは行わない"""
+        mock_instance = MagicMock()
+        mock_instance.get_items.side_effect = _sdk_request_error(503)
+        mock_client.return_value = mock_instance
+
+        client = PAAPIClient(config_path=self.settings_file)
+        client.config.retry_delay = 5.0
+        client.config.retry_max_delay = 5.0
+        with patch('tools.pa_api_client.time.sleep') as mock_sleep:
+            with pytest.raises(PAAPINetworkError) as exc_info:
+                client.get_items(asins=['B08N5WRWNW'], deadline=1.0)
+
+        mock_sleep.assert_not_called()
+        assert exc_info.value.attempts == 1
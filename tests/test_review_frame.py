@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ReviewFrame（列指向のレビューコンテナ）のテスト
+"""
+
+import sys
+import random
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.models import ProductReview, ReviewFrame, Product
+from tools.sakura_detector import SakuraDetector
+
+
+def _reviews(count, seed=3):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, 9, 30)
+    names = ['山田', 'レビュアー1', 'カスタマーA', '佐藤', '鈴木']
+    titles = ['素晴らしい', '最悪でした', '普通', 'おすすめ']
+    return [
+        ProductReview(
+            review_id=f"R{i:05d}",
+            product_asin="B0RVF00001",
+            reviewer_name=rng.choice(names),
+            rating=rng.randint(1, 5),
+            title=rng.choice(titles),
+            content="良い" * rng.randint(1, 40) if rng.random() < 0.5 else "悪い" * rng.randint(1, 40),
+            review_date=base + timedelta(hours=rng.randint(0, 24 * 60)),
+            verified_purchase=rng.random() < 0.7,
+            helpful_count=rng.randint(0, 3),
+            total_votes=rng.randint(0, 6) if i % 4 else 0,
+        )
+        for i in range(count)
+    ]
+
+
+class TestReviewFrame:
+    """ReviewFrameのテスト"""
+
+    def test_columns_match_reviews(self):
+        """各列はProductReviewの値と一致し、レビュアー名は重複なしで保持する"""
+        reviews = _reviews(200)
+        frame = ReviewFrame.from_reviews(reviews)
+
+        assert len(frame) == 200
+        assert frame.ratings.tolist() == [r.rating for r in reviews]
+        assert frame.content_lengths.tolist() == [len(r.content) for r in reviews]
+        assert frame.dates.dtype == np.dtype('datetime64[us]')
+        assert frame.weekdays().tolist() == [r.review_date.weekday() for r in reviews]
+        assert len(frame.reviewer_names) == len({r.reviewer_name for r in reviews})
+        assert frame.reviewer_names[frame.reviewer_codes].tolist() == [r.reviewer_name for r in reviews]
+        assert frame.has_negative.tolist() == [
+            any(w in r.title or w in r.content for w in ('最悪', '悪い', 'ダメ', '失敗', '買わない'))
+            for r in reviews
+        ]
+
+    def test_dates_accept_timestamps_and_timezones(self):
+        """pandasのTimestampとタイムゾーン付き日時は現地時刻の日付で扱う"""
+        jst = timezone(timedelta(hours=9))
+        dates = [pd.Timestamp('2024-01-01 23:00'), datetime(2024, 1, 2, 1, 0, tzinfo=jst)]
+        reviews = [ProductReview(f"R{i}", "B0RVF00001", "山田", 5, "", "", d, True)
+                   for i, d in enumerate(dates)]
+        frame = ReviewFrame.from_reviews(reviews)
+
+        assert frame.days().astype(str).tolist() == ['2024-01-01', '2024-01-02']
+        assert len(ReviewFrame.from_reviews([])) == 0
+        with pytest.raises(ValueError):
+            ReviewFrame([5], [True], [], [1], [0], [0], ['山田'], [0], [False], [False])
+
+
+class TestDetectorWithReviewFrame:
+    """SakuraDetectorがReviewFrameを受け付けることのテスト"""
+
+    @pytest.mark.parametrize('count', [5, 15, 60, 500])
+    def test_results_match_list_input(self, count):
+        """リストとReviewFrameで同じ結果になる"""
+        detector = SakuraDetector()
+        reviews = _reviews(count)
+        frame = ReviewFrame.from_reviews(reviews)
+
+        for method in ('analyze_temporal_burst', 'detect_periodic_patterns', 'calculate_review_velocity',
+                       'analyze_sentiment_consistency', 'detect_review_burst'):
+            assert getattr(detector, method)(frame) == getattr(detector, method)(reviews), method
+        assert detector.analyze_review_pattern(frame) == detector.analyze_review_pattern(reviews)
+
+        product = Product(asin="B0RVF00001", name="商品", model="M", brand="B", rating=4.2, reviews_count=count)
+        from_frame = detector.analyze_product(product, reviews=frame)
+        from_list = detector.analyze_product(product, reviews=reviews)
+        assert from_frame.sakura_score == from_list.sakura_score
+        assert from_frame.analysis_details == from_list.analysis_details
+
+    def test_review_pattern_values(self):
+        """パターン分析の値はレビューから直接計算した値と一致する"""
+        reviews = _reviews(300)
+        pattern = SakuraDetector().analyze_review_pattern(ReviewFrame.from_reviews(reviews))
+        voted = [r.helpful_count / r.total_votes for r in reviews if r.total_votes > 0]
+        generic = [r for r in reviews if any(n in r.reviewer_name for n in ('レビュアー', 'カスタマー'))]
+
+        assert pattern.five_star_ratio == sum(r.rating == 5 for r in reviews) / 300
+        assert pattern.verified_purchase_ratio == sum(r.verified_purchase for r in reviews) / 300
+        assert pattern.generic_name_ratio == len(generic) / 300
+        assert pattern.helpful_ratio == pytest.approx(np.mean(voted))
+        assert pattern.average_content_length == pytest.approx(np.mean([len(r.content) for r in reviews]))
+
+    def test_velocity_and_burst_values(self):
+        """投稿速度は日数の端数を切り捨て、3日間の集中を検出する"""
+        detector = SakuraDetector()
+        base = datetime(2024, 3, 1)
+        # 前半10件は最初の10時間、後半10件は1日ずつ間隔を空けて投稿
+        reviews = [ProductReview(f"R{i}", "B0RVF00001", "山田", 5, "", "x" * 60,
+                                 base + (timedelta(hours=i) if i < 10 else timedelta(days=i, hours=12)), True)
+                   for i in range(20)]
+
+        # 期間は19.5日（19日として扱う）
+        assert detector.calculate_review_velocity(reviews) == 20 / 19
+        assert detector.detect_review_burst(reviews) == 0.85
+        assert detector.detect_review_burst(reviews[5:]) == 0.0
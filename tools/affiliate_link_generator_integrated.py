@@ -21,14 +21,19 @@ import argparse
 import re
 import sys
 import json
-import yaml
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 from urllib.parse import quote_plus
 import urllib.request
 import urllib.error
 from dataclasses import dataclass
 
+try:
+    from tools.config_service import get_config_service, find_project_root
+except ImportError:
+    # tools/配下のスクリプトとして直接実行された場合
+    from config_service import get_config_service, find_project_root
+
 @dataclass
 class Product:
     """製品情報を格納するデータクラス"""
@@ -44,29 +49,24 @@ class ProjectSettings:
     
     def __init__(self, project_root: Path = None):
         if project_root is None:
-            project_root = Path.cwd()
-            # amazon-note-rank ディレクトリを探す
-            while project_root != project_root.parent:
-                if (project_root / 'config' / 'settings.yaml').exists():
-                    break
-                project_root = project_root.parent
+            # amazon-note-rank ディレクトリを探す（探索結果はプロセス内で共有）
+            project_root = find_project_root() or Path(Path.cwd().anchor)
         
         self.project_root = project_root
         self.config_file = project_root / 'config' / 'settings.yaml'
         self.config = self.load_config()
     
-    def load_config(self) -> Dict:
-        """設定ファイルを読み込み"""
+    def load_config(self) -> Mapping:
+        """設定ファイルを読み込み（解析結果はプロセス内で共有する読み取り専用ビュー）"""
         if not self.config_file.exists():
             raise FileNotFoundError(f"設定ファイルが見つかりません: {self.config_file}")
         
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return get_config_service().load(self.config_file)
         except Exception as e:
             raise Exception(f"設定ファイルの読み込みに失敗: {e}")
     
-    def get_affiliate_config(self) -> Dict:
+    def get_affiliate_config(self) -> Mapping:
         """アフィリエイト設定を取得"""
         return self.config.get('affiliate', {})
     
@@ -80,7 +80,7 @@ class ProjectSettings:
         affiliate_config = self.get_affiliate_config()
         return affiliate_config.get('link_format', 'https://www.amazon.co.jp/dp/{asin}?tag={associate_id}')
     
-    def get_product_criteria(self) -> Dict:
+    def get_product_criteria(self) -> Mapping:
         """製品選定基準を取得"""
         return self.config.get('product_criteria', {})
     
@@ -350,13 +350,8 @@ class IntegratedArticleProcessor:
 
 def resolve_project_path(project_id: str = None, article_path: str = None) -> Tuple[Path, Path]:
     """プロジェクトパスと記事パスを解決"""
-    project_root = Path.cwd()
-    
     # amazon-note-rank ディレクトリを探す
-    while project_root != project_root.parent:
-        if (project_root / 'config' / 'settings.yaml').exists():
-            break
-        project_root = project_root.parent
+    project_root = find_project_root() or Path(Path.cwd().anchor)
     
     if project_id:
         # プロジェクトIDから記事パスを推定
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+プロジェクトで参照されているASIN・キーワードのキャッシュ事前取得
+
+projects/*/meta と記事Markdownから参照ASIN（Amazon URLの/dp/等）と
+キーワード（meta/project.yaml）を収集し、PA-APIの応答キャッシュに
+事前に取り込む。公開日が近いプロジェクトから順に処理し、
+クォータやレート制限に余裕がない場合はその回の取得を打ち切る。
+
+ASINは詳細取得と同じリソースで最大10件ずつ取得する。複数ASINの応答は
+クライアントがASIN単位でもキャッシュするため、単一取得・集約・一括取得の
+いずれのチャンクの分け方でもキャッシュに当たる。キーワードはsearch_productsと
+同じ検索条件で取得する。件数はsearch_productsの既定値（MAX_ITEMS_PER_REQUEST）で、
+process_affiliate_workflowの既定の商品数もsearch_itemsの上限で同じ件数になる。
+キーワードが無いプロジェクトはcategoryを検索キーワードとして使う。
+鮮度内のキャッシュがあるものは通信しない。
+"""
+
+import re
+import threading
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Mapping
+
+import yaml
+
+from tools.config_service import get_config_service
+from tools.pa_api_client import (
+    PAAPIClient,
+    PAAPIRateLimitError,
+    PAAPINetworkError,
+    DEFAULT_DETAIL_PROFILE,
+    DEFAULT_GET_ITEMS_RESOURCES,
+    DEFAULT_SEARCH_RESOURCES,
+    MAX_ITEMS_PER_REQUEST,
+    resolve_resources,
+)
+
+logger = logging.getLogger(__name__)
+
+# 定数定義
+DEFAULT_PROJECTS_DIR = "projects"
+PROJECT_META_FILE = "meta/project.yaml"
+SCANNED_DIRS = ("meta", "articles")
+SCANNED_SUFFIXES = (".md", ".yaml", ".yml")
+DEFAULT_WARM_INTERVAL = 1800.0  # バックグラウンド実行の間隔（秒）
+
+# 公開日として参照するproject.yamlのキー（先に見つかったものを使用）
+PUBLISH_DATE_KEYS = ("publish_date", "publish_at", "scheduled_at", "created_at")
+
+# 参照ASINの抽出パターン（Amazon商品URLと「ASIN: XXXXXXXXXX」表記）
+ASIN_PATTERNS = (
+    re.compile(r"/(?:dp|gp/product|gp/aw/d)/([A-Z0-9]{10})(?![A-Z0-9])"),
+    re.compile(r"ASIN\s*[:：]\s*([A-Z0-9]{10})(?![A-Z0-9])", re.IGNORECASE),
+)
+
+# ディレクトリ名末尾の日付（例: gaming-keyboard-2025-09-07）
+PROJECT_DIR_DATE = re.compile(r"(\d{4}-\d{2}-\d{2})$")
+
+
+@dataclass
+class WarmupTarget:
+    """1プロジェクト分の事前取得対象。
+
+    Attributes:
+        project_id: プロジェクトID（ディレクトリ名）
+        publish_date: 公開予定日（不明な場合はNone）
+        asins: 参照ASIN（出現順）
+        keywords: 検索キーワード
+    """
+    project_id: str
+    publish_date: Optional[date] = None
+    asins: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+
+
+def extract_asins(text: str) -> List[str]:
+    """テキストからAmazon商品URL等で参照されているASINを抽出（出現順・重複なし）。"""
+    found: Dict[str, None] = {}
+    for pattern in ASIN_PATTERNS:
+        for match in pattern.finditer(text):
+            found.setdefault(match.group(1).upper(), None)
+    return list(found)
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    """YAMLの日付・日時・文字列を日付に変換（解釈できない場合はNone）。"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.strip()).date()
+        except ValueError:
+            return None
+    return None
+
+
+def _load_project_meta(project_dir: Path) -> Mapping[str, Any]:
+    """meta/project.yamlを読み込み（解析結果は設定サービスで共有、無い・壊れている場合は空辞書）。"""
+    meta_file = project_dir / PROJECT_META_FILE
+    if not meta_file.exists():
+        return {}
+    try:
+        return get_config_service().load(meta_file)
+    except (OSError, yaml.YAMLError, ValueError) as e:
+        logger.warning(f"プロジェクト設定を読み込めません ({meta_file}): {e}")
+        return {}
+
+
+def scan_project(project_dir: Path) -> WarmupTarget:
+    """1プロジェクトから公開日・参照ASIN・キーワードを収集。"""
+    meta = _load_project_meta(project_dir)
+
+    publish_date = None
+    for key in PUBLISH_DATE_KEYS:
+        publish_date = _parse_date(meta.get(key))
+        if publish_date is not None:
+            break
+    if publish_date is None:
+        match = PROJECT_DIR_DATE.search(project_dir.name)
+        publish_date = _parse_date(match.group(1)) if match else None
+
+    # キーワード未設定のプロジェクトはカテゴリ名で検索する
+    keywords = meta.get('keywords') or meta.get('category') or []
+    if isinstance(keywords, str):
+        keywords = [keywords]
+
+    asins: Dict[str, None] = {}
+    for sub_dir in SCANNED_DIRS:
+        directory = project_dir / sub_dir
+        if not directory.is_dir():
+            continue
+        for path in sorted(directory.rglob('*')):
+            if path.suffix.lower() not in SCANNED_SUFFIXES or not path.is_file():
+                continue
+            try:
+                text = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"ファイルを読み込めません ({path}): {e}")
+                continue
+            for asin in extract_asins(text):
+                asins.setdefault(asin, None)
+
+    return WarmupTarget(
+        project_id=str(meta.get('project_id') or project_dir.name),
+        publish_date=publish_date,
+        asins=list(asins),
+        keywords=[str(keyword).strip() for keyword in keywords if str(keyword).strip()]
+    )
+
+
+def _priority_key(target: WarmupTarget, today: date) -> tuple:
+    """公開日が近い順（今後の公開予定 → 最近公開 → 公開日不明）の並び替えキー。"""
+    if target.publish_date is None:
+        return (2, 0)
+    days = (target.publish_date - today).days
+    if days >= 0:
+        return (0, days)
+    return (1, -days)
+
+
+def collect_targets(projects_dir: Path, today: Optional[date] = None) -> List[WarmupTarget]:
+    """全プロジェクトを走査し、公開日が近い順に事前取得対象を返す。
+
+    Args:
+        projects_dir: projectsディレクトリ
+        today: 基準日（Noneの場合はUTCの今日）
+
+    Returns:
+        ASINまたはキーワードを持つプロジェクトの事前取得対象
+    """
+    projects_dir = Path(projects_dir)
+    if not projects_dir.is_dir():
+        return []
+    today = today or datetime.now(timezone.utc).date()
+    targets = [
+        scan_project(project_dir)
+        for project_dir in sorted(projects_dir.iterdir())
+        if project_dir.is_dir()
+    ]
+    targets = [target for target in targets if target.asins or target.keywords]
+    return sorted(targets, key=lambda target: _priority_key(target, today))
+
+
+class CacheWarmer:
+    """プロジェクトの参照ASIN・キーワードをPA-APIキャッシュに事前取得する。
+
+    クォータを記事生成と奪い合わないよう、clientには優先度'low'の
+    PAAPIClientを渡すことを想定する。
+
+    Attributes:
+        projects_dir: 走査するprojectsディレクトリ
+        interval: バックグラウンド実行の間隔（秒）
+        item_count: キーワード検索の取得件数（記事生成時の検索件数と揃える）
+    """
+
+    def __init__(self, client: PAAPIClient, projects_dir: Optional[Path] = None,
+                 interval: float = DEFAULT_WARM_INTERVAL,
+                 item_count: int = MAX_ITEMS_PER_REQUEST) -> None:
+        """キャッシュウォーマーを初期化。
+
+        Args:
+            client: 事前取得に使うPA-APIクライアント（応答キャッシュが有効なもの）
+            projects_dir: projectsディレクトリ。Noneの場合は設定ファイル基準のprojects。
+            interval: バックグラウンド実行の間隔（秒）
+            item_count: キーワード検索の取得件数（件数が違うとキャッシュキーも異なるため、
+                search_itemsと同じく上限MAX_ITEMS_PER_REQUESTに丸める）
+        """
+        self._client = client
+        self.projects_dir = Path(projects_dir) if projects_dir is not None else (
+            client._resolve_data_path(DEFAULT_PROJECTS_DIR)
+        )
+        self.interval = interval
+        self.item_count = min(item_count, MAX_ITEMS_PER_REQUEST)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._detail_resources = resolve_resources(DEFAULT_DETAIL_PROFILE, DEFAULT_GET_ITEMS_RESOURCES)
+
+    def _has_idle_capacity(self) -> bool:
+        """クォータとレート制限に余裕があるか（無ければ今回の取得を打ち切る）。"""
+        quota = self._client.get_quota_status()
+        if quota.get('enabled'):
+            remaining = quota['low_priority_remaining'] if quota.get('priority') == 'low' else quota['remaining']
+            if remaining <= 0:
+                return False
+        limiter = self._client.get_rate_limit_status().get(self._client._resolve_country())
+        # 秒間トークンが残っていない＝他の呼び出しが送信待ちのため譲る
+        return limiter is None or limiter['second_tokens'] >= 1.0
+
+    def warm(self, max_requests: Optional[int] = None, today: Optional[date] = None) -> Dict[str, Any]:
+        """事前取得を1回実行。
+
+        Args:
+            max_requests: この回で送信するリクエスト数の上限（Noneで無制限）
+            today: 公開日の基準日（Noneの場合はUTCの今日）
+
+        Returns:
+            projects、asins、keywords（処理件数）、failed、stopped_early を含む統計
+        """
+        stats = {'projects': 0, 'asins': 0, 'keywords': 0, 'failed': 0, 'stopped_early': False}
+        if not self._client.get_cache_stats().get('enabled'):
+            logger.warning("応答キャッシュが無効なため事前取得を行いません")
+            return stats
+
+        seen_asins = set()
+        seen_keywords = set()
+        fetched = 0
+        for target in collect_targets(self.projects_dir, today=today):
+            stats['projects'] += 1
+            asins = [asin for asin in target.asins if asin not in seen_asins]
+            jobs = [
+                ('asins', asins[i:i + MAX_ITEMS_PER_REQUEST])
+                for i in range(0, len(asins), MAX_ITEMS_PER_REQUEST)
+            ]
+            jobs += [('keyword', kw) for kw in target.keywords if kw.casefold() not in seen_keywords]
+            for kind, value in jobs:
+                if self._stop.is_set() or (max_requests is not None and fetched >= max_requests):
+                    stats['stopped_early'] = True
+                    return stats
+                if not self._has_idle_capacity():
+                    logger.info("クォータまたはレート制限に余裕がないため事前取得を中断します")
+                    stats['stopped_early'] = True
+                    return stats
+                try:
+                    if kind == 'asins':
+                        seen_asins.update(value)
+                        # 詳細取得と同じリソースでまとめて取得（ASIN単位でもキャッシュされる）
+                        self._client.get_items(asins=value, resources=self._detail_resources)
+                        stats['asins'] += len(value)
+                    else:
+                        seen_keywords.add(value.casefold())
+                        # search_productsと同じ検索条件で取得
+                        self._client.search_items(keywords=value, item_count=self.item_count,
+                                                  resources=DEFAULT_SEARCH_RESOURCES)
+                        stats['keywords'] += 1
+                except PAAPIRateLimitError as e:
+                    logger.info(f"レート制限のため事前取得を中断します: {e}")
+                    stats['stopped_early'] = True
+                    return stats
+                except PAAPINetworkError as e:
+                    logger.warning(f"事前取得に失敗しました ({target.project_id}, {value}): {e}")
+                    stats['failed'] += 1
+                fetched += 1
+
+        logger.info(
+            f"事前取得完了: {stats['projects']}プロジェクト、ASIN {stats['asins']}件、"
+            f"キーワード {stats['keywords']}件"
+        )
+        return stats
+
+    def start(self) -> None:
+        """バックグラウンドスレッドでinterval秒ごとに事前取得を実行。"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='paapi-cache-warmer', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """バックグラウンド実行を停止（実行中の取得は次の区切りで終了）。"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.warm()
+            except Exception as e:
+                logger.error(f"事前取得でエラーが発生しました: {e}")
+            self._stop.wait(self.interval)
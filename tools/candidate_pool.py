@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+複数キーワードの検索結果をASIN単位で共有する候補プール
+
+重なりのあるキーワード（「ゲーミングモニター」と「格闘ゲーム モニター」等）は
+同じASINを多数返す。検索結果はプールに書き込み、既にプールにあるASINは
+抽出し直さずプール済みの商品辞書の複製を返す（呼び出し側が商品辞書の
+値やリスト・辞書の値を変更しても、他のキーワードの結果やプールには影響しない）。
+複製はキーごとの浅いコピーで、raw_data（SDKのアイテム全体）は参照を共有する。後段（サクラ検出、サクラチェッカー等）は
+run_stageで未処理のASINだけを処理するため、1回の実行の中で各ASINの抽出・
+分析はキーワードの数によらず1回だけになる。
+
+プールは1回の実行（複数キーワードの処理）単位で作成・破棄する想定で、
+鮮度管理は行わない。
+"""
+
+import threading
+import logging
+from typing import Callable, Dict, Any, List, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 複製せずに参照を共有するキー（読み取り専用として扱う大きな値）
+SHARED_KEYS = frozenset({'raw_data'})
+
+
+def _copy_product(product: Dict[str, Any]) -> Dict[str, Any]:
+    """商品辞書を複製（リスト・辞書の値は1段コピーし、SHARED_KEYSは共有）。"""
+    copied = {}
+    for key, value in product.items():
+        if key not in SHARED_KEYS and isinstance(value, (list, dict)):
+            value = value.copy()
+        copied[key] = value
+    return copied
+
+
+class CandidatePool:
+    """ASINをキーとした商品候補と後段処理結果の共有プール。"""
+
+    def __init__(self) -> None:
+        """空の候補プールを初期化。"""
+        self._lock = threading.Lock()
+        self._products: Dict[str, Dict[str, Any]] = {}  # 挿入順を保持
+        self._keywords: Dict[str, List[str]] = {}
+        self._stage_results: Dict[str, Dict[str, Any]] = {}
+        self._stats = {'added': 0, 'reused': 0, 'stage_computed': 0, 'stage_reused': 0}
+
+    def __contains__(self, asin: object) -> bool:
+        with self._lock:
+            return asin in self._products
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._products)
+
+    def get(self, asin: str) -> Optional[Dict[str, Any]]:
+        """プール済みの商品の複製を取得（無ければNone）。"""
+        with self._lock:
+            product = self._products.get(asin)
+            return _copy_product(product) if product is not None else None
+
+    def products(self) -> List[Dict[str, Any]]:
+        """プール済みの全商品の複製（最初に見つかった順）。"""
+        with self._lock:
+            return [_copy_product(product) for product in self._products.values()]
+
+    def keywords_for(self, asin: str) -> List[str]:
+        """ASINを返したキーワード（出現順）。"""
+        with self._lock:
+            return list(self._keywords.get(asin, []))
+
+    def merge_items(self, items: Iterable[Dict[str, Any]],
+                    extract: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                    keyword: Optional[str] = None) -> List[Dict[str, Any]]:
+        """PA-APIのアイテムをプールに取り込み、対応する商品を返す。
+
+        未知のASINのアイテムのみextractに渡して抽出し、既知のASINは
+        プール済みの商品辞書の複製を返す。
+
+        Args:
+            items: PA-API応答のアイテムリスト
+            extract: アイテムのリストを商品辞書のリストに変換する関数
+            keyword: アイテムを返した検索キーワード（記録用）
+
+        Returns:
+            itemsの順序に対応する商品のリスト（ASINの無いアイテムは除く）
+        """
+        order: Dict[str, None] = {}  # 挿入順を保持
+        new_items: List[Dict[str, Any]] = []
+        with self._lock:
+            for item in items:
+                asin = item.get('ASIN')
+                if not asin or asin in order:
+                    continue
+                order[asin] = None
+                if asin in self._products:
+                    self._stats['reused'] += 1
+                else:
+                    new_items.append(item)
+
+        # 抽出はロック外で行う（同じASINを並行して抽出した場合は先着を採用）
+        extracted = extract(new_items) if new_items else []
+
+        with self._lock:
+            for product in extracted:
+                if self._products.setdefault(product['asin'], product) is product:
+                    self._stats['added'] += 1
+            if keyword is not None:
+                for asin in order:
+                    sources = self._keywords.setdefault(asin, [])
+                    if keyword not in sources:
+                        sources.append(keyword)
+            return [_copy_product(self._products[asin]) for asin in order if asin in self._products]
+
+    def run_stage(self, stage: str, asins: Iterable[str],
+                  compute: Callable[[List[str]], Dict[str, Any]]) -> Dict[str, Any]:
+        """後段処理をまだ結果の無いASINだけに実行し、結果を共有する。
+
+        Args:
+            stage: 処理名（'sakura'、'playwright'等）
+            asins: 結果が必要なASIN
+            compute: 未処理のASINのリストを受け取り、ASIN→結果の辞書を返す関数。
+                辞書に含まれないASINは失敗として扱い、次回も再計算する。
+
+        Returns:
+            asinsのうち結果のあるもののASIN→結果の辞書
+        """
+        requested = list(dict.fromkeys(asins))
+        with self._lock:
+            results = self._stage_results.setdefault(stage, {})
+            missing = [asin for asin in requested if asin not in results]
+            self._stats['stage_reused'] += len(requested) - len(missing)
+
+        if missing:
+            computed = compute(missing)
+            with self._lock:
+                for asin in missing:
+                    if asin in computed:
+                        results.setdefault(asin, computed[asin])
+                        self._stats['stage_computed'] += 1
+            logger.debug(f"候補プール: {stage}を{len(missing)}件処理（{len(requested) - len(missing)}件は再利用）")
+
+        with self._lock:
+            return {asin: results[asin] for asin in requested if asin in results}
+
+    def stats(self) -> Dict[str, Any]:
+        """プールの統計（商品数、追加・再利用件数、後段処理の計算・再利用件数）。"""
+        with self._lock:
+            return {'candidates': len(self._products), **self._stats}
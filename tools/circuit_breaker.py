@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API呼び出し用サーキットブレーカー
+
+連続した失敗が閾値に達すると回路を開き、以降の呼び出しを即座に失敗させる。
+回復待ち時間の経過後は半開状態となり、同時に1件だけ試行（プローブ）を通す。
+プローブが成功すれば回路を閉じ、失敗すれば再び開く。
+
+障害中に各呼び出し元がリトライのバックオフで待ち続けることを防ぐ。
+"""
+
+import time
+import threading
+import logging
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# 状態
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+# 定数定義
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 30.0
+
+
+class CircuitBreaker:
+    """スレッドセーフなサーキットブレーカー。
+
+    Attributes:
+        name: ログ出力用の名前
+        failure_threshold: 回路を開く連続失敗回数
+        recovery_timeout: 開いてから半開になるまでの秒数
+    """
+
+    def __init__(self, name: str = 'default',
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """サーキットブレーカーを初期化。
+
+        Args:
+            name: ログ出力用の名前
+            failure_threshold: 回路を開く連続失敗回数（1以上）
+            recovery_timeout: 開いてから半開になるまでの秒数
+            clock: 単調増加する時刻関数
+
+        Raises:
+            ValueError: failure_thresholdが1未満の場合
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_thresholdは1以上を指定してください")
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """現在の状態（回復待ち時間の経過を反映）。"""
+        with self._lock:
+            if self._state == STATE_OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+                return STATE_HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """次に試行できるまでの秒数（閉じている場合は0）。"""
+        with self._lock:
+            if self._state != STATE_OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """呼び出しを許可するか判定。
+
+        半開状態で許可した場合、その呼び出し元がプローブとなる。
+        許可された呼び出し元は必ずrecord_success、record_failure、
+        releaseのいずれかを呼び出すこと。
+
+        Returns:
+            呼び出してよい場合True
+        """
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_OPEN:
+                if self._clock() - self._opened_at < self.recovery_timeout:
+                    return False
+                self._state = STATE_HALF_OPEN
+                logger.info(f"サーキットブレーカー半開 ({self.name}): プローブを許可")
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """成功を記録（半開状態なら回路を閉じる）。"""
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                logger.info(f"サーキットブレーカー閉鎖 ({self.name}): プローブ成功")
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """失敗を記録（閾値到達またはプローブ失敗で回路を開く）。"""
+        with self._lock:
+            self._probe_in_flight = False
+            if self._state == STATE_HALF_OPEN:
+                self._open()
+                return
+            self._failures += 1
+            if self._state == STATE_CLOSED and self._failures >= self.failure_threshold:
+                self._open()
+
+    def release(self) -> None:
+        """成否を記録せずにプローブ枠を解放（呼び出しを行わなかった場合）。"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        """回路を開く（ロック保持中に呼び出す）。"""
+        self._state = STATE_OPEN
+        self._opened_at = self._clock()
+        logger.warning(
+            f"サーキットブレーカー開放 ({self.name}): 連続失敗{self._failures}回、"
+            f"{self.recovery_timeout}秒間は即座に失敗します"
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """現在の状態を取得。"""
+        state = self.state
+        with self._lock:
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'probe_in_flight': self._probe_in_flight
+            }
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+プロセス内で共有する設定ファイル読み込みサービス
+
+config/settings.yaml の探索とYAMLの解析をプロセス内で1回にまとめる。
+解析結果はパスごとにキャッシュし、ファイルの更新時刻・サイズが
+変わった場合のみ読み直す。呼び出し元には変更できないビュー
+（MappingProxyType、リストはタプル）を返すため、ツール間で同じ
+解析結果を安全に共有できる。
+
+更新時刻の分解能より短い間隔で書き換えられた場合に備え、読み込み直後の
+ファイル（更新時刻が新しいもの）はバイト列を比較してから再利用する。
+"""
+
+import os
+import time
+import threading
+import logging
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# 定数定義
+DEFAULT_CONFIG_PATH = Path("config") / "settings.yaml"
+RACY_WINDOW_NS = 2_000_000_000  # 更新時刻がこの範囲内のファイルは内容も比較する
+
+
+def freeze(value: Any) -> Any:
+    """辞書・リストを再帰的に変更できないビューに変換。"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class _Entry:
+    """1ファイル分のキャッシュ。"""
+
+    __slots__ = ('signature', 'raw', 'settings', 'loaded_at_ns')
+
+    def __init__(self, signature: Tuple[int, int], raw: bytes,
+                 settings: Mapping[str, Any], loaded_at_ns: int) -> None:
+        self.signature = signature
+        self.raw = raw
+        self.settings = settings
+        self.loaded_at_ns = loaded_at_ns
+
+
+class ConfigService:
+    """設定ファイルの探索結果と解析結果をキャッシュするサービス。"""
+
+    def __init__(self) -> None:
+        """空のキャッシュで初期化。"""
+        self._lock = threading.Lock()
+        self._entries: Dict[Path, _Entry] = {}
+        self._roots: Dict[Path, Path] = {}
+        self._stats = {'parsed': 0, 'hits': 0, 'revalidated': 0}
+
+    def find_config_path(self, start: Optional[Path] = None) -> Optional[Path]:
+        """startから親方向にconfig/settings.yamlを探索。
+
+        Args:
+            start: 探索開始ディレクトリ（Noneの場合はカレントディレクトリ）
+
+        Returns:
+            見つかった設定ファイルのパス（見つからない場合はNone）
+        """
+        start_dir = Path(start) if start is not None else Path.cwd()
+        with self._lock:
+            root = self._roots.get(start_dir)
+        if root is not None and (root / DEFAULT_CONFIG_PATH).is_file():
+            return root / DEFAULT_CONFIG_PATH
+
+        current_dir = start_dir
+        while True:
+            config_file = current_dir / DEFAULT_CONFIG_PATH
+            if config_file.is_file():
+                with self._lock:
+                    self._roots[start_dir] = current_dir
+                return config_file
+            if current_dir == current_dir.parent:
+                return None
+            current_dir = current_dir.parent
+
+    def find_project_root(self, start: Optional[Path] = None) -> Optional[Path]:
+        """config/settings.yamlを含むプロジェクトルートを探索（見つからない場合はNone）。"""
+        config_path = self.find_config_path(start)
+        return config_path.parent.parent if config_path is not None else None
+
+    def load(self, path: Path) -> Mapping[str, Any]:
+        """設定ファイルを読み込み、変更できないビューを返す。
+
+        Args:
+            path: 設定ファイルのパス
+
+        Returns:
+            トップレベルの設定（空ファイルの場合は空のビュー）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合
+            yaml.YAMLError: YAMLとして解析できない場合
+            ValueError: トップレベルがマッピングでない場合
+        """
+        key = Path(os.path.abspath(path))
+        stat = key.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            if entry.loaded_at_ns - stat.st_mtime_ns > RACY_WINDOW_NS:
+                with self._lock:
+                    self._stats['hits'] += 1
+                return entry.settings
+
+        raw = key.read_bytes()
+        now_ns = time.time_ns()
+        if entry is not None and entry.raw == raw:
+            # 内容が同じなら解析結果を再利用
+            with self._lock:
+                self._entries[key] = _Entry(signature, raw, entry.settings, now_ns)
+                self._stats['revalidated'] += 1
+            return entry.settings
+
+        data = yaml.safe_load(raw.decode('utf-8')) or {}
+        if not isinstance(data, Mapping):
+            raise ValueError(f"設定ファイルのトップレベルがマッピングではありません: {key}")
+        settings = freeze(data)
+        with self._lock:
+            self._entries[key] = _Entry(signature, raw, settings, now_ns)
+            self._stats['parsed'] += 1
+        logger.debug(f"設定ファイルを読み込みました: {key}")
+        return settings
+
+    def clear(self) -> None:
+        """キャッシュを破棄。"""
+        with self._lock:
+            self._entries.clear()
+            self._roots.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """解析回数・キャッシュ利用回数の統計。"""
+        with self._lock:
+            return {'entries': len(self._entries), **self._stats}
+
+
+# プロセス内で共有するインスタンス
+_service = ConfigService()
+
+
+def get_config_service() -> ConfigService:
+    """プロセス共有の設定サービスを取得。"""
+    return _service
+
+
+def find_config_path(start: Optional[Path] = None) -> Optional[Path]:
+    """プロセス共有のサービスでconfig/settings.yamlを探索。"""
+    return _service.find_config_path(start)
+
+
+def find_project_root(start: Optional[Path] = None) -> Optional[Path]:
+    """プロセス共有のサービスでプロジェクトルートを探索。"""
+    return _service.find_project_root(start)
+
+
+def load_settings(path: Optional[Path] = None) -> Mapping[str, Any]:
+    """プロセス共有のサービスで設定ファイルを読み込み。
+
+    Args:
+        path: 設定ファイルのパス（Noneの場合はカレントディレクトリから探索）
+
+    Raises:
+        FileNotFoundError: 設定ファイルが見つからない場合
+        yaml.YAMLError: YAMLとして解析できない場合
+        ValueError: トップレベルがマッピングでない場合
+    """
+    if path is None:
+        path = _service.find_config_path()
+        if path is None:
+            raise FileNotFoundError(f"設定ファイル {DEFAULT_CONFIG_PATH} が見つかりません")
+    return _service.load(path)
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API商品アイテムのテーブル駆動抽出器
+
+ItemInfo・CustomerReviews・Offersなどの入れ子辞書から値を取り出す処理を、
+フィールド定義（パス・既定値・変換関数）の表として一箇所にまとめる。
+フィールド表は共通のパス接頭辞ごとに木構造へコンパイルされ、
+各アイテムの入れ子辞書は1回の走査で全フィールドを取り出す。
+
+抽出器はプロファイル（用途別のフィールド表）とリソース指定の組ごとに
+一度だけ構築してキャッシュする。要求していないリソースのフィールドは
+走査対象から外し、既定値をそのまま設定する。
+
+元のアイテム（raw_data）の保持方法は3種類から選べる。大量の候補商品を
+保持する場合は'none'（保持しない）または'compressed'（圧縮して保持し、
+参照時に展開）を使うとメモリ使用量を抑えられる。
+"""
+
+import json
+import zlib
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, Union, Callable, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# 値が存在しないことを表す番兵
+_MISSING = object()
+
+PathKey = Union[str, int]
+
+# raw_dataの保持方法
+RAW_DATA_FULL = 'full'              # 元のアイテムをそのまま保持
+RAW_DATA_NONE = 'none'              # 保持しない（raw_dataキーを含めない）
+RAW_DATA_COMPRESSED = 'compressed'  # 圧縮して保持し、参照時に展開
+RAW_DATA_MODES = (RAW_DATA_FULL, RAW_DATA_NONE, RAW_DATA_COMPRESSED)
+
+
+class CompressedItem(Mapping):
+    """zlib圧縮したJSONとして保持するアイテム。
+
+    読み取り専用の辞書として振る舞い、参照のたびに展開する。
+    展開結果は保持しないため、常駐するのは圧縮後のバイト列のみ。
+    """
+
+    __slots__ = ('_blob',)
+
+    def __init__(self, item: Dict[str, Any]) -> None:
+        """アイテムを圧縮して保持。
+
+        Args:
+            item: PA-APIアイテム辞書（JSONに変換できること）
+        """
+        self._blob = zlib.compress(
+            json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """展開して通常の辞書として取得。"""
+        return json.loads(zlib.decompress(self._blob).decode('utf-8'))
+
+    @property
+    def compressed_size(self) -> int:
+        """圧縮後のバイト数。"""
+        return len(self._blob)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def items(self):
+        return self.to_dict().items()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CompressedItem):
+            return self._blob == other._blob or self.to_dict() == other.to_dict()
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CompressedItem({self.compressed_size} bytes)"
+
+
+def _retain_raw(item: Any, mode: str) -> Any:
+    """保持方法に従ってraw_dataの値を作成。"""
+    if mode == RAW_DATA_COMPRESSED:
+        try:
+            return CompressedItem(item)
+        except (TypeError, ValueError):
+            # JSONに変換できないアイテムはそのまま保持
+            return item
+    return item
+
+
+def to_float(value: Any) -> float:
+    """表示用文字列や数値をfloatに変換。"""
+    return float(value)
+
+
+def to_count(value: Any) -> int:
+    """レビュー数をintに変換（{'DisplayValue': ...}形式にも対応）。"""
+    if isinstance(value, dict):
+        value = value.get('DisplayValue', 0)
+    return int(value)
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """抽出フィールドの定義。
+
+    Attributes:
+        name: 出力キー
+        path: アイテム辞書内のパス（文字列はキー、整数はリストの添字）
+        default: 値が存在しない場合の値
+        convert: 値の変換関数（Noneの場合は変換しない）
+        on_error: 変換に失敗した場合の値
+        required: Trueの場合、値が無いアイテムは結果から除外する
+        resource: 値の取得に必要なPA-APIリソース（Noneは常に取得）
+    """
+    name: str
+    path: Tuple[PathKey, ...]
+    default: Any = None
+    convert: Optional[Callable[[Any], Any]] = None
+    on_error: Any = None
+    required: bool = False
+    resource: Optional[str] = None
+
+
+def _field(name: str, path: str, **options: Any) -> FieldSpec:
+    """ドット区切りのパス表記からFieldSpecを生成（数字は添字として扱う）。"""
+    keys = tuple(int(key) if key.isdigit() else key for key in path.split('.'))
+    return FieldSpec(name=name, path=keys, **options)
+
+
+_ASIN = _field('asin', 'ASIN', required=True)
+_TITLE = _field('title', 'ItemInfo.Title.DisplayValue', default='Unknown', resource='ItemInfo.Title')
+_RATING = _field('rating', 'CustomerReviews.StarRating.DisplayValue', default=0.0,
+                 convert=to_float, on_error=0.0, resource='CustomerReviews.StarRating')
+_REVIEW_COUNT = _field('review_count', 'CustomerReviews.Count', default=0,
+                       convert=to_count, on_error=0, resource='CustomerReviews.Count')
+_PRICE = _field('price', 'Offers.Listings.0.Price.Amount', resource='Offers.Listings.Price')
+_PRICE_DISPLAY = _field('price_display', 'Offers.Listings.0.Price.DisplayAmount',
+                        resource='Offers.Listings.Price')
+_BRAND = _field('brand', 'ItemInfo.ByLineInfo.Brand.DisplayValue', default='Unknown',
+                resource='ItemInfo.ByLineInfo')
+_PART_NUMBER = _field('part_number', 'ItemInfo.ManufactureInfo.ItemPartNumber.DisplayValue',
+                      default='Unknown', resource='ItemInfo.ManufactureInfo')
+_IMAGE_URL = _field('image_url', 'Images.Primary.Medium.URL', resource='Images.Primary.Medium')
+
+# 用途別のフィールド表
+EXTRACTOR_PROFILES: Dict[str, Tuple[FieldSpec, ...]] = {
+    # search_productsの品質フィルタリング用
+    'search': (_ASIN, _TITLE, _RATING, _REVIEW_COUNT, _PRICE),
+    # PAAPIClient._extract_product_data相当
+    'summary': (_ASIN, _TITLE, _RATING, _REVIEW_COUNT, _PRICE, _PRICE_DISPLAY),
+    # PAAPIClient._extract_detailed_product_data相当（記事作成用）
+    'detail': (_ASIN, _TITLE, _BRAND, _PART_NUMBER, _RATING, _REVIEW_COUNT,
+               _PRICE, _PRICE_DISPLAY, _IMAGE_URL),
+    # PAAPIClient.refresh_offers用（価格とレビュー数のみ）
+    'offers': (_ASIN, _REVIEW_COUNT, _PRICE, _PRICE_DISPLAY),
+    # models.Product.from_api_response用（出力キーはProductのフィールド名）
+    'model': (
+        _field('asin', 'ASIN', default=''),
+        _field('name', 'ItemInfo.Title.DisplayValue', default='Unknown', resource='ItemInfo.Title'),
+        _field('model', 'ItemInfo.ManufactureInfo.ItemPartNumber.DisplayValue', default='Unknown',
+               resource='ItemInfo.ManufactureInfo'),
+        _field('brand', 'ItemInfo.ByLineInfo.Brand.DisplayValue', default='Unknown',
+               resource='ItemInfo.ByLineInfo'),
+        _PRICE,
+        _field('rating', 'CustomerReviews.StarRating.DisplayValue', default=0.0,
+               convert=to_float, on_error=None, resource='CustomerReviews.StarRating'),
+        _field('reviews_count', 'CustomerReviews.Count', default=0,
+               convert=to_count, on_error=0, resource='CustomerReviews.Count'),
+    ),
+}
+
+
+class _PathNode:
+    """共通パス接頭辞の木のノード。"""
+
+    __slots__ = ('children', 'fields')
+
+    def __init__(self) -> None:
+        self.children: Dict[PathKey, '_PathNode'] = {}
+        self.fields: List[int] = []
+
+
+def _covers(resource: Optional[str], requested: Optional[frozenset]) -> bool:
+    """フィールドの必要リソースが要求リソースに含まれるか。"""
+    if resource is None or requested is None:
+        return True
+    return any(
+        resource == item or resource.startswith(item + '.') or item.startswith(resource + '.')
+        for item in requested
+    )
+
+
+class ItemExtractor:
+    """コンパイル済みのアイテム抽出器。
+
+    Attributes:
+        fields: 抽出するフィールド定義
+        raw_data: 元のアイテムの保持方法（'full'、'none'、'compressed'）
+    """
+
+    def __init__(self, fields: Iterable[FieldSpec], raw_data: str = RAW_DATA_FULL,
+                 resources: Optional[Iterable[str]] = None) -> None:
+        """フィールド表を木構造にコンパイル。
+
+        Args:
+            fields: 抽出するフィールド定義
+            raw_data: 元のアイテムの保持方法（'full'、'none'、'compressed'）
+            resources: 要求したPA-APIリソース（Noneの場合は全フィールドを走査）
+
+        Raises:
+            ValueError: 未知の保持方法が指定された場合
+        """
+        if raw_data not in RAW_DATA_MODES:
+            raise ValueError(
+                f"未知のraw_data保持方法です: {raw_data} (利用可能: {', '.join(RAW_DATA_MODES)})"
+            )
+        self.fields = tuple(fields)
+        self.raw_data = raw_data
+        self.include_raw = raw_data != RAW_DATA_NONE
+        self._names = [spec.name for spec in self.fields]
+        requested = frozenset(resources) if resources is not None else None
+
+        self._root = _PathNode()
+        self._constants: List[int] = []
+        for index, spec in enumerate(self.fields):
+            if not _covers(spec.resource, requested):
+                # 要求していないリソースは走査せず既定値とする
+                self._constants.append(index)
+                continue
+            node = self._root
+            for key in spec.path:
+                node = node.children.setdefault(key, _PathNode())
+            node.fields.append(index)
+
+        self._required = [index for index, spec in enumerate(self.fields) if spec.required]
+
+    def _walk(self, node: _PathNode, value: Any, values: List[Any]) -> None:
+        """木を辿りながら値を収集（存在しないパスは番兵のまま残す）。"""
+        for index in node.fields:
+            values[index] = value
+        for key, child in node.children.items():
+            if isinstance(key, int):
+                if isinstance(value, list) and -len(value) <= key < len(value):
+                    self._walk(child, value[key], values)
+            elif isinstance(value, dict) and key in value:
+                self._walk(child, value[key], values)
+
+    def _extract_values(self, item: Any) -> Optional[List[Any]]:
+        """1アイテムからフィールド値のリストを取り出す。"""
+        if not isinstance(item, dict):
+            return None
+
+        values = [_MISSING] * len(self.fields)
+        self._walk(self._root, item, values)
+
+        for index in self._required:
+            if values[index] is _MISSING or not values[index]:
+                return None
+
+        for index, spec in enumerate(self.fields):
+            value = values[index]
+            if value is _MISSING:
+                values[index] = spec.default
+            elif spec.convert is not None:
+                try:
+                    values[index] = spec.convert(value)
+                except (ValueError, TypeError):
+                    values[index] = spec.on_error
+        return values
+
+    def extract_one(self, item: Any) -> Optional[Dict[str, Any]]:
+        """1アイテムを抽出。
+
+        Returns:
+            抽出結果の辞書。必須フィールドが無い場合はNone。
+        """
+        values = self._extract_values(item)
+        if values is None:
+            return None
+        result = dict(zip(self._names, values))
+        if self.include_raw:
+            result['raw_data'] = _retain_raw(item, self.raw_data)
+        return result
+
+    def extract(self, items: Iterable[Any]) -> List[Dict[str, Any]]:
+        """複数アイテムを抽出（必須フィールドが無いアイテムは除外）。"""
+        results = []
+        for item in items:
+            result = self.extract_one(item)
+            if result is not None:
+                results.append(result)
+        return results
+
+    def extract_columns(self, items: Iterable[Any]) -> Dict[str, List[Any]]:
+        """複数アイテムを列指向（フィールド名→値のリスト）で抽出。
+
+        集計や配列化の前段として、行ごとの辞書を作らずに値を並べる。
+        """
+        columns: Dict[str, List[Any]] = {name: [] for name in self._names}
+        if self.include_raw:
+            columns['raw_data'] = []
+        appenders = [columns[name].append for name in self._names]
+
+        for item in items:
+            values = self._extract_values(item)
+            if values is None:
+                continue
+            for append, value in zip(appenders, values):
+                append(value)
+            if self.include_raw:
+                columns['raw_data'].append(_retain_raw(item, self.raw_data))
+        return columns
+
+
+@lru_cache(maxsize=64)
+def _build_extractor(profile: str, raw_data: str,
+                     resources: Optional[Tuple[str, ...]]) -> ItemExtractor:
+    """プロファイルとリソースの組ごとに抽出器を構築（キャッシュ付き）。"""
+    return ItemExtractor(EXTRACTOR_PROFILES[profile], raw_data=raw_data, resources=resources)
+
+
+def get_extractor(profile: str, raw_data: str = RAW_DATA_FULL,
+                  resources: Optional[Iterable[str]] = None) -> ItemExtractor:
+    """用途別プロファイルのコンパイル済み抽出器を取得。
+
+    Args:
+        profile: EXTRACTOR_PROFILESのプロファイル名
+        raw_data: 元のアイテムの保持方法（'full'、'none'、'compressed'）
+        resources: 要求したPA-APIリソース（Noneの場合は全フィールド）
+
+    Returns:
+        コンパイル済みの抽出器
+
+    Raises:
+        ValueError: 未知のプロファイル名・保持方法が指定された場合
+    """
+    if profile not in EXTRACTOR_PROFILES:
+        raise ValueError(
+            f"未知の抽出プロファイルです: {profile} "
+            f"(利用可能: {', '.join(sorted(EXTRACTOR_PROFILES))})"
+        )
+    key = tuple(sorted(set(resources))) if resources is not None else None
+    return _build_extractor(profile, raw_data, key)
@@ -6,27 +6,71 @@
 Amazon商品、レビュー、サクラ度スコアを管理するデータクラス。
 サクラレビュー検出のための品質評価ロジックを含む。
 
+SakuraDetectorで大量のレビューを読み込むため、Product・ProductReview・
+SakuraScoreは__slots__付きのデータクラスとし、インスタンスごとの
+__dict__を持たない（定義外の属性は追加できない）。
+
+ProductReviewのサクラ確率とSakuraScoreの総合スコアは初回の計算時に
+インスタンスへキャッシュする。キャッシュは計算に使ったフィールドの値と
+組で保持し、フィールドが変わっていれば再計算する。大量のレビュー・スコアはscore_batchで
+NumPyの配列演算により一括計算でき、各インスタンスのキャッシュも埋まる。
+
 TDD Refactor段階: コード品質向上とドキュメンテーション充実。
 """
 
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Union
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Union, Iterable, Iterator, Tuple, TYPE_CHECKING
 from datetime import datetime
 from decimal import Decimal
 import logging
 
+import numpy as np
+
+if TYPE_CHECKING:
+    # 型注釈のみで使用（モデルの読み込み時にワークフロー用のモジュールを読み込まない）
+    from tools.candidate_pool import CandidatePool
+
 logger = logging.getLogger(__name__)
 
 # 定数定義
 DEFAULT_MIN_RATING = 4.0
 DEFAULT_MIN_REVIEWS = 500
+DEFAULT_PRODUCTS_PER_KEYWORD = 5  # 複数キーワード処理でキーワードあたりに検索する商品数
 SAKURA_SCORE_THRESHOLD = 0.5
 MAX_REVIEW_VELOCITY = 20.0  # 日あたりの最大正常レビュー数
 MIN_REVIEW_CONTENT_LENGTH = 50  # 最小レビュー文字数
+GENERIC_REVIEWER_NAMES = ('レビュアー', 'カスタマー', '購入者', 'ユーザー')  # 汎用的なレビュアー名
+POSITIVE_WORDS = ('素晴らしい', '最高', '完璧', '良い', 'おすすめ')  # 簡易感情分析の肯定語
+NEGATIVE_WORDS = ('最悪', '悪い', 'ダメ', '失敗', '買わない')  # 簡易感情分析の否定語
+REVIEW_DATE_DTYPE = 'datetime64[us]'  # ReviewFrameの投稿日時の型
+SUSPICIOUS_REVIEW_THRESHOLD = 0.5  # サクラレビューと判定するサクラ確率
+RISK_MEDIUM_THRESHOLD = 0.3  # このスコア以上はMEDIUM
+RISK_HIGH_THRESHOLD = 0.7  # このスコア以上はHIGH、超える場合は除外
+RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+BULK_INVALID_SAMPLE_SIZE = 5  # 一括変換の要約に含める無効値のASINの件数
+
+# ProductTableの列（Productのフィールドと同じ順序）
+PRODUCT_TABLE_FIELDS = (
+    'asin', 'name', 'model', 'brand', 'amazon_url', 'affiliate_url',
+    'price', 'rating', 'reviews_count', 'merchant_id', 'sakura_score'
+)
+# 欠損し得る列の型と無効要素の埋め値
+_NULLABLE_COLUMNS = {
+    'price': (np.float64, np.nan),  # 小数の価格（外貨等）を切り捨てないようfloat64で保持
+    'rating': (np.float64, np.nan),
+    'merchant_id': (str, ''),
+    'sakura_score': (np.float64, np.nan),
+}
+# float64で保持するが、整数値はintとして返す列（Productとの相互変換で型を保つ）
+_INTEGRAL_VALUE_COLUMNS = ('price',)
+# Productとの相互変換用に保持する文字列列（統計処理には使わない）
+_TEXT_COLUMNS = ('name', 'model', 'brand', 'amazon_url', 'affiliate_url')
+# 有効とみなす値の範囲（範囲外は無効値として扱う）
+_VALID_RANGES = {'rating': (1.0, 5.0), 'sakura_score': (0.0, 1.0)}
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Amazon商品情報を格納する拡張データクラス
     
@@ -150,58 +194,303 @@ class Product:
     @classmethod
     def from_api_response(cls, api_response: Dict[str, Any]) -> 'Product':
         """PA-API応答から商品オブジェクトを生成"""
-        # ASIN
-        asin = api_response.get('ASIN', '')
+        from tools.item_extractor import get_extractor, RAW_DATA_NONE
+        fields = get_extractor('model', raw_data=RAW_DATA_NONE).extract_one(api_response)
+        if fields is None:
+            raise ValueError("PA-API応答の形式が不正です")
+        return cls(**fields)
+    
+    @classmethod
+    def bulk_from_api_items(cls, items: Iterable[Dict[str, Any]], as_table: bool = False
+                            ) -> Tuple[Union[List['Product'], 'ProductTable'], Dict[str, Any]]:
+        """
+        PA-APIのアイテム群（1ページ分など）をまとめて商品に変換
         
-        # 商品情報
-        item_info = api_response.get('ItemInfo', {})
-        title = item_info.get('Title', {}).get('DisplayValue', 'Unknown')
+        アイテムは列単位で1回だけ走査し、__post_init__と同じ検証を列に対して
+        まとめて行う。無効な値は1件ごとに警告せず、件数と対象ASINの例を
+        要約として返す（ログは要約1行のみ）。
         
-        # ブランド情報
-        by_line_info = item_info.get('ByLineInfo', {})
-        brand = by_line_info.get('Brand', {}).get('DisplayValue', 'Unknown')
+        Args:
+            items: PA-APIのアイテム辞書（SearchResult/ItemsResultのItems）
+            as_table: Trueの場合はProductのリストではなくProductTableを返す
+            
+        Returns:
+            Tuple: 商品（ProductのリストまたはProductTable）と変換の要約
+                （items: 入力件数、converted: 変換件数、skipped: 形式不正で除外した件数、
+                invalid: フィールド別の補正件数、invalid_asins: フィールド別の補正したASINの例）
+        """
+        from tools.item_extractor import get_extractor, RAW_DATA_NONE
+        items = list(items)
+        columns = get_extractor('model', raw_data=RAW_DATA_NONE).extract_columns(items)
+        asins = columns['asin']
+        
+        invalid_rows: Dict[str, List[int]] = {}
+        for name, (low, high) in _VALID_RANGES.items():
+            values = columns.get(name, ())
+            rows = [i for i, value in enumerate(values) if value is not None and not low <= value <= high]
+            for i in rows:
+                values[i] = None
+            invalid_rows[name] = rows
+        counts = columns['reviews_count']
+        invalid_rows['reviews_count'] = [i for i, count in enumerate(counts) if count < 0]
+        for i in invalid_rows['reviews_count']:
+            counts[i] = 0
+        
+        summary = {
+            'items': len(items),
+            'converted': len(asins),
+            'skipped': len(items) - len(asins),
+            'invalid': {name: len(rows) for name, rows in invalid_rows.items()},
+            'invalid_asins': {name: [asins[i] for i in rows[:BULK_INVALID_SAMPLE_SIZE]]
+                              for name, rows in invalid_rows.items() if rows},
+        }
+        if summary['skipped'] or any(summary['invalid'].values()):
+            details = ", ".join(f"{name}={count}" for name, count in summary['invalid'].items() if count)
+            logger.info(
+                f"Bulk conversion: {summary['converted']}/{summary['items']} items converted, "
+                f"{summary['skipped']} skipped, invalid values reset ({details or 'none'})"
+            )
         
-        # モデル番号
-        manufacture_info = item_info.get('ManufactureInfo', {})
-        model = manufacture_info.get('ItemPartNumber', {}).get('DisplayValue', 'Unknown')
+        if as_table:
+            return ProductTable(columns), summary
+        names = list(columns)
+        return [cls(**dict(zip(names, row))) for row in zip(*columns.values())], summary
+
+
+class ProductRow:
+    """ProductTableの1行を参照するビュー（値はテーブルの列から都度読み出す）。
+    
+    Productと同じ名前の属性で値を参照でき、無効値はNoneとなる。
+    """
+    
+    __slots__ = ('_table', '_index')
+    
+    def __init__(self, table: 'ProductTable', index: int) -> None:
+        self._table = table
+        self._index = index
+    
+    def __getattr__(self, name: str) -> Any:
+        if name in PRODUCT_TABLE_FIELDS:
+            return self._table._value(name, self._index)
+        raise AttributeError(name)
+    
+    def to_product(self) -> Product:
+        """この行をProductに変換"""
+        return self._table._product(self._index)
+    
+    def __repr__(self) -> str:
+        return f"ProductRow(asin={self.asin!r}, rating={self.rating!r}, reviews_count={self.reviews_count!r})"
+
+
+class ProductTable:
+    """商品を列（NumPy配列）単位で保持する列指向コンテナ
+    
+    統計処理に使う列（rating、reviews_count、price、sakura_score）は型付きの
+    数値配列、asinとmerchant_idは文字列配列で保持する。欠損し得る列は
+    有効値マスクを併せ持ち、無効な要素の値（NaN、空文字）は参照しない。
+    name・model・brand・URLはProductとの相互変換を無損失にするための
+    object配列として保持する。
+    
+    カテゴリ全体を1回テーブル化すれば、SakuraDetectorの統計処理や
+    品質フィルタはPythonのリストを組み直さずにベクトル演算で実行できる。
+    """
+    
+    def __init__(self, columns: Dict[str, Any], masks: Optional[Dict[str, Any]] = None) -> None:
+        """
+        列の辞書からテーブルを作成
         
-        # レビュー情報
-        customer_reviews = api_response.get('CustomerReviews', {})
-        rating_str = customer_reviews.get('StarRating', {}).get('DisplayValue', '0')
-        try:
-            rating = float(rating_str)
-        except (ValueError, TypeError):
-            rating = None
+        Args:
+            columns: フィールド名→値の配列（asinとreviews_countは必須）
+            masks: 欠損し得る列の有効値マスク（省略した列は値から判定）
+            
+        Raises:
+            ValueError: 必須列が無い場合、列の長さが揃っていない場合
+        """
+        if 'asin' not in columns or 'reviews_count' not in columns:
+            raise ValueError("asinとreviews_countの列は必須です")
         
-        reviews_count = customer_reviews.get('Count', 0)
-        if isinstance(reviews_count, dict):
-            reviews_count = reviews_count.get('DisplayValue', 0)
-        try:
-            reviews_count = int(reviews_count)
-        except (ValueError, TypeError):
-            reviews_count = 0
-        
-        # 価格情報
-        price = None
-        offers = api_response.get('Offers', {}).get('Listings', [])
-        if offers and len(offers) > 0:
-            price_info = offers[0].get('Price', {})
-            if 'Amount' in price_info:
-                price = price_info['Amount']
+        masks = masks or {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._masks: Dict[str, np.ndarray] = {}
+        self._columns['asin'] = np.asarray(columns['asin'], dtype=str)
+        size = len(self._columns['asin'])
         
-        return cls(
-            asin=asin,
-            name=title,
-            model=model,
-            brand=brand,
-            price=price,
-            rating=rating,
-            reviews_count=reviews_count
+        for name in PRODUCT_TABLE_FIELDS:
+            if name == 'asin':
+                continue
+            values = columns.get(name)
+            if values is None:
+                values = [None] * size
+            if len(values) != size:
+                raise ValueError(f"列の長さが一致しません: {name} ({len(values)} != {size})")
+            if name in _TEXT_COLUMNS:
+                self._columns[name] = np.asarray(values, dtype=object)
+            elif name == 'reviews_count':
+                counts = np.asarray(values, dtype=np.int64)
+                self._columns[name] = np.maximum(counts, 0)
+                if (counts < 0).any():
+                    logger.warning(f"Invalid reviews_count: {int((counts < 0).sum())} rows. Setting to 0.")
+            else:
+                self._set_nullable(name, values, masks.get(name))
+        
+        self._validate_ranges()
+    
+    def _set_nullable(self, name: str, values: Any, mask: Optional[Any]) -> None:
+        """欠損し得る列を値配列と有効値マスクに分けて設定"""
+        if isinstance(values, np.ndarray) and values.dtype != object:
+            array = values
+            valid = np.ones(len(array), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        else:
+            valid = np.array([v is not None for v in values], dtype=bool)
+            if mask is not None:
+                valid &= np.asarray(mask, dtype=bool)
+            fill = _NULLABLE_COLUMNS[name][1]
+            array = [v if v is not None else fill for v in values]
+        
+        dtype, fill = _NULLABLE_COLUMNS[name]
+        array = np.asarray(array, dtype=dtype)
+        if dtype is not str:
+            array = np.where(valid, array, fill).astype(dtype)
+        self._columns[name] = array
+        self._masks[name] = valid
+    
+    def _validate_ranges(self) -> None:
+        """Product.__post_init__と同じ範囲外の値を無効化"""
+        for name, (low, high) in _VALID_RANGES.items():
+            values = self._columns[name]
+            out_of_range = self._masks[name] & ((values < low) | (values > high))
+            if out_of_range.any():
+                logger.warning(f"Invalid {name}: {int(out_of_range.sum())} rows. Setting to None.")
+                self._masks[name] = self._masks[name] & ~out_of_range
+                self._columns[name] = np.where(out_of_range, np.nan, values)
+    
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> 'ProductTable':
+        """
+        Productのリストからテーブルを作成
+        
+        Args:
+            products: 商品（Productまたは同じ属性を持つオブジェクト）
+            
+        Returns:
+            ProductTable: 列指向のテーブル
+        """
+        products = list(products)
+        return cls({name: [getattr(p, name) for p in products] for name in PRODUCT_TABLE_FIELDS})
+    
+    def to_products(self) -> List[Product]:
+        """全行をProductのリストに変換"""
+        return [self._product(i) for i in range(len(self))]
+    
+    def __len__(self) -> int:
+        return len(self._columns['asin'])
+    
+    def __iter__(self) -> Iterator[ProductRow]:
+        return (ProductRow(self, i) for i in range(len(self)))
+    
+    def __getitem__(self, key: Any) -> Union[ProductRow, 'ProductTable']:
+        """
+        行の参照（整数）または部分テーブルの取得（スライス、インデックス配列、真偽値マスク）
+        """
+        if isinstance(key, (int, np.integer)):
+            index = int(key)
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError(f"行番号が範囲外です: {key}")
+            return ProductRow(self, index)
+        
+        table = ProductTable.__new__(ProductTable)
+        table._columns = {name: values[key] for name, values in self._columns.items()}
+        table._masks = {name: mask[key] for name, mask in self._masks.items()}
+        return table
+    
+    def column(self, name: str) -> np.ndarray:
+        """
+        列の配列を取得（読み取り専用ビュー。無効な要素も含む）
+        
+        Raises:
+            KeyError: 未知の列名の場合
+        """
+        view = self._columns[name].view()
+        view.flags.writeable = False
+        return view
+    
+    def valid(self, name: str) -> np.ndarray:
+        """列の有効値マスクを取得（欠損しない列は全てTrue）"""
+        if name in self._masks:
+            return self._masks[name].copy()
+        if name not in self._columns:
+            raise KeyError(name)
+        return np.ones(len(self), dtype=bool)
+    
+    def valid_values(self, name: str) -> np.ndarray:
+        """列の有効な値のみを取得"""
+        values = self._columns[name]
+        return values[self._masks[name]] if name in self._masks else values.copy()
+    
+    def quality_mask(self, min_rating: float = DEFAULT_MIN_RATING,
+                     min_reviews: int = DEFAULT_MIN_REVIEWS) -> np.ndarray:
+        """
+        Product.meets_quality_criteriaと同じ判定を全行に対して実行
+        
+        Args:
+            min_rating: 最小評価値
+            min_reviews: 最小レビュー数
+            
+        Returns:
+            np.ndarray: 品質基準を満たす行がTrueの真偽値配列
+        """
+        sakura = self._columns['sakura_score']
+        high_quality = ~self._masks['sakura_score'] | (sakura < SAKURA_SCORE_THRESHOLD)
+        return (
+            self._masks['rating']
+            & (self._columns['rating'] >= min_rating)
+            & (self._columns['reviews_count'] >= min_reviews)
+            & high_quality
         )
+    
+    def filter(self, mask: Any) -> 'ProductTable':
+        """真偽値マスクがTrueの行だけの部分テーブルを取得"""
+        return self[np.asarray(mask, dtype=bool)]
+    
+    def _value(self, name: str, index: int) -> Any:
+        """1要素をPythonの値として取得（無効値はNone）"""
+        if name in self._masks and not self._masks[name][index]:
+            return None
+        value = self._columns[name][index]
+        value = value.item() if isinstance(value, np.generic) else value
+        if name in _INTEGRAL_VALUE_COLUMNS and float(value).is_integer():
+            return int(value)
+        return value
+    
+    def _product(self, index: int) -> Product:
+        """1行をProductに変換"""
+        return Product(**{name: self._value(name, index) for name in PRODUCT_TABLE_FIELDS})
 
 
-@dataclass
-class ProductReview:
+class _ScoreCacheSlot:
+    """スコアのキャッシュを保持するスロット
+    
+    データクラスのフィールドにしないため、fields()・asdict()・比較・reprには
+    含まれない。値は（計算に使ったフィールドの値, スコア）の組。
+    """
+    __slots__ = ('_score_cache',)
+    
+    def _cached_score(self, inputs: Tuple[Any, ...]) -> Optional[float]:
+        """入力が変わっていなければキャッシュ済みのスコアを返す（無ければNone）"""
+        cached = getattr(self, '_score_cache', None)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+        return None
+    
+    def clear_score_cache(self) -> None:
+        """キャッシュしたスコアを破棄（フィールドの変更は自動で検出される）"""
+        self._score_cache = None
+
+
+@dataclass(slots=True)
+class ProductReview(_ScoreCacheSlot):
     """商品レビュー情報を格納するデータクラス"""
     review_id: str
     product_asin: str
@@ -214,8 +503,22 @@ class ProductReview:
     helpful_count: int = 0
     total_votes: int = 0
     
+    def _score_inputs(self) -> Tuple[Any, ...]:
+        """サクラ確率の計算に使うフィールドの値"""
+        return (self.verified_purchase, self.rating, self.content, self.reviewer_name,
+                self.helpful_count, self.total_votes)
+    
     def calculate_sakura_probability(self) -> float:
-        """サクラレビューの確率を計算（0.0-1.0）"""
+        """サクラレビューの確率を計算（0.0-1.0、入力が変わらない限りキャッシュを返す）"""
+        inputs = self._score_inputs()
+        probability = self._cached_score(inputs)
+        if probability is None:
+            probability = self._compute_sakura_probability()
+            self._score_cache = (inputs, probability)
+        return probability
+    
+    def _compute_sakura_probability(self) -> float:
+        """サクラレビューの確率を計算"""
         score = 0.0
         
         # 未購入レビューは疑わしい
@@ -231,8 +534,7 @@ class ProductReview:
             score += 0.2
         
         # 汎用的な名前は疑わしい
-        generic_names = ['レビュアー', 'カスタマー', '購入者', 'ユーザー']
-        if any(name in self.reviewer_name for name in generic_names):
+        if any(name in self.reviewer_name for name in GENERIC_REVIEWER_NAMES):
             score += 0.2
         
         # 役立つ票の比率が低い
@@ -245,11 +547,158 @@ class ProductReview:
     
     def is_suspicious(self) -> bool:
         """サクラレビューの疑いがあるかどうかを判定"""
-        return self.calculate_sakura_probability() > 0.5
+        return self.calculate_sakura_probability() > SUSPICIOUS_REVIEW_THRESHOLD
+    
+    @classmethod
+    def score_batch(cls, reviews: Union[List['ProductReview'], 'ReviewFrame']) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        複数レビューのサクラ確率を一括計算
+        
+        ProductReviewのリストを指定した場合は、各レビューのキャッシュにも
+        結果を設定する（以降のcalculate_sakura_probability・is_suspiciousは
+        フィールドを変更しない限り再計算しない）。
+        
+        Args:
+            reviews: レビューのリストまたはReviewFrame
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: サクラ確率の配列と、疑わしいレビューがTrueの真偽値配列
+        """
+        frame = reviews if isinstance(reviews, ReviewFrame) else ReviewFrame.from_reviews(reviews)
+        probabilities = frame.sakura_probabilities()
+        if not isinstance(reviews, ReviewFrame):
+            for review, probability in zip(reviews, probabilities.tolist()):
+                review._score_cache = (review._score_inputs(), probability)
+        return probabilities, probabilities > SUSPICIOUS_REVIEW_THRESHOLD
 
 
-@dataclass
-class SakuraScore:
+class ReviewFrame:
+    """商品1件分のレビューを列（NumPy配列）単位で保持する列指向コンテナ
+    
+    評価・購入確認・投稿日時（datetime64）・本文の文字数・投票数を配列で持ち、
+    レビュアー名は重複を除いた名前の配列とその番号の配列として保持する。
+    タイトル・本文は保持せず、感情の一貫性分析に使う肯定語・否定語の
+    有無だけを作成時に判定しておく。
+    
+    商品ごとに1回作成すれば、SakuraDetectorのレビュー分析はProductReviewの
+    リストを走査せずに配列演算で実行できる。
+    
+    Attributes:
+        ratings: 評価（1-5）
+        verified: 購入確認済みか
+        dates: 投稿日時（タイムゾーン付きの日時は現地時刻として扱う）
+        content_lengths: 本文の文字数
+        helpful_counts: 役立った票数
+        total_votes: 総投票数
+        reviewer_names: 重複を除いたレビュアー名
+        reviewer_codes: 各レビューのレビュアー名のreviewer_names上の位置
+        has_positive: タイトルか本文に肯定語を含むか
+        has_negative: タイトルか本文に否定語を含むか
+    """
+    
+    def __init__(self, ratings: Any, verified: Any, dates: Any, content_lengths: Any,
+                 helpful_counts: Any, total_votes: Any, reviewer_names: Any,
+                 reviewer_codes: Any, has_positive: Any, has_negative: Any) -> None:
+        """
+        列の配列からフレームを作成（通常はfrom_reviewsを使用）
+        
+        Raises:
+            ValueError: 列の長さが揃っていない場合
+        """
+        self.ratings = np.asarray(ratings, dtype=np.int64)
+        self.verified = np.asarray(verified, dtype=bool)
+        self.dates = np.asarray(dates, dtype=REVIEW_DATE_DTYPE)
+        self.content_lengths = np.asarray(content_lengths, dtype=np.int64)
+        self.helpful_counts = np.asarray(helpful_counts, dtype=np.int64)
+        self.total_votes = np.asarray(total_votes, dtype=np.int64)
+        self.reviewer_names = np.asarray(reviewer_names, dtype=str)
+        self.reviewer_codes = np.asarray(reviewer_codes, dtype=np.int64)
+        self.has_positive = np.asarray(has_positive, dtype=bool)
+        self.has_negative = np.asarray(has_negative, dtype=bool)
+        
+        size = len(self.ratings)
+        for name in ('verified', 'dates', 'content_lengths', 'helpful_counts', 'total_votes',
+                     'reviewer_codes', 'has_positive', 'has_negative'):
+            if len(getattr(self, name)) != size:
+                raise ValueError(f"列の長さが一致しません: {name} ({len(getattr(self, name))} != {size})")
+    
+    @classmethod
+    def from_reviews(cls, reviews: Iterable[ProductReview]) -> 'ReviewFrame':
+        """
+        ProductReviewのリストからフレームを作成
+        
+        Args:
+            reviews: レビュー（ProductReviewまたは同じ属性を持つオブジェクト）
+            
+        Returns:
+            ReviewFrame: 列指向のフレーム
+        """
+        reviews = list(reviews)
+        names: Dict[str, int] = {}
+        codes = [names.setdefault(r.reviewer_name, len(names)) for r in reviews]
+        texts = [f"{r.title}\n{r.content}" for r in reviews]
+        return cls(
+            ratings=[r.rating for r in reviews],
+            verified=[bool(r.verified_purchase) for r in reviews],
+            dates=[_naive_datetime(r.review_date) for r in reviews],
+            content_lengths=[len(r.content) for r in reviews],
+            helpful_counts=[r.helpful_count for r in reviews],
+            total_votes=[r.total_votes for r in reviews],
+            reviewer_names=list(names),
+            reviewer_codes=codes,
+            has_positive=[any(word in text for word in POSITIVE_WORDS) for text in texts],
+            has_negative=[any(word in text for word in NEGATIVE_WORDS) for text in texts],
+        )
+    
+    def __len__(self) -> int:
+        return len(self.ratings)
+    
+    def days(self) -> np.ndarray:
+        """投稿日（datetime64[D]）の配列"""
+        return self.dates.astype('datetime64[D]')
+    
+    def weekdays(self) -> np.ndarray:
+        """投稿曜日の配列（月曜=0、datetime.weekday()と同じ）"""
+        # 1970-01-01は木曜日（3）
+        return (self.days().astype(np.int64) + 3) % 7
+    
+    def generic_name_mask(self) -> np.ndarray:
+        """汎用的なレビュアー名のレビューがTrueの真偽値配列"""
+        generic = np.array([any(name in reviewer for name in GENERIC_REVIEWER_NAMES)
+                            for reviewer in self.reviewer_names], dtype=bool)
+        if len(generic) == 0:
+            return np.zeros(len(self), dtype=bool)
+        return generic[self.reviewer_codes]
+    
+    def sakura_probabilities(self) -> np.ndarray:
+        """
+        ProductReview.calculate_sakura_probabilityと同じ判定を全レビューに対して実行
+        
+        Returns:
+            np.ndarray: 各レビューのサクラ確率（0.0-1.0）
+        """
+        # スカラー版と同じ順序で加算し、結果を一致させる
+        scores = np.zeros(len(self), dtype=np.float64)
+        scores += np.where(~self.verified, 0.3, 0.0)
+        scores += np.where(self.ratings == 5, 0.2, 0.0)
+        scores += np.where(self.content_lengths < MIN_REVIEW_CONTENT_LENGTH, 0.2, 0.0)
+        scores += np.where(self.generic_name_mask(), 0.2, 0.0)
+        voted = self.total_votes > 0
+        helpful_ratio = np.divide(self.helpful_counts, self.total_votes,
+                                  out=np.ones(len(self), dtype=np.float64), where=voted)
+        scores += np.where(voted & (helpful_ratio < 0.3), 0.1, 0.0)
+        return np.minimum(scores, 1.0)
+
+
+def _naive_datetime(value: Any) -> Any:
+    """タイムゾーン付きの日時を現地時刻のままタイムゾーンなしに変換"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+@dataclass(slots=True)
+class SakuraScore(_ScoreCacheSlot):
     """商品のサクラ度スコアを管理するデータクラス"""
     product_asin: str
     total_reviews: int
@@ -259,6 +708,13 @@ class SakuraScore:
     review_velocity: float  # 日あたりのレビュー投稿数
     merchant_reliability: float  # 販売者の信頼度（0.0-1.0）
     
+    def _score_inputs(self) -> Tuple[Any, ...]:
+        """総合スコアの計算に使うフィールドの値（評価分布はリスト内の変更も検出する）"""
+        distribution = self.rating_distribution
+        return (self.total_reviews, self.suspicious_reviews, self.verified_purchase_ratio,
+                tuple(distribution) if distribution is not None else None,
+                self.review_velocity, self.merchant_reliability)
+    
     def get_suspicious_ratio(self) -> float:
         """疑わしいレビューの比率を取得"""
         if self.total_reviews == 0:
@@ -284,7 +740,16 @@ class SakuraScore:
         return self.review_velocity > MAX_REVIEW_VELOCITY
     
     def calculate_overall_score(self) -> float:
-        """総合的なサクラ度スコアを計算（0.0-1.0）"""
+        """総合的なサクラ度スコアを計算（0.0-1.0、入力が変わらない限りキャッシュを返す）"""
+        inputs = self._score_inputs()
+        score = self._cached_score(inputs)
+        if score is None:
+            score = self._compute_overall_score()
+            self._score_cache = (inputs, score)
+        return score
+    
+    def _compute_overall_score(self) -> float:
+        """総合的なサクラ度スコアを計算"""
         score = 0.0
         
         # 疑わしいレビューの比率
@@ -309,16 +774,66 @@ class SakuraScore:
     def get_risk_level(self) -> str:
         """リスクレベルを取得（LOW, MEDIUM, HIGH）"""
         score = self.calculate_overall_score()
-        if score < 0.3:
+        if score < RISK_MEDIUM_THRESHOLD:
             return "LOW"
-        elif score < 0.7:
+        elif score < RISK_HIGH_THRESHOLD:
             return "MEDIUM"
         else:
             return "HIGH"
     
     def should_exclude(self) -> bool:
         """商品を除外すべきかどうかを判定"""
-        return self.calculate_overall_score() > 0.7
+        return self.calculate_overall_score() > RISK_HIGH_THRESHOLD
+    
+    @classmethod
+    def score_batch(cls, scores: List['SakuraScore']) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        複数商品の総合スコアとリスクレベルを一括計算
+        
+        各SakuraScoreのキャッシュにも結果を設定する（以降のcalculate_overall_score・
+        get_risk_level・should_excludeはフィールドを変更しない限り再計算しない）。
+        
+        Args:
+            scores: SakuraScoreのリスト
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 総合スコアの配列とリスクレベル（'LOW'、'MEDIUM'、'HIGH'）の配列
+        """
+        size = len(scores)
+        total = np.fromiter((s.total_reviews for s in scores), dtype=np.float64, count=size)
+        suspicious = np.fromiter((s.suspicious_reviews for s in scores), dtype=np.float64, count=size)
+        verified = np.fromiter((s.verified_purchase_ratio for s in scores), dtype=np.float64, count=size)
+        velocity = np.fromiter((s.review_velocity for s in scores), dtype=np.float64, count=size)
+        reliability = np.fromiter((s.merchant_reliability for s in scores), dtype=np.float64, count=size)
+        
+        # 評価分布（5段階でない分布は自然とみなす）
+        has_distribution = np.fromiter(
+            (bool(s.rating_distribution) and len(s.rating_distribution) == 5 for s in scores),
+            dtype=bool, count=size
+        )
+        distribution = np.zeros((size, 5), dtype=np.float64)
+        if has_distribution.any():
+            distribution[has_distribution] = [s.rating_distribution for s, valid
+                                              in zip(scores, has_distribution) if valid]
+        distribution_total = distribution.sum(axis=1)
+        five_star_ratio = np.divide(distribution[:, 4], distribution_total,
+                                    out=np.zeros(size, dtype=np.float64), where=distribution_total != 0)
+        
+        # スカラー版と同じ順序で加算し、結果を一致させる
+        suspicious_ratio = np.divide(suspicious, total, out=np.zeros(size, dtype=np.float64), where=total != 0)
+        overall = suspicious_ratio * 0.3
+        overall += (1.0 - verified) * 0.2
+        overall += np.where(five_star_ratio >= 0.8, 0.2, 0.0)
+        overall += np.where(velocity > MAX_REVIEW_VELOCITY, 0.2, 0.0)
+        overall += (1.0 - reliability) * 0.1
+        overall = np.minimum(overall, 1.0)
+        
+        for score, value in zip(scores, overall.tolist()):
+            score._score_cache = (score._score_inputs(), value)
+        levels = np.array(RISK_LEVELS)[
+            (overall >= RISK_MEDIUM_THRESHOLD).astype(np.int64) + (overall >= RISK_HIGH_THRESHOLD)
+        ]
+        return overall, levels
 
 
 class IntegratedAffiliateLinkGenerator:
@@ -426,7 +941,7 @@ class IntegratedAffiliateLinkGenerator:
                     return result
                 
                 # 特定のエラータイプの場合はリトライしない
-                if result.get('error_type') in ['authentication_error']:
+                if result.get('error_type') in ['authentication_error', 'circuit_open']:
                     logger.error(f"Non-retryable error: {result.get('error_type')}")
                     return result
                 
@@ -502,23 +1017,70 @@ class IntegratedAffiliateLinkGenerator:
         logger.info(f"API call for {cache_key}, response time: {response_time:.2f}s")
         return result
     
-    def process_affiliate_workflow(self, keyword: str, max_products: int = 15) -> Dict[str, Any]:
+    def _analyze_sakura(self, products: List[Any], pool: Optional[CandidatePool] = None) -> List[Any]:
+        """
+        サクラ検出を実行（候補プール指定時は未分析のASINのみ）
+        
+        Args:
+            products: 商品リスト
+            pool: 複数キーワードで共有する候補プール
+            
+        Returns:
+            List[SakuraAnalysisResult]: サクラ度でソートされた分析結果リスト
+        """
+        if pool is None:
+            return self.sakura_detector.batch_analyze(products)
+        
+        def compute(missing: List[str]) -> Dict[str, Any]:
+            wanted = set(missing)
+            targets = [p for p in products if p.asin in wanted]
+            return {r.product_asin: r for r in self.sakura_detector.batch_analyze(targets)}
+        
+        results = pool.run_stage('sakura', [p.asin for p in products], compute)
+        return sorted(results.values(), key=lambda r: r.sakura_score, reverse=True)
+    
+    def _check_playwright(self, asins: List[str], pool: Optional[CandidatePool] = None) -> List[Any]:
+        """
+        サクラチェッカーで確認（候補プール指定時は未確認のASINのみ）
+        
+        Args:
+            asins: ASINリスト
+            pool: 複数キーワードで共有する候補プール
+            
+        Returns:
+            List[SakuraCheckerResult]: チェック結果リスト
+        """
+        if pool is None:
+            return self.playwright_automation.batch_check(asins)
+        
+        results = pool.run_stage(
+            'playwright', asins,
+            lambda missing: {r.asin: r for r in self.playwright_automation.batch_check(missing)}
+        )
+        return list(results.values())
+    
+    def process_affiliate_workflow(self, keyword: str, max_products: int = 15,
+                                   pool: Optional[CandidatePool] = None) -> Dict[str, Any]:
         """
         アフィリエイトワークフロー全体を実行
         
         Args:
             keyword: 検索キーワード
             max_products: 最大商品数
+            pool: 複数キーワードで共有する候補プール。指定時は他のキーワードで
+                既に抽出・分析済みのASINを再処理しない。
             
         Returns:
             Dict[str, Any]: 処理結果
         """
         import time
+        from tools.pa_api_client import PAAPICircuitOpenError
         start_time = time.time()
+        search_options = {'pool': pool} if pool is not None else {}
         
         try:
             # 1. PA-APIで商品検索
-            products = self.paapi_client.search_products(keyword, max_results=max_products)
+            products = self.paapi_client.search_products(keyword, max_results=max_products, **search_options)
             
             if not products:
                 return {
@@ -547,13 +1109,13 @@ class IntegratedAffiliateLinkGenerator:
                 }
             
             # 2. サクラ検出（フィルタリング後の商品のみ）
-            sakura_results = self.sakura_detector.batch_analyze(products)
+            sakura_results = self._analyze_sakura(products, pool)
             
             # 3. Playwright自動化（有効な場合）
             playwright_results = []
             if self.enable_playwright:
                 asins = [p.asin for p in products]
-                playwright_results = self.playwright_automation.batch_check(asins)
+                playwright_results = self._check_playwright(asins, pool)
             
             # 4. 結果統合と品質評価
             integrated_products = self._integrate_results(products, sakura_results, playwright_results)
@@ -573,6 +1135,14 @@ class IntegratedAffiliateLinkGenerator:
                 'quality_score': self._calculate_overall_quality_score(quality_results)
             }
             
+        except PAAPICircuitOpenError as e:
+            # PA-API障害中はワークフロー全体の再実行も無駄になるため即座に返す
+            logger.error(f"PA-API circuit open: {e}")
+            return self._create_error_response(
+                start_time=start_time,
+                error_message=f"PA-API unavailable: {str(e)}",
+                error_type='circuit_open'
+            )
         except ConnectionError as e:
             logger.error(f"PA-API Connection error: {e}")
             return self._create_error_response(
@@ -599,9 +1169,9 @@ class IntegratedAffiliateLinkGenerator:
             logger.warning(f"Runtime error occurred, attempting graceful degradation: {e}")
             try:
                 # Playwrightなしで処理を続行（優雅な劣化）
-                products = self.paapi_client.search_products(keyword, max_results=max_products)
+                products = self.paapi_client.search_products(keyword, max_results=max_products, **search_options)
                 if products:
-                    sakura_results = self.sakura_detector.batch_analyze(products)
+                    sakura_results = self._analyze_sakura(products, pool)
                     integrated_products = self._integrate_results(products, sakura_results, [])
                     quality_results = self.assess_product_quality(integrated_products)
                     
@@ -826,7 +1396,8 @@ class IntegratedAffiliateLinkGenerator:
             'consistency_score': max(0.0, 100.0 - sakura_variance)
         }
     
-    def process_concurrent_workflow(self, keywords: List[str], max_products_per_keyword: int = 5) -> Dict[str, Any]:
+    def process_concurrent_workflow(self, keywords: List[str],
+                                    max_products_per_keyword: int = DEFAULT_PRODUCTS_PER_KEYWORD) -> Dict[str, Any]:
         """
         並行処理ワークフロー
         
@@ -837,10 +1408,13 @@ class IntegratedAffiliateLinkGenerator:
         Returns:
             Dict[str, Any]: 並行処理結果
         """
+        from tools.candidate_pool import CandidatePool
         results = []
+        # キーワード間で重複するASINの抽出・分析は1回だけ行う
+        pool = CandidatePool()
         
         for keyword in keywords:
-            result = self.process_affiliate_workflow(keyword, max_products_per_keyword)
+            result = self.process_affiliate_workflow(keyword, max_products_per_keyword, pool=pool)
             results.append({
                 'keyword': keyword,
                 'result': result,
@@ -851,7 +1425,8 @@ class IntegratedAffiliateLinkGenerator:
         return {
             'concurrent_results': results,
             'total_keywords': len(keywords),
-            'total_processing_time': sum(r.get('processing_time', 0.0) for r in results)
+            'total_processing_time': sum(r.get('processing_time', 0.0) for r in results),
+            'candidate_pool': pool.stats()
         }
     
     def optimize_affiliate_links(self, products: List[Dict[str, Any]], tracking_params: Dict[str, str] = None) -> List[Dict[str, Any]]:
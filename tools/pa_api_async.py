@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Amazon PA-API 5.0 非同期クライアント
+
+PAAPIClientと同じ操作（search_items、get_items、search_products、batch_lookup）を
+コルーチンとして提供する。バックオフとレート制限の待機はasyncio.sleepで行うため、
+同じイベントループ上でPlaywrightによるサクラチェックと並行して実行できる。
+
+python-amazon-paapiにはネイティブの非同期APIがないため、SDK呼び出しのみ
+asyncio.to_threadでワーカースレッドに逃がす。設定・接続プール・レートリミッター・
+応答キャッシュは内部のPAAPIClientと共有する。
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from tools.candidate_pool import CandidatePool
+from tools.pa_api_client import (
+    PAAPIClient,
+    PAAPIConfig,
+    PAAPIRateLimitError,
+    MAX_ITEMS_PER_REQUEST,
+    DEFAULT_MIN_REVIEWS,
+    DEFAULT_MIN_RATING,
+    DEFAULT_SEARCH_RESOURCES,
+    DEFAULT_GET_ITEMS_RESOURCES,
+    DEFAULT_DETAIL_PROFILE,
+    ResourceSpec,
+    resolve_resources,
+)
+
+# ロガー設定
+logger = logging.getLogger(__name__)
+
+
+class AsyncPAAPIClient:
+    """Amazon PA-API 5.0 非同期クライアント。
+
+    Attributes:
+        config: PA-API設定情報
+    """
+
+    def __init__(self, config_path: Optional[Path] = None,
+                 client: Optional[PAAPIClient] = None) -> None:
+        """非同期PA-APIクライアントを初期化。
+
+        Args:
+            config_path: 設定ファイルのパス（clientを渡した場合は無視）
+            client: 状態を共有する同期クライアント。Noneの場合は新規作成。
+
+        Raises:
+            PAAPIConfigError: 設定ファイルの読み込みに失敗した場合
+            PAAPIAuthenticationError: 認証情報が不正な場合
+        """
+        self._owns_client = client is None
+        self._client = client if client is not None else PAAPIClient(config_path=config_path)
+
+    @property
+    def config(self) -> PAAPIConfig:
+        """PA-API設定情報。"""
+        return self._client.config
+
+    @property
+    def sync_client(self) -> PAAPIClient:
+        """状態を共有している同期クライアント。"""
+        return self._client
+
+    def close(self) -> None:
+        """自分で作成した同期クライアントを閉じる（渡されたクライアントは呼び出し側が閉じる）。"""
+        if self._owns_client:
+            self._client.close()
+
+    async def _acquire_rate_limit(self, country: str, remaining: Optional[float] = None) -> None:
+        """送信前にレート制限のトークンを非同期に確保。
+
+        Args:
+            country: 国コード
+            remaining: 呼び出しの期限までの残り秒数（Noneで無期限）
+
+        Raises:
+            PAAPIRateLimitError: 待機上限内にトークンを確保できない場合
+        """
+        limiter = self._client._get_rate_limiter(country)
+        if not await limiter.acquire_async(max_wait=self._client._rate_limit_max_wait(remaining)):
+            raise PAAPIRateLimitError(
+                f"レート制限エラー: リクエスト上限に達しました "
+                f"({self.config.requests_per_second}TPS, {self.config.requests_per_day}件/日)"
+            )
+
+    async def _execute_with_retry(self, operation_name: str, use_cache: bool = True,
+                                  deadline: Optional[float] = None, country: Optional[str] = None,
+                                  **kwargs) -> Dict[str, Any]:
+        """リトライ機能付きでPA-API操作を非同期に実行。
+
+        1回の試行はPAAPIClient.attempt_requestに任せ、レート制限とバックオフの
+        待機だけをイベントループをブロックしないasyncio.sleepで行う。
+
+        Args:
+            operation_name: 操作名（'search_items'、'get_items'）
+            use_cache: キャッシュからの読み出しを行うか
+            deadline: 待機を含めた期限（秒）。Noneの場合は設定値。
+            country: 送信先の国コード。Noneの場合は設定リージョンから決定。
+            **kwargs: API操作に渡すパラメータ
+
+        Returns:
+            API応答辞書
+
+        Raises:
+            PAAPIRateLimitError: レート制限に達した場合（attemptsに送信回数）
+            PAAPINetworkError: 通信エラーまたはAPIエラー（attemptsに送信回数）
+        """
+        request = self._client.prepare_request(operation_name, kwargs, use_cache=use_cache,
+                                               deadline=deadline, country=country)
+        if request.cached is not None:
+            return request.cached
+
+        while True:
+            # 送信前にトークンを確保（確保できない場合はリトライせず即座に失敗）
+            await self._acquire_rate_limit(request.country, request.retry.remaining())
+            # クォータ台帳の予約とSDK呼び出しはブロッキングのためワーカースレッドで実行
+            response, error, delay = await asyncio.to_thread(
+                self._client.attempt_request, request, rate_limit_acquired=True
+            )
+            if error is None:
+                return response
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+
+    async def search_items(self, keywords: str, search_index: str = "All",
+                           item_count: int = MAX_ITEMS_PER_REQUEST, item_page: int = 1,
+                           resources: Optional[ResourceSpec] = None,
+                           use_cache: bool = True,
+                           deadline: Optional[float] = None,
+                           country: Optional[str] = None) -> Dict[str, Any]:
+        """製品検索を非同期に実行。
+
+        Args:
+            keywords: 検索キーワード
+            search_index: 検索カテゴリ（All, Electronics, Books等）
+            item_count: 取得件数（最大10件）
+            item_page: ページ番号（1から開始）
+            resources: 取得するリソース項目、またはRESOURCE_PROFILESのプロファイル名
+            use_cache: 鮮度内のキャッシュがあれば使用するか
+            deadline: リトライの待機を含めた期限（秒）。Noneの場合は設定値。
+            country: 送信先の国コード。Noneの場合は設定リージョンから決定。
+
+        Returns:
+            検索結果の辞書
+
+        Raises:
+            ValueError: 未知のリソースプロファイルが指定された場合
+            PAAPIRateLimitError: レート制限に達した場合
+            PAAPINetworkError: 通信エラーまたはAPIエラー
+        """
+        search_params = {
+            "keywords": keywords,
+            "search_index": search_index,
+            "item_count": min(item_count, MAX_ITEMS_PER_REQUEST),
+            "item_page": item_page,
+            "resources": resolve_resources(resources, DEFAULT_SEARCH_RESOURCES)
+        }
+
+        return await self._execute_with_retry("search_items", use_cache=use_cache, deadline=deadline,
+                                              country=country, **search_params)
+
+    async def get_items(self, asins: List[str],
+                        resources: Optional[ResourceSpec] = None,
+                        use_cache: bool = True,
+                        deadline: Optional[float] = None,
+                        country: Optional[str] = None) -> Dict[str, Any]:
+        """ASIN指定で製品詳細を非同期に取得。
+
+        Args:
+            asins: ASINのリスト（最大10件）
+            resources: 取得するリソース項目、またはRESOURCE_PROFILESのプロファイル名
+            use_cache: 鮮度内のキャッシュがあれば使用するか
+            deadline: リトライの待機を含めた期限（秒）。Noneの場合は設定値。
+            country: 送信先の国コード。Noneの場合は設定リージョンから決定。
+
+        Returns:
+            製品詳細の辞書
+
+        Raises:
+            ValueError: ASINが不正または範囲外の場合、未知のプロファイルの場合
+            PAAPIRateLimitError: レート制限に達した場合
+            PAAPINetworkError: 通信エラーまたはAPIエラー
+        """
+        if not asins:
+            raise ValueError("ASINが指定されていません")
+
+        if len(asins) > MAX_ITEMS_PER_REQUEST:
+            raise ValueError(f"ASINは最大{MAX_ITEMS_PER_REQUEST}件まで指定可能です")
+
+        get_items_params = {
+            "items": asins,
+            "resources": resolve_resources(resources, DEFAULT_GET_ITEMS_RESOURCES)
+        }
+
+        return await self._execute_with_retry("get_items", use_cache=use_cache, deadline=deadline,
+                                              country=country, **get_items_params)
+
+    async def search_products(self, keywords: str, min_reviews: int = DEFAULT_MIN_REVIEWS,
+                              min_rating: float = DEFAULT_MIN_RATING, search_index: str = "All",
+                              max_results: int = MAX_ITEMS_PER_REQUEST,
+                              raw_data: Optional[str] = None,
+                              pool: Optional[CandidatePool] = None) -> List[Dict[str, Any]]:
+        """品質基準を満たす商品を非同期に検索。
+
+        フィルタリング条件と戻り値はPAAPIClient.search_productsと同じ。
+
+        Args:
+            keywords: 検索キーワード
+            min_reviews: 最小レビュー数（サクラ対策）
+            min_rating: 最小評価値（品質保証）
+            search_index: 検索カテゴリ
+            max_results: 最大結果数
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
+            pool: 複数キーワードで共有する候補プール
+
+        Returns:
+            品質基準を満たす商品のリスト
+
+        Raises:
+            PAAPIRateLimitError: レート制限に達した場合
+            PAAPINetworkError: 通信エラーまたはAPIエラー
+        """
+        logger.info(f"商品検索開始: keywords='{keywords}', min_reviews={min_reviews}, min_rating={min_rating}")
+
+        response = await self.search_items(
+            keywords=keywords,
+            search_index=search_index,
+            item_count=max_results,
+            resources=DEFAULT_SEARCH_RESOURCES
+        )
+
+        items = response.get('data', {}).get('SearchResult', {}).get('Items', [])
+        filtered_products = self._client._filter_quality_products(items, min_reviews, min_rating, raw_data,
+                                                                  pool=pool, keyword=keywords)
+
+        logger.info(f"検索完了: {len(filtered_products)}件の商品が品質基準を満たしました")
+        return filtered_products
+
+    async def get_product_details(self, asin: str,
+                                  resources: ResourceSpec = DEFAULT_DETAIL_PROFILE,
+                                  raw_data: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """単一ASINの商品詳細情報を非同期に取得。
+
+        Args:
+            asin: 取得したい商品のASIN
+            resources: 取得するリソース項目、またはプロファイル名
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
+
+        Returns:
+            商品詳細情報の辞書、または商品が見つからない場合はNone
+
+        Raises:
+            PAAPIRateLimitError: レート制限に達した場合
+            PAAPINetworkError: 通信エラーまたはAPIエラー
+        """
+        products = await self.batch_lookup([asin], resources=resources, raw_data=raw_data)
+        return products[0] if products else None
+
+    async def batch_lookup(self, asins: List[str],
+                           resources: ResourceSpec = DEFAULT_DETAIL_PROFILE,
+                           raw_data: Optional[str] = None,
+                           country: Optional[str] = None) -> List[Dict[str, Any]]:
+        """複数ASINの商品詳細を非同期に一括取得。
+
+        Args:
+            asins: 取得したい商品のASINリスト（最大10件）
+            resources: 取得するリソース項目、またはプロファイル名
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
+            country: 送信先の国コード。Noneの場合は設定リージョンから決定。
+
+        Returns:
+            商品詳細情報のリスト
+
+        Raises:
+            ValueError: ASINが不正または範囲外の場合
+            PAAPIRateLimitError: レート制限に達した場合
+            PAAPINetworkError: 通信エラーまたはAPIエラー
+        """
+        if not asins:
+            return []
+
+        if len(asins) > MAX_ITEMS_PER_REQUEST:
+            raise ValueError(f"ASINは最大{MAX_ITEMS_PER_REQUEST}件まで指定可能です")
+
+        resource_list = resolve_resources(resources, DEFAULT_GET_ITEMS_RESOURCES)
+        response = await self.get_items(asins=asins, resources=resource_list, country=country)
+        return self._client._extract_detailed_products(response, resource_list, raw_data)
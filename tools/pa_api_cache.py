@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API応答の永続キャッシュ
+
+SQLiteを使ってPA-APIの応答をディスクに保存し、プロセスを跨いで再利用する。
+キーは操作名・正規化したパラメータ・マーケットプレイスから生成し、
+鮮度はリソース種別ごとのTTLで判定する（価格は短く、タイトルやブランドは長い）。
+
+同じ応答でも要求するリソースによって鮮度の基準が変わるため、
+TTLは保存時ではなく取得時に、要求されたリソースから決定する。
+
+エントリはキーとリソースの組で保存する。狭いリソースの応答（価格の更新など）で
+同じキーの広い応答（詳細取得など）を上書きしないためで、取得時は要求リソースを
+含むエントリのうち最も新しいものを返す。
+"""
+
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+import logging
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Callable
+
+logger = logging.getLogger(__name__)
+
+# リソース種別（先頭セグメント）ごとのTTL（秒）
+DEFAULT_RESOURCE_TTLS = {
+    'Offers': 3600,                   # 価格・在庫: 1時間
+    'CustomerReviews': 6 * 3600,      # 評価・レビュー数: 6時間
+    'ItemInfo': 3 * 86400,            # タイトル・ブランド等: 3日
+    'Images': 7 * 86400,              # 画像URL: 7日
+    'BrowseNodeInfo': 7 * 86400,      # カテゴリ: 7日
+}
+
+# リソース未指定（SDKの既定＝全リソース）を表す識別子
+ALL_RESOURCES = '*'
+
+# パラメータの正規化対象
+ASIN_LIST_PARAMS = ('items',)
+TEXT_PARAMS = ('keywords',)
+
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """キャッシュキー生成用にパラメータを正規化。
+
+    ASINリストは大文字化・重複排除・ソートし、キーワードは空白を詰めて
+    大文字小文字を区別しない形にする。resourcesはキーから除外する。
+    """
+    normalized = {}
+    for name, value in params.items():
+        if name == 'resources' or value is None:
+            continue
+        if name in ASIN_LIST_PARAMS:
+            values = [value] if isinstance(value, str) else value
+            normalized[name] = sorted({str(v).strip().upper() for v in values if v})
+        elif name in TEXT_PARAMS and isinstance(value, str):
+            normalized[name] = " ".join(value.split()).casefold()
+        else:
+            normalized[name] = value
+    return normalized
+
+
+def resource_set(resources: Optional[Iterable[str]]) -> List[str]:
+    """リソース指定をソート済みリストに変換（未指定は全リソース）。"""
+    if not resources:
+        return [ALL_RESOURCES]
+    return sorted(set(resources))
+
+
+def covers_resources(stored: List[str], requested: List[str]) -> bool:
+    """保存済みリソースが要求リソースを全て含むか判定（引数はresource_setの結果）。"""
+    if stored == [ALL_RESOURCES]:
+        return True
+    return requested != [ALL_RESOURCES] and set(requested) <= set(stored)
+
+
+class PAAPIResponseCache:
+    """SQLiteベースのPA-API応答キャッシュ。
+
+    Attributes:
+        path: キャッシュデータベースのパス
+        resource_ttls: リソース種別ごとのTTL（秒）
+    """
+
+    def __init__(self, path: Path, resource_ttls: Optional[Dict[str, int]] = None,
+                 clock: Callable[[], float] = time.time) -> None:
+        """キャッシュを初期化（データベースが無ければ作成）。
+
+        Args:
+            path: キャッシュデータベースのパス
+            resource_ttls: リソース種別ごとのTTLの上書き
+            clock: 現在時刻（UNIX時間）を返す関数
+        """
+        self.path = Path(path)
+        self.resource_ttls = dict(DEFAULT_RESOURCE_TTLS)
+        if resource_ttls:
+            self.resource_ttls.update(resource_ttls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # キーのみを主キーとする旧形式のテーブルは作り直す（キャッシュなので破棄してよい）
+            primary_keys = [
+                row[1] for row in self._conn.execute("PRAGMA table_info(responses)") if row[5]
+            ]
+            if primary_keys == ['key']:
+                self._conn.execute("DROP TABLE responses")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT NOT NULL,"
+                " operation TEXT NOT NULL,"
+                " resources TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " payload BLOB NOT NULL,"
+                " PRIMARY KEY (key, resources))"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(operation: str, params: Dict[str, Any], marketplace: str) -> str:
+        """操作名・正規化パラメータ・マーケットプレイスからキーを生成。"""
+        material = json.dumps(
+            {'operation': operation, 'params': normalize_params(params), 'marketplace': marketplace},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, resources: Optional[Iterable[str]]) -> int:
+        """要求リソースに対するTTL（最も短いものを採用）を取得。"""
+        requested = resource_set(resources)
+        if requested == [ALL_RESOURCES]:
+            return min(self.resource_ttls.values())
+
+        ttls = [
+            self.resource_ttls[resource.split('.', 1)[0]]
+            for resource in requested
+            if resource.split('.', 1)[0] in self.resource_ttls
+        ]
+        return min(ttls) if ttls else min(self.resource_ttls.values())
+
+    def get(self, key: str, resources: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """鮮度を満たすキャッシュ済み応答を取得。
+
+        保存済みの応答が要求リソースを全て含み、かつ要求リソースの
+        TTL内に取得されたものである場合のみヒットとする。
+        該当するエントリが複数ある場合は最も新しいものを返す。
+
+        Args:
+            key: make_keyで生成したキー
+            resources: 今回要求するリソース
+
+        Returns:
+            キャッシュ済み応答。該当なしまたは期限切れの場合はNone。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT resources, created_at, payload FROM responses WHERE key = ?"
+                " ORDER BY created_at DESC", (key,)
+            ).fetchall()
+
+        requested = resource_set(resources)
+        ttl = self.ttl_for(resources)
+        now = self._clock()
+        for stored_resources, created_at, payload in rows:
+            if covers_resources(json.loads(stored_resources), requested) and now - created_at < ttl:
+                with self._lock:
+                    self._hits += 1
+                return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(self, key: str, operation: str, response: Dict[str, Any],
+            resources: Optional[Iterable[str]] = None) -> bool:
+        """応答をキャッシュに保存。
+
+        同じキー・同じリソースのエントリは置き換え、今回のリソースに含まれる
+        狭いエントリは削除する。より広いリソースのエントリは残す。
+
+        Returns:
+            保存できた場合True（JSONに変換できない応答は保存しない）
+        """
+        try:
+            payload = zlib.compress(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+        except (TypeError, ValueError) as e:
+            logger.debug(f"キャッシュ不可の応答のため保存をスキップ ({operation}): {e}")
+            return False
+
+        stored = resource_set(resources)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT resources FROM responses WHERE key = ?", (key,)
+            ).fetchall()
+            superseded = [row[0] for row in rows if covers_resources(stored, json.loads(row[0]))]
+            self._conn.executemany(
+                "DELETE FROM responses WHERE key = ? AND resources = ?",
+                [(key, resources_json) for resources_json in superseded]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, operation, resources, created_at, payload)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, operation, json.dumps(stored), self._clock(), payload)
+            )
+            self._conn.commit()
+        return True
+
+    def purge_expired(self) -> int:
+        """最長TTLを過ぎたエントリを削除。
+
+        Returns:
+            削除したエントリ数
+        """
+        cutoff = self._clock() - max(self.resource_ttls.values())
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """全エントリを削除。"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュ統計を取得。"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            total = self._hits + self._misses
+            return {
+                'entries': size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / total if total else 0.0,
+                'path': str(self.path)
+            }
+
+    def close(self) -> None:
+        """データベース接続を閉じる。"""
+        with self._lock:
+            self._conn.close()
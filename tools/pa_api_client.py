@@ -11,15 +11,32 @@ TDD Refactor段階: 品質向上とコードの可読性改善
 """
 
 import os
-import yaml
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional, Dict, Any, List, Union
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Union, Callable, Iterator, Iterable, Mapping, Tuple
 from amazon_paapi import AmazonApi
 from amazon_paapi.errors import AsinNotFound, TooManyRequests, AmazonError
 
+from tools.rate_limiter import RateLimiter
+from tools.pa_api_cache import PAAPIResponseCache
+from tools.item_extractor import get_extractor, RAW_DATA_FULL, RAW_DATA_NONE, RAW_DATA_MODES
+from tools.request_coalescer import RequestCoalescer, DEFAULT_LINGER_SECONDS
+from tools.candidate_pool import CandidatePool
+from tools.config_service import get_config_service, find_config_path
+from tools.pa_api_metrics import PAAPIMetrics, format_metrics, payload_size
+from tools.circuit_breaker import CircuitBreaker, DEFAULT_FAILURE_THRESHOLD, DEFAULT_RECOVERY_TIMEOUT
+from tools.quota_ledger import QuotaLedger, PRIORITY_NORMAL, PRIORITIES, DEFAULT_LOW_PRIORITY_RESERVE
+from tools.pa_api_transport import FixtureStore, RecordingApi, ReplayApi, ResourceAwareAmazonApi, sdk_params
+from tools.retry_policy import (
+    RetryPolicy, RetryState, classify_error, is_network_error, ERROR_THROTTLED, ERROR_TRANSIENT,
+    DEFAULT_MAX_DELAY
+)
+
 # ロガー設定
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -32,9 +49,38 @@ DEFAULT_REQUESTS_PER_DAY = 8640
 DEFAULT_TIMEOUT_SECONDS = 10
 DEFAULT_RETRY_ATTEMPTS = 3
 DEFAULT_RETRY_DELAY = 1.0
+DEFAULT_POOL_SIZE = 4
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_RATE_LIMIT_MAX_WAIT = 60.0
+DEFAULT_CACHE_PATH = ".cache/pa_api/responses.sqlite3"
+DEFAULT_QUOTA_LEDGER_PATH = ".cache/pa_api/quota.sqlite3"
+DEFAULT_FIXTURES_PATH = ".cache/pa_api/fixtures"
+
+# 通信方式（live: 実API、record: 実APIの応答を記録、replay: 記録した応答を再生）
+TRANSPORT_LIVE = 'live'
+TRANSPORT_RECORD = 'record'
+TRANSPORT_REPLAY = 'replay'
+TRANSPORT_MODES = (TRANSPORT_LIVE, TRANSPORT_RECORD, TRANSPORT_REPLAY)
+
+# 計測値の出力形式
+METRICS_FORMAT_JSON = 'json'
+METRICS_FORMAT_PROMETHEUS = 'prometheus'
+METRICS_FORMATS = (METRICS_FORMAT_JSON, METRICS_FORMAT_PROMETHEUS)
+
+# リージョンから国コードへの対応表
+REGION_COUNTRY_MAPPING = {
+    'us-east-1': 'US',
+    'eu-west-1': 'UK',
+    'ap-northeast-1': 'JP'
+}
+DEFAULT_COUNTRY = 'US'
+
+# マーケットプレイス横断取得の既定の国コード
+DEFAULT_MARKETPLACES = ('JP', 'US', 'UK')
 
 # PA-API制限
 MAX_ITEMS_PER_REQUEST = 10
+MAX_SEARCH_PAGES = 10  # SearchItemsのitem_pageの上限
 DEFAULT_MIN_REVIEWS = 500
 DEFAULT_MIN_RATING = 4.0
 
@@ -60,6 +106,72 @@ DEFAULT_GET_ITEMS_RESOURCES = [
     "BrowseNodeInfo.BrowseNodes"
 ]
 
+# 名前付きリソースプロファイル（用途に必要な項目だけを取得してペイロードを削減）
+RESOURCE_PROFILES = {
+    # ランキング更新用: 評価・レビュー数・価格のみ
+    'ranking-minimal': [
+        "CustomerReviews.StarRating",
+        "CustomerReviews.Count",
+        "Offers.Listings.Price"
+    ],
+    # 検索結果のフィルタリング用
+    'search-default': DEFAULT_SEARCH_RESOURCES,
+    # 汎用の商品詳細
+    'item-default': DEFAULT_GET_ITEMS_RESOURCES,
+    # 記事作成用: ブランド・型番など詳細抽出に必要な項目を含む
+    'article-detail': [
+        "Images.Primary.Medium",
+        "Images.Primary.Large",
+        "ItemInfo.Title",
+        "ItemInfo.ByLineInfo",
+        "ItemInfo.ManufactureInfo",
+        "ItemInfo.Features",
+        "ItemInfo.ProductInfo",
+        "Offers.Listings.Price",
+        "CustomerReviews.StarRating",
+        "CustomerReviews.Count",
+        "BrowseNodeInfo.BrowseNodes"
+    ],
+    # 価格の差分更新用: 価格とレビュー数のみ
+    'offers-refresh': [
+        "Offers.Listings.Price",
+        "CustomerReviews.Count"
+    ],
+}
+
+ResourceSpec = Union[str, List[str]]
+
+# refresh_offersで保存済みレコードに反映するフィールド
+OFFER_FIELDS = ('price', 'price_display', 'review_count')
+
+# 詳細取得（get_product_details、batch_lookup等）の既定プロファイル
+DEFAULT_DETAIL_PROFILE = 'article-detail'
+
+
+def resolve_resources(resources: Optional[ResourceSpec], default: List[str]) -> List[str]:
+    """リソース指定（プロファイル名またはリスト）をリソースリストに解決。
+    
+    Args:
+        resources: プロファイル名、リソースのリスト、またはNone
+        default: 未指定時に使用するリソースリスト
+        
+    Returns:
+        重複を除いたリソースのリスト
+        
+    Raises:
+        ValueError: 未知のプロファイル名が指定された場合
+    """
+    if resources is None:
+        return list(default)
+    if isinstance(resources, str):
+        if resources not in RESOURCE_PROFILES:
+            raise ValueError(
+                f"未知のリソースプロファイルです: {resources} "
+                f"(利用可能: {', '.join(sorted(RESOURCE_PROFILES))})"
+            )
+        return list(RESOURCE_PROFILES[resources])
+    return list(dict.fromkeys(resources))
+
 
 class PAAPIAuthenticationError(Exception):
     """PA-API認証関連のエラー。
@@ -83,14 +195,29 @@ class PAAPIRateLimitError(Exception):
     """PA-APIレート制限エラー。
 
     1日のAPIリクエスト制限に達した場合に発生。
+
+    Attributes:
+        attempts: 断念するまでに送信した回数（送信前に失敗した場合は0）
     """
-    pass
+    attempts: int = 0
 
 
 class PAAPINetworkError(Exception):
     """PA-APIネットワークエラー。
 
     API通信時のネットワーク問題や接続タイムアウト時に発生。
+
+    Attributes:
+        attempts: 断念するまでに送信した回数（送信前に失敗した場合は0）
+    """
+    attempts: int = 0
+
+
+class PAAPICircuitOpenError(PAAPINetworkError):
+    """PA-APIサーキットブレーカー開放エラー。
+
+    連続した通信・APIエラーで回路が開いている間、
+    リクエストを送信せずに即座に発生。
     """
     pass
 
@@ -106,11 +233,31 @@ class PAAPIConfig:
         access_key: AWSアクセスキー
         secret_key: AWSシークレットアクセスキー  
         associate_tag: Amazonアソシエイトタグ
+        associate_tags: 国コード別のアソシエイトタグ（未指定の国はassociate_tag）
         region: APIエンドポイントのリージョン
         requests_per_day: 1日あたりのAPI呼び出し制限
         timeout_seconds: リクエストタイムアウト時間（秒）
-        retry_attempts: リトライ回数
-        retry_delay: リトライ間隔（秒）
+        retry_attempts: 初回を含む最大試行回数
+        retry_delay: リトライ待機の最小秒数（decorrelated jitterの基準）
+        retry_max_delay: リトライ待機の上限秒数
+        retry_deadline: 1呼び出しあたりの待機を含めた期限（秒、Noneで無期限）
+        pool_size: 国別に保持するAmazonApiインスタンス数
+        requests_per_second: 秒間リクエスト数の上限（TPS）
+        rate_limit_max_wait: レート制限による待機の上限（秒）
+        cache_enabled: 応答の永続キャッシュを使用するか
+        cache_path: キャッシュDBのパス（相対パスはプロジェクトルート基準）
+        cache_ttl: リソース種別ごとのTTL上書き（例: {'Offers': 1800}）
+        coalesce_enabled: 同一ASINの同時取得を集約するか
+        coalesce_linger: 集約のためにバッチの合流を待つ秒数（他の呼び出し元がいる場合のみ）
+        quota_ledger_enabled: プロセス間で共有する日次クォータ台帳を使用するか
+        quota_ledger_path: クォータ台帳DBのパス（相対パスはプロジェクトルート基準）
+        quota_low_priority_reserve: 低優先度ジョブに使わせない日次枠の割合
+        circuit_failure_threshold: 回路を開く連続失敗回数（0で無効）
+        circuit_recovery_timeout: 回路を開いてからプローブを許可するまでの秒数
+        raw_data_mode: 抽出結果のraw_data保持方法（'full'、'none'、'compressed'）
+        transport_mode: 通信方式（'live'、'record'、'replay'）
+        fixtures_path: 記録・再生に使うフィクスチャのディレクトリ（国コード別に分かれる）
+        metrics_enabled: 操作別のレイテンシ・ペイロード・リトライ等を計測するか
     """
     access_key: str
     secret_key: str
@@ -120,6 +267,151 @@ class PAAPIConfig:
     timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS
     retry_attempts: int = DEFAULT_RETRY_ATTEMPTS
     retry_delay: float = DEFAULT_RETRY_DELAY
+    retry_max_delay: float = DEFAULT_MAX_DELAY
+    retry_deadline: Optional[float] = None
+    pool_size: int = DEFAULT_POOL_SIZE
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND
+    rate_limit_max_wait: float = DEFAULT_RATE_LIMIT_MAX_WAIT
+    cache_enabled: bool = True
+    cache_path: str = DEFAULT_CACHE_PATH
+    cache_ttl: Dict[str, int] = field(default_factory=dict)
+    coalesce_enabled: bool = True
+    coalesce_linger: float = DEFAULT_LINGER_SECONDS
+    quota_ledger_enabled: bool = True
+    quota_ledger_path: str = DEFAULT_QUOTA_LEDGER_PATH
+    quota_low_priority_reserve: float = DEFAULT_LOW_PRIORITY_RESERVE
+    circuit_failure_threshold: int = DEFAULT_FAILURE_THRESHOLD
+    circuit_recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT
+    raw_data_mode: str = RAW_DATA_FULL
+    transport_mode: str = TRANSPORT_LIVE
+    fixtures_path: str = DEFAULT_FIXTURES_PATH
+    associate_tags: Dict[str, str] = field(default_factory=dict)
+    metrics_enabled: bool = True
+
+
+@dataclass
+class PAAPIRequest:
+    """リトライを跨いで引き継ぐ1回のPA-API呼び出しの状態。
+
+    PAAPIClient.prepare_requestで作成し、試行ごとにattempt_requestへ渡す。
+
+    Attributes:
+        operation_name: 操作名（'search_items'、'get_items'）
+        params: API操作に渡すパラメータ
+        country: 送信先の国コード
+        cache_key: 応答キャッシュのキー（キャッシュ無効時はNone）
+        cached: 鮮度内のキャッシュ済み応答（ミス時はNone）
+        breaker: 送信先のサーキットブレーカー（無効な場合はNone）
+        retry: リトライ状態
+    """
+    operation_name: str
+    params: Dict[str, Any]
+    country: str
+    cache_key: Optional[str]
+    cached: Optional[Dict[str, Any]]
+    breaker: Optional[CircuitBreaker]
+    retry: RetryState
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    """例外が接続障害（インスタンスの再生成が必要な状態）を示すかを判定。"""
+    # 認証失敗・4xx・5xxなど応答を受け取れたエラーではインスタンスを再生成しない
+    return is_network_error(error)
+
+
+class AmazonApiPool:
+    """国コード別にAmazonApiインスタンスを保持するスレッドセーフなプール。
+
+    AmazonApiの生成はHTTPセッションや署名設定の初期化を伴うため、
+    生成済みインスタンスを国コード毎に再利用する。接続障害が発生した
+    インスタンスのみ破棄し、次回の取得時に再生成する。
+
+    Attributes:
+        max_size: 国コード毎に保持するアイドルインスタンスの上限
+    """
+
+    def __init__(self, factory: Callable[[str], Any], max_size: int = DEFAULT_POOL_SIZE) -> None:
+        """プールを初期化。
+
+        Args:
+            factory: 国コードを受け取りAmazonApiインスタンスを生成する関数
+            max_size: 国コード毎に保持するアイドルインスタンスの上限
+        """
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self._idle: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+
+    def acquire(self, country: str) -> Any:
+        """インスタンスを取得。アイドルがなければ新規生成する。"""
+        with self._lock:
+            idle = self._idle.get(country)
+            if idle:
+                self._reused += 1
+                return idle.pop()
+
+        # 生成はロック外で行い、他スレッドの取得を妨げない
+        client = self._factory(country)
+        with self._lock:
+            self._created += 1
+        return client
+
+    def release(self, country: str, client: Any, discard: bool = False) -> None:
+        """インスタンスをプールに返却。
+
+        Args:
+            country: 国コード
+            client: 返却するインスタンス
+            discard: Trueの場合は再利用せず破棄する
+        """
+        with self._lock:
+            if discard:
+                self._discarded += 1
+                return
+            idle = self._idle.setdefault(country, [])
+            if len(idle) < self.max_size:
+                idle.append(client)
+
+    @contextmanager
+    def connection(self, country: str) -> Iterator[Any]:
+        """インスタンスを貸し出し、接続障害時のみ破棄するコンテキスト。"""
+        client = self.acquire(country)
+        discard = False
+        try:
+            yield client
+        except BaseException as e:
+            discard = _is_connection_error(e)
+            if discard:
+                logger.warning(f"PA-API接続エラーのためクライアントを再生成します ({country}): {e}")
+            raise
+        finally:
+            self.release(country, client, discard=discard)
+
+    def prefill(self, country: str, count: Optional[int] = None) -> None:
+        """指定国のインスタンスを事前生成してプールに格納。"""
+        target = self.max_size if count is None else min(count, self.max_size)
+        with self._lock:
+            missing = target - len(self._idle.get(country, []))
+        for _ in range(max(0, missing)):
+            self.release(country, self.acquire(country))
+
+    def clear(self) -> None:
+        """保持している全インスタンスを破棄。"""
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """プールの利用統計を取得。"""
+        with self._lock:
+            return {
+                'created': self._created,
+                'reused': self._reused,
+                'discarded': self._discarded,
+                'idle': {country: len(idle) for country, idle in self._idle.items()}
+            }
 
 
 class PAAPIClient:
@@ -128,21 +420,53 @@ class PAAPIClient:
     設定ファイルの読み込み、環境変数の処理、認証情報の管理を行い、
     PA-APIへのリクエスト送信に必要な基盤を提供。
 
+    AmazonApiインスタンスは国コード別の接続プールで保持し、
+    リクエスト間で再利用する。送信前には国コード別のトークンバケットで
+    TPSと1日の上限を平準化し、全スレッド・コルーチンで共有する。
+    応答はディスク上のキャッシュに保存し、鮮度内であれば通信と
+    クォータ消費を行わずに返す。
+
     Attributes:
         config: PA-API設定情報
     """
     
-    def __init__(self, config_path: Optional[Path] = None) -> None:
+    def __init__(self, config_path: Optional[Path] = None,
+                 priority: str = PRIORITY_NORMAL,
+                 transport: Optional[Callable[[str], Any]] = None) -> None:
         """PA-APIクライアントを初期化。
         
         Args:
             config_path: 設定ファイルのパス。Noneの場合は自動検索。
+            priority: クォータ台帳に対する優先度（'normal'または'low'）。
+                一括更新などのバッチジョブは'low'を指定すると、
+                残り枠が少ないときに通常優先度の呼び出しへ枠を譲る。
+            transport: 国コードを受け取りAmazonApi互換オブジェクトを返す関数。
+                指定した場合はtransport_modeより優先する（ReplayApiやHttpApiを
+                差し込んだオフラインの負荷試験用）。
             
         Raises:
+            ValueError: 未知の優先度が指定された場合
             PAAPIConfigError: 設定ファイルが見つからないかpa_api設定がない場合
             PAAPIAuthenticationError: 認証情報が不正または不足している場合
         """
+        if priority not in PRIORITIES:
+            raise ValueError(f"未知の優先度です: {priority} (利用可能: {', '.join(PRIORITIES)})")
+        self.priority = priority
+        self._transport = transport
         self.config = self._load_config(config_path)
+        self._client_pool = AmazonApiPool(
+            lambda country: self._create_paapi_client(country),
+            max_size=self.config.pool_size
+        )
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._rate_limiters_lock = threading.Lock()
+        self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self._circuit_breakers_lock = threading.Lock()
+        self._response_cache = self._create_response_cache()
+        self._quota_ledger = self._create_quota_ledger()
+        self._coalescers: Dict[Tuple[str, ...], RequestCoalescer] = {}
+        self._coalescers_lock = threading.Lock()
+        self._metrics = PAAPIMetrics() if self.config.metrics_enabled else None
         
     def _load_config(self, config_path: Optional[Path] = None) -> PAAPIConfig:
         """設定情報を読み込んでPAAPIConfigインスタンスを作成。
@@ -158,6 +482,7 @@ class PAAPIClient:
             PAAPIAuthenticationError: 認証情報が不足または不正
         """
         resolved_path = self._resolve_config_path(config_path)
+        self.config_path = resolved_path
         settings = self._load_settings_file(resolved_path)
         pa_api_config = self._extract_pa_api_config(settings)
         
@@ -170,32 +495,27 @@ class PAAPIClient:
                 raise PAAPIConfigError(f"設定ファイル {DEFAULT_CONFIG_PATH} が見つかりません")
             return config_path
         
-        # プロジェクトルートを探索
-        current_dir = Path.cwd()
-        while current_dir != current_dir.parent:
-            config_file = current_dir / DEFAULT_CONFIG_PATH
-            if config_file.exists():
-                return config_file
-            current_dir = current_dir.parent
-        
-        raise PAAPIConfigError(f"設定ファイル {DEFAULT_CONFIG_PATH} が見つかりません")
+        # プロジェクトルートを探索（探索結果はプロセス内で共有）
+        config_file = find_config_path()
+        if config_file is None:
+            raise PAAPIConfigError(f"設定ファイル {DEFAULT_CONFIG_PATH} が見つかりません")
+        return config_file
     
-    def _load_settings_file(self, config_path: Path) -> Dict[str, Any]:
-        """YAML設定ファイルを読み込み。"""
+    def _load_settings_file(self, config_path: Path) -> Mapping[str, Any]:
+        """YAML設定ファイルを読み込み（解析結果はプロセス内で共有する読み取り専用ビュー）。"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+            return get_config_service().load(config_path)
         except Exception as e:
             raise PAAPIConfigError(f"設定ファイル読み込みエラー: {e}")
     
-    def _extract_pa_api_config(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_pa_api_config(self, settings: Mapping[str, Any]) -> Mapping[str, Any]:
         """設定からPA-API関連の設定を抽出。"""
         pa_api_config = settings.get('pa_api', {})
         if not pa_api_config:
             raise PAAPIConfigError("設定ファイルにpa_api設定が見つかりません")
         return pa_api_config
     
-    def _create_config_from_settings(self, pa_api_config: Dict[str, Any]) -> PAAPIConfig:
+    def _create_config_from_settings(self, pa_api_config: Mapping[str, Any]) -> PAAPIConfig:
         """PA-API設定辞書からPAAPIConfigインスタンスを作成。"""
         # 認証情報の取得（環境変数優先）
         access_key = os.environ.get('AWS_ACCESS_KEY_ID', 
@@ -211,6 +531,18 @@ class PAAPIClient:
         if not associate_tag:
             raise PAAPIConfigError("associate_tagが設定されていません")
         
+        raw_data_mode = pa_api_config.get('raw_data_mode', RAW_DATA_FULL)
+        if raw_data_mode not in RAW_DATA_MODES:
+            raise PAAPIConfigError(
+                f"raw_data_modeが不正です: {raw_data_mode} (利用可能: {', '.join(RAW_DATA_MODES)})"
+            )
+        
+        transport_mode = pa_api_config.get('transport_mode', TRANSPORT_LIVE)
+        if transport_mode not in TRANSPORT_MODES:
+            raise PAAPIConfigError(
+                f"transport_modeが不正です: {transport_mode} (利用可能: {', '.join(TRANSPORT_MODES)})"
+            )
+        
         return PAAPIConfig(
             access_key=access_key,
             secret_key=secret_key,
@@ -219,7 +551,36 @@ class PAAPIClient:
             requests_per_day=pa_api_config.get('requests_per_day', DEFAULT_REQUESTS_PER_DAY),
             timeout_seconds=pa_api_config.get('timeout_seconds', DEFAULT_TIMEOUT_SECONDS),
             retry_attempts=pa_api_config.get('retry_attempts', DEFAULT_RETRY_ATTEMPTS),
-            retry_delay=pa_api_config.get('retry_delay', DEFAULT_RETRY_DELAY)
+            retry_delay=pa_api_config.get('retry_delay', DEFAULT_RETRY_DELAY),
+            retry_max_delay=pa_api_config.get('retry_max_delay', DEFAULT_MAX_DELAY),
+            retry_deadline=pa_api_config.get('retry_deadline'),
+            pool_size=pa_api_config.get('pool_size', DEFAULT_POOL_SIZE),
+            requests_per_second=pa_api_config.get('requests_per_second', DEFAULT_REQUESTS_PER_SECOND),
+            rate_limit_max_wait=pa_api_config.get('rate_limit_max_wait', DEFAULT_RATE_LIMIT_MAX_WAIT),
+            cache_enabled=pa_api_config.get('cache_enabled', True),
+            cache_path=pa_api_config.get('cache_path', DEFAULT_CACHE_PATH),
+            cache_ttl=dict(pa_api_config.get('cache_ttl') or {}),
+            coalesce_enabled=pa_api_config.get('coalesce_enabled', True),
+            coalesce_linger=pa_api_config.get('coalesce_linger', DEFAULT_LINGER_SECONDS),
+            quota_ledger_enabled=pa_api_config.get('quota_ledger_enabled', True),
+            quota_ledger_path=pa_api_config.get('quota_ledger_path', DEFAULT_QUOTA_LEDGER_PATH),
+            quota_low_priority_reserve=pa_api_config.get(
+                'quota_low_priority_reserve', DEFAULT_LOW_PRIORITY_RESERVE
+            ),
+            circuit_failure_threshold=pa_api_config.get(
+                'circuit_failure_threshold', DEFAULT_FAILURE_THRESHOLD
+            ),
+            circuit_recovery_timeout=pa_api_config.get(
+                'circuit_recovery_timeout', DEFAULT_RECOVERY_TIMEOUT
+            ),
+            raw_data_mode=raw_data_mode,
+            transport_mode=transport_mode,
+            fixtures_path=pa_api_config.get('fixtures_path', DEFAULT_FIXTURES_PATH),
+            associate_tags={
+                str(country).upper(): tag
+                for country, tag in (pa_api_config.get('associate_tags') or {}).items()
+            },
+            metrics_enabled=pa_api_config.get('metrics_enabled', True)
         )
     
     def _validate_auth_credentials(self, access_key: str, secret_key: str) -> None:
@@ -233,9 +594,23 @@ class PAAPIClient:
                 "secret_keyが設定されていません"
             )
     
-    def _create_paapi_client(self) -> AmazonApi:
+    def _resolve_country(self) -> str:
+        """設定リージョンから国コードを決定。"""
+        return REGION_COUNTRY_MAPPING.get(self.config.region, DEFAULT_COUNTRY)
+    
+    def _associate_tag(self, country: str) -> str:
+        """国コードに対応するアソシエイトタグを取得。"""
+        return self.config.associate_tags.get(country, self.config.associate_tag)
+    
+    def _create_paapi_client(self, country: Optional[str] = None) -> AmazonApi:
         """PA-API AmazonApiクライアントを作成。
         
+        通常は接続プールから呼び出され、国コード毎に生成済みの
+        インスタンスが再利用される。
+        
+        Args:
+            country: 国コード。Noneの場合は設定リージョンから決定。
+        
         Returns:
             設定済みのAmazonApi PA-APIクライアント
             
@@ -243,28 +618,295 @@ class PAAPIClient:
             PAAPINetworkError: クライアント作成に失敗した場合
         """
         try:
-            # 国別設定を地域から決定
-            country_mapping = {
-                'us-east-1': 'US',
-                'eu-west-1': 'UK', 
-                'ap-northeast-1': 'JP'
-            }
-            country = country_mapping.get(self.config.region, 'US')
+            if country is None:
+                country = self._resolve_country()
+            
+            if self._transport is not None:
+                return self._transport(country)
             
-            return AmazonApi(
+            if self.config.transport_mode == TRANSPORT_REPLAY:
+                return ReplayApi(self._fixture_store(country))
+            
+            # 送信間隔はRateLimiterで制御するため、SDK側の待機は無効化
+            # （要求リソースを絞ったリクエストを送るためResourceAwareAmazonApiを使う）
+            api = ResourceAwareAmazonApi(
                 key=self.config.access_key,
                 secret=self.config.secret_key,
-                tag=self.config.associate_tag,
-                country=country
+                tag=self._associate_tag(country),
+                country=country,
+                throttling=0
             )
+            if self.config.transport_mode == TRANSPORT_RECORD:
+                return RecordingApi(api, self._fixture_store(country))
+            return api
         except Exception as e:
             raise PAAPINetworkError(f"PA-APIクライアント作成エラー: {e}")
     
-    def _handle_rate_limit(self, attempt: int) -> None:
-        """レート制限処理。"""
-        if attempt > 0:
-            delay = self.config.retry_delay * (2 ** (attempt - 1))  # 指数バックオフ
-            time.sleep(delay)
+    def _fixture_store(self, country: str) -> FixtureStore:
+        """国コード別のフィクスチャ置き場を取得。"""
+        return FixtureStore(self._resolve_data_path(self.config.fixtures_path) / country)
+    
+    def _create_response_cache(self) -> Optional[PAAPIResponseCache]:
+        """設定に従って応答キャッシュを作成（無効な場合はNone）。"""
+        if not self.config.cache_enabled:
+            return None
+        
+        try:
+            return PAAPIResponseCache(
+                self._resolve_data_path(self.config.cache_path),
+                resource_ttls=self.config.cache_ttl
+            )
+        except Exception as e:
+            logger.warning(f"応答キャッシュを初期化できないためキャッシュなしで動作します: {e}")
+            return None
+    
+    def _resolve_data_path(self, path: str) -> Path:
+        """データファイルのパスを解決（相対パスはプロジェクトルート基準）。"""
+        data_path = Path(path)
+        if not data_path.is_absolute():
+            # config/settings.yaml の親ディレクトリをプロジェクトルートとみなす
+            data_path = self.config_path.resolve().parent.parent / data_path
+        return data_path
+    
+    def _create_quota_ledger(self) -> Optional[QuotaLedger]:
+        """設定に従ってクォータ台帳を作成（無効な場合はNone）。"""
+        if not self.config.quota_ledger_enabled or not self.config.requests_per_day:
+            return None
+        
+        try:
+            return QuotaLedger(
+                self._resolve_data_path(self.config.quota_ledger_path),
+                daily_limit=self.config.requests_per_day,
+                low_priority_reserve=self.config.quota_low_priority_reserve
+            )
+        except Exception as e:
+            logger.warning(f"クォータ台帳を初期化できないため台帳なしで動作します: {e}")
+            return None
+    
+    def _quota_scope(self, country: str) -> str:
+        """クォータ台帳の集計単位（アソシエイトタグ×マーケットプレイス）。"""
+        return f"{self._associate_tag(country)}:{country}"
+    
+    def _reserve_quota(self, country: str) -> None:
+        """送信前にクォータ台帳から1回分の枠を予約。
+        
+        Raises:
+            PAAPIRateLimitError: 本日の枠（低優先度は予備枠を除く）を使い切った場合
+        """
+        if self._quota_ledger is None:
+            return
+        if not self._quota_ledger.reserve(self._quota_scope(country), priority=self.priority):
+            status = self._quota_ledger.status(self._quota_scope(country))
+            raise PAAPIRateLimitError(
+                f"レート制限エラー: 本日のクォータを使い切りました "
+                f"(優先度={self.priority}, 使用済み={status['used']}/{status['limit']}件)"
+            )
+    
+    def get_quota_status(self) -> Dict[str, Any]:
+        """クォータ台帳の残り枠と枯渇見込み時刻を取得。"""
+        if self._quota_ledger is None:
+            return {'enabled': False}
+        return {
+            'enabled': True,
+            'priority': self.priority,
+            **self._quota_ledger.status(self._quota_scope(self._resolve_country()))
+        }
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """応答キャッシュの統計を取得。"""
+        if self._response_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self._response_cache.stats()}
+
+    def close(self) -> None:
+        """応答キャッシュと使用量台帳のデータベース接続を閉じる。"""
+        if self._response_cache is not None:
+            self._response_cache.close()
+        if self._quota_ledger is not None:
+            self._quota_ledger.close()
+
+    def __enter__(self) -> 'PAAPIClient':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _count(self, operation_name: str, counter: str) -> None:
+        """計測が有効な場合にカウンターを加算。"""
+        if self._metrics is not None:
+            self._metrics.increment(operation_name, counter)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """操作別のレイテンシ（p50/p95/p99）・ペイロードサイズ・カウンターとクォータを取得。
+        
+        Returns:
+            enabled、operations（操作別の計測値）、totals（カウンター合計）、
+            quota（get_quota_statusの結果）を含む辞書
+        """
+        if self._metrics is None:
+            return {'enabled': False}
+        return {'enabled': True, **self._metrics.snapshot(), 'quota': self.get_quota_status()}
+    
+    def dump_metrics(self, format: str = METRICS_FORMAT_JSON, path: Optional[Path] = None) -> str:
+        """計測値をJSONまたはPrometheusのテキスト形式で出力。
+        
+        Args:
+            format: 出力形式（'json'または'prometheus'）
+            path: 書き出し先のファイル（Noneの場合は文字列を返すのみ）
+            
+        Returns:
+            整形した計測値
+            
+        Raises:
+            ValueError: 未知の出力形式が指定された場合
+        """
+        if format not in METRICS_FORMATS:
+            raise ValueError(f"未知の出力形式です: {format} (利用可能: {', '.join(METRICS_FORMATS)})")
+        if format == METRICS_FORMAT_PROMETHEUS:
+            metrics = self._metrics or PAAPIMetrics()
+            text = metrics.to_prometheus(quota=self.get_quota_status())
+        else:
+            text = format_metrics(self.get_metrics())
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(text, encoding='utf-8')
+        return text
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """接続プールの利用統計（生成数・再利用数・破棄数）を取得。"""
+        return self._client_pool.stats()
+    
+    def _get_rate_limiter(self, country: str) -> RateLimiter:
+        """国コード別のレートリミッターを取得（未作成なら生成）。"""
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(country)
+            if limiter is None:
+                limiter = RateLimiter(
+                    requests_per_second=self.config.requests_per_second,
+                    requests_per_day=self.config.requests_per_day
+                )
+                self._rate_limiters[country] = limiter
+            return limiter
+    
+    def _rate_limit_max_wait(self, remaining: Optional[float] = None) -> float:
+        """トークン待機の上限（呼び出しの期限が近ければ残り時間まで）。"""
+        if remaining is None:
+            return self.config.rate_limit_max_wait
+        return min(self.config.rate_limit_max_wait, remaining)
+    
+    def _acquire_rate_limit(self, country: str, remaining: Optional[float] = None) -> None:
+        """送信前にレート制限のトークンを確保。
+        
+        Args:
+            country: 国コード
+            remaining: 呼び出しの期限までの残り秒数（Noneで無期限）
+        
+        Raises:
+            PAAPIRateLimitError: 待機上限内にトークンを確保できない場合
+        """
+        limiter = self._get_rate_limiter(country)
+        if not limiter.acquire(max_wait=self._rate_limit_max_wait(remaining)):
+            raise PAAPIRateLimitError(
+                f"レート制限エラー: リクエスト上限に達しました "
+                f"({self.config.requests_per_second}TPS, {self.config.requests_per_day}件/日)"
+            )
+    
+    def _refund_rate_limit(self, country: str) -> None:
+        """送信しなかったリクエストのトークンをレートリミッターに返却。"""
+        self._get_rate_limiter(country).refund()
+    
+    def get_rate_limit_status(self) -> Dict[str, Any]:
+        """国コード別のレート制限トークン残量を取得。"""
+        with self._rate_limiters_lock:
+            limiters = dict(self._rate_limiters)
+        return {country: limiter.snapshot() for country, limiter in limiters.items()}
+    
+    def _get_circuit_breaker(self, country: str) -> Optional[CircuitBreaker]:
+        """国コード別のサーキットブレーカーを取得（無効な場合はNone）。"""
+        if self.config.circuit_failure_threshold <= 0:
+            return None
+        with self._circuit_breakers_lock:
+            breaker = self._circuit_breakers.get(country)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name=f"PA-API {country}",
+                    failure_threshold=self.config.circuit_failure_threshold,
+                    recovery_timeout=self.config.circuit_recovery_timeout
+                )
+                self._circuit_breakers[country] = breaker
+            return breaker
+    
+    def _check_circuit(self, breaker: Optional[CircuitBreaker]) -> None:
+        """回路が開いていれば即座に失敗。
+        
+        Raises:
+            PAAPICircuitOpenError: 回路が開いている、または別のプローブが実行中の場合
+        """
+        if breaker is not None and not breaker.allow_request():
+            raise PAAPICircuitOpenError(
+                f"PA-APIの障害を検知したためリクエストを停止中です ({breaker.name}, "
+                f"再試行まで{breaker.retry_after():.1f}秒)"
+            )
+    
+    def _record_circuit_outcome(self, breaker: Optional[CircuitBreaker],
+                                succeeded: Optional[bool]) -> None:
+        """呼び出し結果をサーキットブレーカーに記録。
+        
+        Args:
+            breaker: サーキットブレーカー（無効な場合はNone）
+            succeeded: 成功ならTrue、障害ならFalse、送信しなかった場合や
+                レート制限の場合はNone（成否を記録せずプローブ枠のみ解放）
+        """
+        if breaker is None:
+            return
+        if succeeded is True:
+            breaker.record_success()
+        elif succeeded is False:
+            breaker.record_failure()
+        else:
+            breaker.release()
+    
+    def get_circuit_status(self) -> Dict[str, Any]:
+        """国コード別のサーキットブレーカーの状態を取得。"""
+        with self._circuit_breakers_lock:
+            breakers = dict(self._circuit_breakers)
+        return {country: breaker.snapshot() for country, breaker in breakers.items()}
+    
+    def _start_retry(self, deadline: Optional[float] = None) -> RetryState:
+        """設定に従ったリトライポリシーで1回の呼び出しのリトライ状態を開始。"""
+        policy = RetryPolicy(
+            max_attempts=max(1, self.config.retry_attempts),
+            base_delay=self.config.retry_delay,
+            max_delay=self.config.retry_max_delay,
+            deadline=self.config.retry_deadline
+        )
+        return policy.start(deadline)
+    
+    def _handle_api_error(self, error: Exception, retry: RetryState,
+                          operation_name: Optional[str] = None) -> Tuple[Exception, Optional[float], bool]:
+        """SDKの例外を分類・変換し、リトライまでの待機秒数を決定。
+        
+        Returns:
+            (変換後の例外, 待機秒数またはNone（リトライしない）, 障害として数えるか)
+        """
+        error_class = classify_error(error)
+        translated = self._translate_api_error(error)
+        translated.__cause__ = error
+        delay = retry.next_delay(error_class)
+        if operation_name is not None:
+            if error_class == ERROR_THROTTLED:
+                self._count(operation_name, 'throttles')
+            if delay is not None:
+                self._count(operation_name, 'retries')
+        if delay is None:
+            translated.attempts = retry.attempts
+        else:
+            logger.info(
+                f"PA-API呼び出しをリトライします ({retry.attempts}回目が失敗, {error_class}): "
+                f"{delay:.2f}秒後"
+            )
+        # 一時的な通信障害のみをサーキットブレーカーの失敗として数える
+        return translated, delay, error_class == ERROR_TRANSIENT
     
     def _parse_api_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """API応答を解析して結果を返す。
@@ -291,63 +933,245 @@ class PAAPIClient:
         
         return response
     
-    def _execute_with_retry(self, operation_name: str, **kwargs) -> Dict[str, Any]:
+    def _execute_with_retry(self, operation_name: str, use_cache: bool = True,
+                            deadline: Optional[float] = None, country: Optional[str] = None,
+                            **kwargs) -> Dict[str, Any]:
         """リトライ機能付きでPA-API操作を実行。
         
+        鮮度内のキャッシュがあれば通信・レート制限を経ずに返す。
+        成功した応答はuse_cacheに関わらずキャッシュに保存する。
+        リトライするのはスロットリングと一時的な通信障害のみで、
+        待機時間はdecorrelated jitterで決める。
+        
         Args:
             operation_name: 操作名（'search'、'get_items'）
+            use_cache: キャッシュからの読み出しを行うか
+            deadline: 待機を含めた期限（秒）。Noneの場合は設定値。
+            country: 送信先の国コード。Noneの場合は設定リージョンから決定。
             **kwargs: API操作に渡すパラメータ
             
         Returns:
             API応答辞書
             
         Raises:
-            PAAPIRateLimitError: レート制限に達した場合
-            PAAPINetworkError: 通信エラーまたはAPIエラー
+            PAAPIRateLimitError: レート制限に達した場合（attemptsに送信回数）
+            PAAPINetworkError: 通信エラーまたはAPIエラー（attemptsに送信回数）
         """
-        client = self._create_paapi_client()
-        operation_method = getattr(client, operation_name)
+        request = self.prepare_request(operation_name, kwargs, use_cache=use_cache,
+                                       deadline=deadline, country=country)
+        if request.cached is not None:
+            return request.cached
+        
+        while True:
+            response, error, delay = self.attempt_request(request)
+            if error is None:
+                return response
+            if delay is None:
+                raise error
+            time.sleep(delay)
+    
+    def prepare_request(self, operation_name: str, params: Dict[str, Any], use_cache: bool = True,
+                        deadline: Optional[float] = None,
+                        country: Optional[str] = None) -> PAAPIRequest:
+        """呼び出しの送信先・キャッシュ・リトライ状態を準備。
         
-        last_error = None
-        for attempt in range(self.config.retry_attempts):
+        Args:
+            operation_name: 操作名（'search_items'、'get_items'）
+            params: API操作に渡すパラメータ
+            use_cache: キャッシュからの読み出しを行うか
+            deadline: 待機を含めた期限（秒）。Noneの場合は設定値。
+            country: 送信先の国コード。Noneの場合は設定リージョンから決定。
+            
+        Returns:
+            呼び出しの状態（鮮度内のキャッシュがあればcachedに格納）
+        """
+        country = country or self._resolve_country()
+        cache_key, cached = self._lookup_cache(operation_name, params, country, use_cache)
+        return PAAPIRequest(
+            operation_name=operation_name,
+            params=params,
+            country=country,
+            cache_key=cache_key,
+            cached=cached,
+            breaker=self._get_circuit_breaker(country),
+            retry=self._start_retry(deadline)
+        )
+    
+    def attempt_request(self, request: PAAPIRequest,
+                        rate_limit_acquired: bool = False
+                        ) -> Tuple[Optional[Dict[str, Any]], Optional[Exception], Optional[float]]:
+        """PA-API操作を1回試行（ブロッキング）。
+        
+        回路の確認・レート制限・クォータの予約・送信・応答の保存・
+        サーキットブレーカーへの記録までを行い、待機はしない。
+        回路が開いている・クォータを予約できないなど送信しない場合は、
+        確保済みのレート制限トークンを返却する。
+        同期・非同期のリトライループはこの結果に従って待機方法だけを変える。
+        
+        Args:
+            request: prepare_requestで準備した呼び出しの状態
+            rate_limit_acquired: 呼び出し側でレート制限のトークンを確保済みか
+                （非同期クライアントはイベントループ上で待機してから呼ぶ）
+            
+        Returns:
+            (応答, 例外, リトライまでの待機秒数) のタプル。成功時は例外がNone、
+            失敗時は応答がNoneで、待機秒数がNoneならリトライしない。
+            
+        Raises:
+            PAAPICircuitOpenError: 回路が開いている場合
+            PAAPIRateLimitError: トークンまたは日次クォータを確保できない場合
+        """
+        retry = request.retry
+        token_held = rate_limit_acquired
+        try:
+            # 回路が開いている間はバックオフで待たずに即座に失敗
+            self._check_circuit(request.breaker)
+        except PAAPICircuitOpenError:
+            if token_held:
+                self._refund_rate_limit(request.country)
+            raise
+        succeeded = None
+        try:
             try:
-                self._handle_rate_limit(attempt)
-                
-                response = operation_method(**kwargs)
-                return response  # 新しいSDKは直接辞書を返す
+                if not token_held:
+                    # 送信前にトークンを確保（確保できない場合はリトライせず即座に失敗）
+                    self._acquire_rate_limit(request.country, retry.remaining())
+                    token_held = True
+                # プロセス間で共有する日次クォータから枠を予約
+                self._reserve_quota(request.country)
+            except PAAPIRateLimitError:
+                # 送信しないため確保済みのトークンを返却
+                if token_held:
+                    self._refund_rate_limit(request.country)
+                raise
+            retry.record_attempt()
+            
+            try:
+                response = self._call_api(request.country, request.operation_name, request.params)
+                succeeded = True
+                self._store_response(request, response)
+                return response, None, None  # 新しいSDKは直接辞書を返す
                 
-            except AsinNotFound as e:
+            except AsinNotFound:
                 # ASIN見つからない場合は空の結果を返す
-                return {"data": {"ItemsResult": {"Items": []}}}
-            except TooManyRequests as e:
-                # レート制限の場合
-                logger.warning(f"PA-APIレート制限: {e}")
-                last_error = PAAPIRateLimitError(f"レート制限エラー: {e}")
-                if attempt == self.config.retry_attempts - 1:
-                    raise last_error
-                continue
-            except AmazonError as e:
-                # Amazon関連エラー
-                logger.error(f"PA-APIエラー: {e}")
-                last_error = PAAPINetworkError(f"API エラー: {e}")
-                if attempt == self.config.retry_attempts - 1:
-                    raise last_error
-                continue
+                succeeded = True
+                return {"data": {"ItemsResult": {"Items": []}}}, None, None
             except Exception as e:
-                # その他の例外処理
-                last_error = PAAPINetworkError(f"予期しないエラー: {e}")
-                if attempt == self.config.retry_attempts - 1:
-                    raise last_error
-                continue
+                error, delay, failed = self._handle_api_error(e, retry, request.operation_name)
+                if failed:
+                    succeeded = False
+                return None, error, delay
+        finally:
+            self._record_circuit_outcome(request.breaker, succeeded)
+    
+    def _lookup_cache(self, operation_name: str, params: Dict[str, Any], country: str,
+                      use_cache: bool) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """キャッシュキーを生成し、鮮度内の応答があれば取得。
+        
+        複数ASINのGetItemsは、同じ組み合わせの応答が無くてもASIN単位の
+        エントリが全て揃っていれば組み立てて返す。
+        
+        Returns:
+            (キャッシュキー, キャッシュ済み応答) のタプル。
+            キャッシュ無効時はキーがNone、ミス時は応答がNone。
+        """
+        if self._response_cache is None:
+            return None, None
+        
+        cache_key = self._response_cache.make_key(operation_name, params, country)
+        if use_cache:
+            cached = self._response_cache.get(cache_key, params.get('resources'))
+            if cached is None and operation_name == 'get_items':
+                cached = self._assemble_items_response(params, country)
+            if cached is not None:
+                logger.debug(f"PA-APIキャッシュヒット: {operation_name}")
+                self._count(operation_name, 'cache_hits')
+                return cache_key, cached
+            self._count(operation_name, 'cache_misses')
+        return cache_key, None
+    
+    def _item_cache_key(self, params: Dict[str, Any], asin: str, country: str) -> str:
+        """GetItemsのASIN単位のキャッシュキー（1件指定のリクエストと同じキー）。"""
+        return self._response_cache.make_key('get_items', {**params, 'items': [asin]}, country)
+    
+    def _assemble_items_response(self, params: Dict[str, Any], country: str) -> Optional[Dict[str, Any]]:
+        """ASIN単位のエントリから複数ASINのGetItems応答を組み立てる（1件でも欠ければNone）。"""
+        asins = list(dict.fromkeys(str(asin).strip().upper() for asin in params.get('items') or []))
+        if len(asins) < 2:
+            return None
+        items = []
+        for asin in asins:
+            entry = self._response_cache.get(self._item_cache_key(params, asin, country),
+                                             params.get('resources'))
+            if entry is None:
+                return None
+            items.extend(entry.get('data', {}).get('ItemsResult', {}).get('Items', []))
+        return {"data": {"ItemsResult": {"Items": items}}}
+    
+    def _store_response(self, request: PAAPIRequest, response: Dict[str, Any]) -> None:
+        """成功した応答をキャッシュに保存。
         
-        # ここに到達することはないはずだが、安全のため
-        if last_error:
-            raise last_error
-        raise PAAPINetworkError("未知のエラーが発生しました")
+        複数ASINのGetItemsはASIN単位でも保存し、チャンクの分け方が異なる
+        呼び出し（単一取得・集約・一括取得）からも再利用できるようにする。
+        """
+        if request.cache_key is None:
+            return
+        resources = request.params.get('resources')
+        self._response_cache.set(request.cache_key, request.operation_name, response, resources)
+        if (request.operation_name != 'get_items' or not isinstance(response, dict)
+                or len(request.params.get('items') or []) < 2):
+            return
+        for item in response.get('data', {}).get('ItemsResult', {}).get('Items', []):
+            if isinstance(item, dict) and item.get('ASIN'):
+                self._response_cache.set(
+                    self._item_cache_key(request.params, str(item['ASIN']), request.country),
+                    request.operation_name, {"data": {"ItemsResult": {"Items": [item]}}}, resources
+                )
+    
+    def _call_api(self, country: str, operation_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """プールからクライアントを借用してPA-API操作を1回実行（ブロッキング）。"""
+        started = time.perf_counter()
+        try:
+            # 接続障害時のみインスタンスを破棄・再生成
+            with self._client_pool.connection(country) as client:
+                # resourcesを受け付けないSDKには渡さない（キャッシュの判定には使う）
+                response = getattr(client, operation_name)(**sdk_params(client, operation_name, params))
+        except AsinNotFound:
+            # 該当なしは正常な応答として記録
+            self._observe_request(operation_name, started, payload_bytes=0)
+            raise
+        except Exception:
+            self._observe_request(operation_name, started, error=True)
+            raise
+        if self._metrics is not None:
+            self._observe_request(operation_name, started, payload_bytes=payload_size(response))
+        return response
+    
+    def _observe_request(self, operation_name: str, started: float,
+                         payload_bytes: Optional[int] = None, error: bool = False) -> None:
+        """計測が有効な場合にSDK呼び出し1回分のレイテンシと応答サイズを記録。"""
+        if self._metrics is not None:
+            self._metrics.observe_request(operation_name, time.perf_counter() - started,
+                                          payload_bytes=payload_bytes, error=error)
+    
+    def _translate_api_error(self, error: Exception) -> Exception:
+        """SDKの例外をPA-APIクライアントの例外に変換。"""
+        if isinstance(error, TooManyRequests):
+            # レート制限の場合
+            logger.warning(f"PA-APIレート制限: {error}")
+            return PAAPIRateLimitError(f"レート制限エラー: {error}")
+        if isinstance(error, AmazonError):
+            # Amazon関連エラー
+            logger.error(f"PA-APIエラー: {error}")
+            return PAAPINetworkError(f"API エラー: {error}")
+        # その他の例外処理
+        return PAAPINetworkError(f"予期しないエラー: {error}")
     
     def search_items(self, keywords: str, search_index: str = "All", 
                     item_count: int = MAX_ITEMS_PER_REQUEST, item_page: int = 1, 
-                    resources: Optional[List[str]] = None) -> Dict[str, Any]:
+                    resources: Optional[ResourceSpec] = None,
+                    use_cache: bool = True,
+                    deadline: Optional[float] = None) -> Dict[str, Any]:
         """製品検索を実行。
         
         Args:
@@ -355,41 +1179,49 @@ class PAAPIClient:
             search_index: 検索カテゴリ（All, Electronics, Books等）
             item_count: 取得件数（最大10件）
             item_page: ページ番号（1から開始）
-            resources: 取得するリソース項目
+            resources: 取得するリソース項目、またはRESOURCE_PROFILESのプロファイル名
+                （resourcesを受け付けないSDKには送らず、キャッシュの判定にのみ使う）
+            use_cache: 鮮度内のキャッシュがあれば使用するか
+            deadline: リトライの待機を含めた期限（秒）。Noneの場合は設定値。
             
         Returns:
             検索結果の辞書
             
         Raises:
+            ValueError: 未知のリソースプロファイルが指定された場合
             PAAPIRateLimitError: レート制限に達した場合
             PAAPINetworkError: 通信エラーまたはAPIエラー
         """
-        if resources is None:
-            resources = DEFAULT_SEARCH_RESOURCES
-        
         # 新しいSDKに合わせたパラメータ
         search_params = {
             "keywords": keywords,
             "search_index": search_index,
             "item_count": min(item_count, MAX_ITEMS_PER_REQUEST),
-            "item_page": item_page
+            "item_page": item_page,
+            "resources": resolve_resources(resources, DEFAULT_SEARCH_RESOURCES)
         }
         
-        return self._execute_with_retry("search_items", **search_params)
+        return self._execute_with_retry("search_items", use_cache=use_cache, deadline=deadline,
+                                        **search_params)
     
     def get_items(self, asins: List[str], 
-                 resources: Optional[List[str]] = None) -> Dict[str, Any]:
+                 resources: Optional[ResourceSpec] = None,
+                 use_cache: bool = True,
+                 deadline: Optional[float] = None) -> Dict[str, Any]:
         """ASIN指定で製品詳細を取得。
         
         Args:
             asins: ASINのリスト（最大10件）
-            resources: 取得するリソース項目
+            resources: 取得するリソース項目、またはRESOURCE_PROFILESのプロファイル名
+                （resourcesを受け付けないSDKには送らず、キャッシュの判定にのみ使う）
+            use_cache: 鮮度内のキャッシュがあれば使用するか
+            deadline: リトライの待機を含めた期限（秒）。Noneの場合は設定値。
             
         Returns:
             製品詳細の辞書
             
         Raises:
-            ValueError: ASINが不正または範囲外の場合
+            ValueError: ASINが不正または範囲外の場合、未知のプロファイルの場合
             PAAPIRateLimitError: レート制限に達した場合
             PAAPINetworkError: 通信エラーまたはAPIエラー
         """
@@ -399,167 +1231,50 @@ class PAAPIClient:
         if len(asins) > MAX_ITEMS_PER_REQUEST:
             raise ValueError(f"ASINは最大{MAX_ITEMS_PER_REQUEST}件まで指定可能です")
         
-        if resources is None:
-            resources = DEFAULT_GET_ITEMS_RESOURCES
-        
         # 新しいSDKに合わせたパラメータ
         get_items_params = {
-            "items": asins
+            "items": asins,
+            "resources": resolve_resources(resources, DEFAULT_GET_ITEMS_RESOURCES)
         }
         
-        return self._execute_with_retry("get_items", **get_items_params)
+        return self._execute_with_retry("get_items", use_cache=use_cache, deadline=deadline,
+                                        **get_items_params)
     
-    def _extract_product_data(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _resolve_raw_data_mode(self, raw_data: Optional[str]) -> str:
+        """呼び出しごとの指定が無ければ設定のraw_data保持方法を使う。"""
+        return raw_data if raw_data is not None else self.config.raw_data_mode
+    
+    def _extract_product_data(self, item: Dict[str, Any],
+                              raw_data: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """PA-API商品アイテムから標準化されたデータを抽出。
         
         Args:
             item: PA-APIから返される商品アイテム辞書
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
             
         Returns:
             標準化された商品データ、またはデータが不正な場合はNone
         """
-        try:
-            # 必須データの取得
-            asin = item.get('ASIN')
-            if not asin:
-                return None
-            
-            # タイトル
-            title_info = item.get('ItemInfo', {}).get('Title', {})
-            title = title_info.get('DisplayValue', 'Unknown')
-            
-            # レビュー情報
-            customer_reviews = item.get('CustomerReviews', {})
-            
-            # 評価値の取得と変換
-            star_rating = customer_reviews.get('StarRating', {})
-            rating_str = star_rating.get('DisplayValue', '0')
-            try:
-                rating = float(rating_str)
-            except (ValueError, TypeError):
-                rating = 0.0
-            
-            # レビュー数の取得
-            review_count = customer_reviews.get('Count', 0)
-            if isinstance(review_count, dict):
-                review_count = review_count.get('DisplayValue', 0)
-            try:
-                review_count = int(review_count)
-            except (ValueError, TypeError):
-                review_count = 0
-            
-            # 価格情報（オプション）
-            price = None
-            price_display = None
-            offers = item.get('Offers', {}).get('Listings', [])
-            if offers and len(offers) > 0:
-                price_info = offers[0].get('Price', {})
-                if 'Amount' in price_info:
-                    price = price_info['Amount']
-                if 'DisplayAmount' in price_info:
-                    price_display = price_info['DisplayAmount']
-            
-            return {
-                'asin': asin,
-                'title': title,
-                'rating': rating,
-                'review_count': review_count,
-                'price': price,
-                'price_display': price_display,
-                'raw_data': item
-            }
-            
-        except Exception:
-            # データ処理エラーの場合はNoneを返す
-            return None
+        return get_extractor('summary', raw_data=self._resolve_raw_data_mode(raw_data)).extract_one(item)
     
-    def _extract_detailed_product_data(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _extract_detailed_product_data(self, item: Dict[str, Any],
+                                       raw_data: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """PA-API商品アイテムから詳細なデータを抽出（記事作成用）。
         
         Args:
             item: PA-APIから返される商品アイテム辞書
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
             
         Returns:
             詳細な商品データ、またはデータが不正な場合はNone
         """
-        try:
-            # 必須データの取得
-            asin = item.get('ASIN')
-            if not asin:
-                return None
-            
-            item_info = item.get('ItemInfo', {})
-            
-            # タイトル
-            title_info = item_info.get('Title', {})
-            title = title_info.get('DisplayValue', 'Unknown')
-            
-            # ブランド情報
-            brand_info = item_info.get('ByLineInfo', {}).get('Brand', {})
-            brand = brand_info.get('DisplayValue', 'Unknown')
-            
-            # 型番・製品番号
-            manufacture_info = item_info.get('ManufactureInfo', {})
-            part_number_info = manufacture_info.get('ItemPartNumber', {})
-            part_number = part_number_info.get('DisplayValue', 'Unknown')
-            
-            # レビュー情報
-            customer_reviews = item.get('CustomerReviews', {})
-            
-            # 評価値の取得と変換
-            star_rating = customer_reviews.get('StarRating', {})
-            rating_str = star_rating.get('DisplayValue', '0')
-            try:
-                rating = float(rating_str)
-            except (ValueError, TypeError):
-                rating = 0.0
-            
-            # レビュー数の取得
-            review_count = customer_reviews.get('Count', 0)
-            if isinstance(review_count, dict):
-                review_count = review_count.get('DisplayValue', 0)
-            try:
-                review_count = int(review_count)
-            except (ValueError, TypeError):
-                review_count = 0
-            
-            # 価格情報
-            price = None
-            price_display = None
-            offers = item.get('Offers', {}).get('Listings', [])
-            if offers and len(offers) > 0:
-                price_info = offers[0].get('Price', {})
-                if 'Amount' in price_info:
-                    price = price_info['Amount']
-                if 'DisplayAmount' in price_info:
-                    price_display = price_info['DisplayAmount']
-            
-            # 画像URL
-            image_url = None
-            images = item.get('Images', {}).get('Primary', {}).get('Medium', {})
-            if 'URL' in images:
-                image_url = images['URL']
-            
-            return {
-                'asin': asin,
-                'title': title,
-                'brand': brand,
-                'part_number': part_number,
-                'rating': rating,
-                'review_count': review_count,
-                'price': price,
-                'price_display': price_display,
-                'image_url': image_url,
-                'raw_data': item
-            }
-            
-        except Exception:
-            # データ処理エラーの場合はNoneを返す
-            return None
+        return get_extractor('detail', raw_data=self._resolve_raw_data_mode(raw_data)).extract_one(item)
     
     def search_products(self, keywords: str, min_reviews: int = DEFAULT_MIN_REVIEWS, 
                        min_rating: float = DEFAULT_MIN_RATING, search_index: str = "All",
-                       max_results: int = MAX_ITEMS_PER_REQUEST) -> List[Dict[str, Any]]:
+                       max_results: int = MAX_ITEMS_PER_REQUEST,
+                       raw_data: Optional[str] = None,
+                       pool: Optional[CandidatePool] = None) -> List[Dict[str, Any]]:
         """品質基準を満たす商品を検索（サクラレビュー対策用フィルタリング付き）。
         
         Args:
@@ -568,6 +1283,9 @@ class PAAPIClient:
             min_rating: 最小評価値（品質保証）
             search_index: 検索カテゴリ
             max_results: 最大結果数
+            raw_data: raw_dataの保持方法（'full'、'none'、'compressed'。Noneの場合は設定値）
+            pool: 複数キーワードで共有する候補プール。既にプールにあるASINは
+                抽出し直さず、プール済みの商品辞書を返す。
             
         Returns:
             品質基準を満たす商品のリスト
@@ -583,88 +1301,135 @@ class PAAPIClient:
             keywords=keywords,
             search_index=search_index,
             item_count=max_results,
-            resources=[
-                "Images.Primary.Medium",
-                "ItemInfo.Title",
-                "ItemInfo.Features", 
-                "ItemInfo.ProductInfo",
-                "Offers.Listings.Price",
-                "CustomerReviews.StarRating",
-                "CustomerReviews.Count"
-            ]
+            resources=DEFAULT_SEARCH_RESOURCES
         )
         
         # 応答から商品リストを抽出（新しいSDK形式）
         items = response.get('data', {}).get('SearchResult', {}).get('Items', [])
         
-        # 品質基準でフィルタリング
-        filtered_products = []
+        filtered_products = self._filter_quality_products(items, min_reviews, min_rating, raw_data,
+                                                          pool=pool, keyword=keywords)
+        logger.info(f"検索完了: {len(filtered_products)}件の商品が品質基準を満たしました")
+        return filtered_products
+    
+    def iter_search(self, keywords: str, max_pages: int = MAX_SEARCH_PAGES,
+                    min_reviews: int = DEFAULT_MIN_REVIEWS,
+                    min_rating: float = DEFAULT_MIN_RATING, search_index: str = "All",
+                    max_results: Optional[int] = None,
+                    resources: Optional[ResourceSpec] = None,
+                    raw_data: Optional[str] = None,
+                    pool: Optional[CandidatePool] = None) -> Iterator[Dict[str, Any]]:
+        """複数ページにわたって品質基準を満たす商品を逐次返す。
         
-        for item in items:
-            try:
-                # 必須データの取得
-                asin = item.get('ASIN')
-                if not asin:
-                    continue
-                
-                # タイトル
-                title_info = item.get('ItemInfo', {}).get('Title', {})
-                title = title_info.get('DisplayValue', 'Unknown')
-                
-                # レビュー情報
-                customer_reviews = item.get('CustomerReviews', {})
+        呼び出し側が現在のページを処理している間に次のページを先読みする。
+        max_resultsに達した時点、または最終ページ（10件未満）で取得を終了し、
+        不要なページはリクエストしない。
+        
+        Args:
+            keywords: 検索キーワード
+            max_pages: 取得する最大ページ数（最大10）
+            min_reviews: 最小レビュー数（サクラ対策）
+            min_rating: 最小評価値（品質保証）
+            search_index: 検索カテゴリ
+            max_results: 返す商品数の上限（Noneで上限なし）
+            resources: 取得するリソース項目、またはプロファイル名
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
+            pool: 複数キーワードで共有する候補プール
+            
+        Yields:
+            品質基準を満たす商品（search_productsと同じ形式）
+            
+        Raises:
+            PAAPIRateLimitError: レート制限に達した場合
+            PAAPINetworkError: 通信エラーまたはAPIエラー
+        """
+        last_page = max(0, min(max_pages, MAX_SEARCH_PAGES))
+        if last_page == 0 or (max_results is not None and max_results <= 0):
+            return
+        
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            response = self.search_items(
+                keywords=keywords,
+                search_index=search_index,
+                item_page=page,
+                resources=resources
+            )
+            return response.get('data', {}).get('SearchResult', {}).get('Items', [])
+        
+        logger.info(f"複数ページ検索開始: keywords='{keywords}', max_pages={last_page}, max_results={max_results}")
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="paapi-search")
+        yielded = 0
+        try:
+            pending = executor.submit(fetch_page, 1)
+            for page in range(1, last_page + 1):
+                items = pending.result()
+                products = self._filter_quality_products(items, min_reviews, min_rating, raw_data,
+                                                         pool=pool, keyword=keywords)
                 
-                # 評価値の取得と変換
-                star_rating = customer_reviews.get('StarRating', {})
-                rating_str = star_rating.get('DisplayValue', '0')
-                try:
-                    rating = float(rating_str)
-                except (ValueError, TypeError):
-                    rating = 0.0
+                # 次ページが存在し、まだ件数が足りない場合のみ先読みする
+                has_next = page < last_page and len(items) >= MAX_ITEMS_PER_REQUEST
+                satisfied = max_results is not None and yielded + len(products) >= max_results
+                if has_next and not satisfied:
+                    pending = executor.submit(fetch_page, page + 1)
                 
-                # レビュー数の取得
-                review_count = customer_reviews.get('Count', 0)
-                if isinstance(review_count, dict):
-                    review_count = review_count.get('DisplayValue', 0)
-                try:
-                    review_count = int(review_count)
-                except (ValueError, TypeError):
-                    review_count = 0
+                for product in products:
+                    yield product
+                    yielded += 1
+                    if max_results is not None and yielded >= max_results:
+                        return
                 
-                # 品質基準チェック（サクラレビュー対策）
-                if review_count >= min_reviews and rating >= min_rating:
-                    logger.debug(f"品質基準通過: ASIN={asin}, reviews={review_count}, rating={rating}")
-                    # 価格情報（オプション）
-                    price = None
-                    offers = item.get('Offers', {}).get('Listings', [])
-                    if offers and len(offers) > 0:
-                        price_info = offers[0].get('Price', {})
-                        if 'Amount' in price_info:
-                            price = price_info['Amount']
-                    
-                    # フィルタリング通過した商品を追加
-                    product = {
-                        'asin': asin,
-                        'title': title,
-                        'rating': rating,
-                        'review_count': review_count,
-                        'price': price,
-                        'raw_data': item  # 生データも保持
-                    }
-                    filtered_products.append(product)
-                    
-            except Exception as e:
-                # 個別の商品データ処理エラーはログに記録してスキップ
-                logger.warning(f"商品データ処理エラー (ASIN={item.get('ASIN', 'Unknown')}): {e}")
-                continue
+                if not has_next:
+                    return
+        finally:
+            logger.info(f"複数ページ検索終了: {yielded}件を返却")
+            # 呼び出し側が途中で反復を止めた場合、未着手の先読みは取り消す
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _filter_quality_products(self, items: List[Dict[str, Any]], min_reviews: int,
+                                 min_rating: float,
+                                 raw_data: Optional[str] = None,
+                                 pool: Optional[CandidatePool] = None,
+                                 keyword: Optional[str] = None) -> List[Dict[str, Any]]:
+        """検索結果を品質基準（レビュー数・評価値）でフィルタリング。
         
-        logger.info(f"検索完了: {len(filtered_products)}件の商品が品質基準を満たしました")
-        return filtered_products    
-    def get_product_details(self, asin: str) -> Optional[Dict[str, Any]]:
+        Args:
+            items: PA-API検索結果のアイテムリスト
+            min_reviews: 最小レビュー数
+            min_rating: 最小評価値
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
+            pool: 候補プール（指定時はプールにないASINのみ抽出）
+            keyword: アイテムを返した検索キーワード（プールへの記録用）
+            
+        Returns:
+            品質基準を満たす商品のリスト
+        """
+        filtered_products = []
+        extractor = get_extractor('search', raw_data=self._resolve_raw_data_mode(raw_data))
+        if pool is None:
+            candidates = extractor.extract(items)
+        else:
+            # 品質基準は呼び出しごとに異なり得るため、フィルタリング前の商品をプールする
+            candidates = pool.merge_items(items, extractor.extract, keyword=keyword)
+        for product in candidates:
+            # 品質基準チェック（サクラレビュー対策）
+            if product['review_count'] >= min_reviews and product['rating'] >= min_rating:
+                logger.debug(
+                    f"品質基準通過: ASIN={product['asin']}, "
+                    f"reviews={product['review_count']}, rating={product['rating']}"
+                )
+                filtered_products.append(product)
+        
+        return filtered_products
+    
+    def get_product_details(self, asin: str,
+                            resources: ResourceSpec = DEFAULT_DETAIL_PROFILE,
+                            raw_data: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """単一ASINの商品詳細情報を取得。
         
         Args:
             asin: 取得したい商品のASIN
+            resources: 取得するリソース項目、またはプロファイル名
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
             
         Returns:
             商品詳細情報の辞書、または商品が見つからない場合はNone
@@ -673,24 +1438,20 @@ class PAAPIClient:
             PAAPIRateLimitError: レート制限に達した場合
             PAAPINetworkError: 通信エラーまたはAPIエラー
         """
-        response = self.get_items(
-            asins=[asin],
-            resources=DEFAULT_GET_ITEMS_RESOURCES
-        )
-        
-        # 応答から商品データを抽出（新しいSDK形式）
-        items = response.get('data', {}).get('ItemsResult', {}).get('Items', [])
-        
-        if not items:
-            return None
-        
-        return self._extract_detailed_product_data(items[0])
+        products = self._lookup_chunk([asin], resources, raw_data)
+        return products[0] if products else None
     
-    def batch_lookup(self, asins: List[str]) -> List[Dict[str, Any]]:
+    def batch_lookup(self, asins: List[str],
+                     resources: ResourceSpec = DEFAULT_DETAIL_PROFILE,
+                     raw_data: Optional[str] = None) -> List[Dict[str, Any]]:
         """複数ASINの商品詳細を一括取得。
         
+        10件を超えるASINリストにはbulk_lookupを使用する。
+        
         Args:
             asins: 取得したい商品のASINリスト（最大10件）
+            resources: 取得するリソース項目、またはプロファイル名
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
             
         Returns:
             商品詳細情報のリスト
@@ -706,19 +1467,300 @@ class PAAPIClient:
         if len(asins) > MAX_ITEMS_PER_REQUEST:
             raise ValueError(f"ASINは最大{MAX_ITEMS_PER_REQUEST}件まで指定可能です")
         
-        response = self.get_items(
-            asins=asins,
-            resources=DEFAULT_GET_ITEMS_RESOURCES
+        return self._lookup_chunk(asins, resources, raw_data)
+    
+    def bulk_lookup(self, asins: List[str], max_workers: Optional[int] = None,
+                    raise_on_error: bool = True,
+                    resources: ResourceSpec = DEFAULT_DETAIL_PROFILE,
+                    raw_data: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """任意件数のASINの商品詳細を並行取得し、取得できた順に返す。
+        
+        ASINリストを重複排除した上でPA-APIの上限（10件）単位に分割し、
+        各リクエストを並行実行する。チャンクの応答が届くたびに
+        詳細データを逐次yieldするため、全件の完了を待つ必要はない。
+        
+        Args:
+            asins: 取得したい商品のASINリスト（件数制限なし）
+            max_workers: 同時実行するリクエスト数。Noneの場合は接続プールサイズ。
+            raise_on_error: Falseの場合、失敗したチャンクはログに記録してスキップ
+            resources: 取得するリソース項目、またはプロファイル名
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
+            
+        Yields:
+            商品詳細情報（_extract_detailed_product_dataの結果）
+            
+        Raises:
+            PAAPIRateLimitError: レート制限に達した場合（raise_on_error=True時）
+            PAAPINetworkError: 通信エラーまたはAPIエラー（raise_on_error=True時）
+        """
+        unique_asins = list(dict.fromkeys(asin.strip() for asin in asins if asin and asin.strip()))
+        if not unique_asins:
+            return
+        resource_list = resolve_resources(resources, DEFAULT_GET_ITEMS_RESOURCES)
+        
+        chunks = [
+            unique_asins[i:i + MAX_ITEMS_PER_REQUEST]
+            for i in range(0, len(unique_asins), MAX_ITEMS_PER_REQUEST)
+        ]
+        workers = max(1, min(max_workers or self.config.pool_size, len(chunks)))
+        logger.info(f"一括取得開始: {len(unique_asins)}件のASINを{len(chunks)}リクエストに分割 (並行数={workers})")
+        
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="paapi-bulk")
+        try:
+            futures = {executor.submit(self._lookup_chunk, chunk, resource_list, raw_data): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    products = future.result()
+                except (PAAPIRateLimitError, PAAPINetworkError) as e:
+                    if raise_on_error:
+                        raise
+                    logger.warning(f"一括取得のチャンクをスキップ ({futures[future][0]}...): {e}")
+                    continue
+                yield from products
+        finally:
+            # 呼び出し側が途中で反復を止めた場合、未着手のチャンクは取り消す
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def refresh_offers(self, products: Iterable[Dict[str, Any]],
+                       max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """保存済みの商品レコードの価格とレビュー数だけを取得し直して反映する。
+        
+        タイトル・ブランド等はほとんど変わらないため、'offers-refresh'
+        プロファイル（Offers.Listings.PriceとCustomerReviews.Count）のみを
+        キャッシュを使わずに取得し、OFFER_FIELDSをレコードに上書きする。
+        
+        Args:
+            products: get_product_details等で取得済みの商品レコード（その場で更新される）
+            max_workers: 同時実行するリクエスト数。Noneの場合は接続プールサイズ。
+            
+        Returns:
+            changed（値が変わったASIN）、unchanged、missing（取得できなかったASIN）、
+            changes（ASIN→{フィールド: (旧値, 新値)}）を含む辞書
+            
+        Raises:
+            PAAPIRateLimitError: レート制限に達した場合
+            PAAPINetworkError: 通信エラーまたはAPIエラー
+        """
+        records: Dict[str, List[Dict[str, Any]]] = {}
+        for product in products:
+            asin = str(product.get('asin') or '').strip().upper()
+            if asin:
+                records.setdefault(asin, []).append(product)
+        result = {'changed': [], 'unchanged': [], 'missing': [], 'changes': {}}
+        if not records:
+            return result
+        
+        asins = list(records)
+        resource_list = resolve_resources('offers-refresh', [])
+        extractor = get_extractor('offers', raw_data=RAW_DATA_NONE, resources=resource_list)
+        chunks = [asins[i:i + MAX_ITEMS_PER_REQUEST] for i in range(0, len(asins), MAX_ITEMS_PER_REQUEST)]
+        
+        def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+            # 価格の鮮度が目的のため、キャッシュは読まない（取得結果は保存される）
+            response = self.get_items(asins=chunk, resources=resource_list, use_cache=False)
+            return extractor.extract(response.get('data', {}).get('ItemsResult', {}).get('Items', []))
+        
+        workers = max(1, min(max_workers or self.config.pool_size, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="paapi-offers") as executor:
+            offers = {
+                str(offer['asin']).upper(): offer
+                for chunk_offers in executor.map(fetch, chunks)
+                for offer in chunk_offers
+            }
+        
+        for asin in asins:
+            offer = offers.get(asin)
+            if offer is None:
+                result['missing'].append(asin)
+                continue
+            changes = {}
+            for record in records[asin]:
+                for name in OFFER_FIELDS:
+                    old, new = record.get(name), offer.get(name)
+                    if old != new:
+                        changes[name] = (old, new)
+                    record[name] = new
+            if changes:
+                result['changed'].append(asin)
+                result['changes'][asin] = changes
+            else:
+                result['unchanged'].append(asin)
+        
+        logger.info(
+            f"価格の差分更新: {len(asins)}件中 変更{len(result['changed'])}件、"
+            f"取得不可{len(result['missing'])}件"
+        )
+        return result
+    
+    def lookup_across_marketplaces(self, asins: List[str],
+                                   countries: Iterable[str] = DEFAULT_MARKETPLACES,
+                                   resources: ResourceSpec = DEFAULT_DETAIL_PROFILE,
+                                   raw_data: Optional[str] = None,
+                                   raise_on_error: bool = True) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+        """複数マーケットプレイスで同じASINを並行取得し、ASINごとにまとめる。
+        
+        国ごと・10件ごとのGetItemsリクエストを並行実行する。レート制限・
+        サーキットブレーカー・クォータ台帳・キャッシュは国ごとに独立している。
+        
+        Args:
+            asins: 取得したい商品のASINリスト（件数制限なし）
+            countries: 国コードのリスト（例: ['JP', 'US', 'UK']）
+            resources: 取得するリソース項目、またはプロファイル名
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
+            raise_on_error: Falseの場合、失敗した国はログに記録して結果から除外
+            
+        Returns:
+            ASIN→{国コード: 商品詳細（見つからない場合はNone）}の辞書。入力順を保持する。
+            raise_on_error=Falseで失敗した国のキーは含まれない。
+            
+        Raises:
+            ValueError: 国コードが指定されていない場合
+            PAAPIRateLimitError: レート制限に達した場合（raise_on_error=True時）
+            PAAPINetworkError: 通信エラーまたはAPIエラー（raise_on_error=True時）
+        """
+        markets = list(dict.fromkeys(country.strip().upper() for country in countries if country and country.strip()))
+        if not markets:
+            raise ValueError("国コードが指定されていません")
+        unique_asins = list(dict.fromkeys(asin.strip().upper() for asin in asins if asin and asin.strip()))
+        if not unique_asins:
+            return {}
+        resource_list = resolve_resources(resources, DEFAULT_GET_ITEMS_RESOURCES)
+        
+        tasks = [
+            (country, unique_asins[i:i + MAX_ITEMS_PER_REQUEST])
+            for country in markets
+            for i in range(0, len(unique_asins), MAX_ITEMS_PER_REQUEST)
+        ]
+        workers = max(1, min(len(tasks), self.config.pool_size * len(markets)))
+        logger.info(
+            f"マーケットプレイス横断取得開始: {len(unique_asins)}件のASIN × {','.join(markets)} "
+            f"({len(tasks)}リクエスト, 並行数={workers})"
         )
         
-        # 応答から商品リストを抽出（新しいSDK形式）
-        items = response.get('data', {}).get('ItemsResult', {}).get('Items', [])
+        def fetch(country: str, chunk: List[str]) -> List[Dict[str, Any]]:
+            response = self._execute_with_retry(
+                "get_items", country=country, items=chunk, resources=resource_list
+            )
+            return self._extract_detailed_products(response, resource_list, raw_data)
+        
+        results: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {asin: {} for asin in unique_asins}
+        failed = set()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="paapi-market") as executor:
+            futures = {executor.submit(fetch, country, chunk): (country, chunk) for country, chunk in tasks}
+            try:
+                for future in as_completed(futures):
+                    country, chunk = futures[future]
+                    try:
+                        products = future.result()
+                    except (PAAPIRateLimitError, PAAPINetworkError) as e:
+                        if raise_on_error:
+                            raise
+                        logger.warning(f"マーケットプレイス横断取得で{country}をスキップ: {e}")
+                        failed.add(country)
+                        continue
+                    found = {str(product['asin']).upper(): product for product in products}
+                    for asin in chunk:
+                        results[asin][country] = found.get(asin)
+            finally:
+                # 例外で抜ける場合、未着手のリクエストは取り消す
+                for future in futures:
+                    future.cancel()
+        
+        # 国コードの順序を揃え、失敗した国は除外する
+        return {
+            asin: {country: by_country.get(country) for country in markets if country not in failed}
+            for asin, by_country in results.items()
+        }
+    
+    def _lookup_chunk(self, asins: List[str],
+                      resources: ResourceSpec = DEFAULT_DETAIL_PROFILE,
+                      raw_data: Optional[str] = None) -> List[Dict[str, Any]]:
+        """10件以下のASINチャンクを取得して詳細データに変換。"""
+        resource_list = resolve_resources(resources, DEFAULT_GET_ITEMS_RESOURCES)
+        if not self.config.coalesce_enabled:
+            response = self.get_items(
+                asins=asins,
+                resources=resource_list
+            )
+            return self._extract_detailed_products(response, resource_list, raw_data)
+        
+        items = self.lookup_items(asins, resources=resource_list)
+        extractor = get_extractor('detail', raw_data=self._resolve_raw_data_mode(raw_data),
+                                  resources=resource_list)
+        return extractor.extract(
+            item for item in items.values() if item is not None
+        )
+    
+    def lookup_items(self, asins: List[str],
+                     resources: Optional[ResourceSpec] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """ASINごとの生アイテムを取得（同時リクエストを集約）。
         
-        # 詳細データに変換
-        detailed_products = []
-        for item in items:
-            product = self._extract_detailed_product_data(item)
-            if product:
-                detailed_products.append(product)
+        他の呼び出し元が取得中のASINは同じ結果を待ち、未送信のASINは
+        呼び出し元を跨いで最大10件のGetItemsリクエストにまとめられる。
+        件数の制限はなく、10件を超える場合は複数リクエストに分割される。
         
-        return detailed_products
+        Args:
+            asins: 取得したい商品のASINリスト
+            resources: 取得するリソース項目、またはプロファイル名
+            
+        Returns:
+            ASIN→アイテム辞書（見つからない場合はNone）。入力順を保持する。
+            
+        Raises:
+            ValueError: 未知のリソースプロファイルが指定された場合
+            PAAPIRateLimitError: レート制限に達した場合
+            PAAPINetworkError: 通信エラーまたはAPIエラー
+        """
+        resource_list = resolve_resources(resources, DEFAULT_GET_ITEMS_RESOURCES)
+        keys = [asin.strip().upper() for asin in asins if asin and asin.strip()]
+        return self._get_coalescer(resource_list).fetch(keys)
+    
+    def _get_coalescer(self, resources: List[str]) -> RequestCoalescer:
+        """リソース指定ごとのコアレッサーを取得（未作成なら生成）。
+        
+        リソースが異なる要求は同じリクエストにまとめられないため、
+        リソースの組ごとに別のコアレッサーを使う。
+        """
+        key = tuple(sorted(resources))
+        with self._coalescers_lock:
+            coalescer = self._coalescers.get(key)
+            if coalescer is None:
+                coalescer = RequestCoalescer(
+                    lambda batch: self._fetch_items_by_asin(batch, resources),
+                    batch_size=MAX_ITEMS_PER_REQUEST,
+                    linger=self.config.coalesce_linger
+                )
+                self._coalescers[key] = coalescer
+            return coalescer
+    
+    def _fetch_items_by_asin(self, asins: List[str], resources: List[str]) -> Dict[str, Dict[str, Any]]:
+        """GetItemsを1回実行し、ASIN→アイテムの辞書を返す。"""
+        response = self.get_items(asins=asins, resources=resources)
+        items = response.get('data', {}).get('ItemsResult', {}).get('Items', [])
+        return {
+            str(item['ASIN']).upper(): item
+            for item in items
+            if isinstance(item, dict) and item.get('ASIN')
+        }
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """リソース指定ごとのリクエスト集約統計を取得。"""
+        with self._coalescers_lock:
+            coalescers = dict(self._coalescers)
+        return {",".join(key): coalescer.stats() for key, coalescer in coalescers.items()}
+    
+    def _extract_detailed_products(self, response: Dict[str, Any],
+                                   resources: Optional[List[str]] = None,
+                                   raw_data: Optional[str] = None) -> List[Dict[str, Any]]:
+        """GetItems応答から詳細データのリストを抽出。
+        
+        Args:
+            response: GetItems応答
+            resources: 要求したリソース（要求外のフィールドは走査しない）
+            raw_data: raw_dataの保持方法（Noneの場合は設定値）
+        """
+        # 応答から商品リストを抽出（新しいSDK形式）
+        items = response.get('data', {}).get('ItemsResult', {}).get('Items', [])
+        extractor = get_extractor('detail', raw_data=self._resolve_raw_data_mode(raw_data),
+                                  resources=resources)
+        return extractor.extract(items)
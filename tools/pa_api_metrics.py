@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API呼び出しの計測（操作別のレイテンシ・ペイロードのヒストグラムとカウンター）
+
+ヒストグラムは固定の対数間隔バケットに件数を数えるだけなので、記録は
+二分探索1回と加算で済み、サンプルを保持しない。パーセンタイル（p50/p95/p99）は
+バケット内の線形補間で近似し、誤差はバケット幅（隣接境界の比で25%）以内となる。
+
+スナップショットは辞書（JSON化可能）で取得でき、Prometheusのテキスト形式でも
+出力できる。
+"""
+
+import json
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence
+
+# 定数定義
+METRIC_PREFIX = 'paapi'
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _geometric_bounds(start: float, factor: float, stop: float) -> List[float]:
+    """startからstopまで公比factorのバケット境界を生成。"""
+    bounds = []
+    value = start
+    while value < stop * factor:
+        bounds.append(round(value, 6))
+        value *= factor
+    return bounds
+
+
+# レイテンシ: 1ms〜約2分、ペイロード: 256B〜約16MB
+LATENCY_BUCKETS = _geometric_bounds(0.001, 1.25, 120.0)
+PAYLOAD_BUCKETS = _geometric_bounds(256, 1.5, 16 * 1024 * 1024)
+
+# 操作別に数えるカウンター
+COUNTERS = ('requests', 'errors', 'retries', 'throttles', 'cache_hits', 'cache_misses')
+
+
+class Histogram:
+    """固定バケットのヒストグラム（スレッドセーフではない。呼び出し側でロックする）。
+
+    Attributes:
+        bounds: バケットの上限値（昇順）
+        count: 記録件数
+        total: 記録値の合計
+    """
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # 末尾は上限超え
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        """値を1件記録。"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q分位点をバケット内の線形補間で近似（未記録の場合はNone）。"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else self.min
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """件数・合計・最小・最大・p50/p95/p99の要約。"""
+        result = {'count': self.count, 'sum': self.total, 'min': self.min, 'max': self.max}
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}"] = self.quantile(q)
+        return result
+
+
+class _OperationMetrics:
+    """1操作分の計測値。"""
+
+    def __init__(self) -> None:
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.payload = Histogram(PAYLOAD_BUCKETS)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+
+class PAAPIMetrics:
+    """PA-API操作別のレイテンシ・ペイロード・カウンターを集計する。"""
+
+    def __init__(self) -> None:
+        """空の計測値で初期化。"""
+        self._lock = threading.Lock()
+        self._operations: Dict[str, _OperationMetrics] = {}
+
+    def _operation(self, operation: str) -> _OperationMetrics:
+        metrics = self._operations.get(operation)
+        if metrics is None:
+            metrics = self._operations[operation] = _OperationMetrics()
+        return metrics
+
+    def increment(self, operation: str, counter: str, amount: int = 1) -> None:
+        """カウンターを加算。
+
+        Args:
+            operation: 操作名（'search_items'、'get_items'）
+            counter: COUNTERSのいずれか
+            amount: 加算値
+        """
+        with self._lock:
+            self._operation(operation).counters[counter] += amount
+
+    def observe_request(self, operation: str, seconds: float,
+                        payload_bytes: Optional[int] = None, error: bool = False) -> None:
+        """SDK呼び出し1回分のレイテンシと応答サイズを記録。
+
+        Args:
+            operation: 操作名
+            seconds: 呼び出しにかかった秒数
+            payload_bytes: 応答のサイズ（失敗した場合はNone）
+            error: 呼び出しが例外で終わったか
+        """
+        with self._lock:
+            metrics = self._operation(operation)
+            metrics.counters['requests'] += 1
+            if error:
+                metrics.counters['errors'] += 1
+            metrics.latency.observe(seconds)
+            if payload_bytes is not None:
+                metrics.payload.observe(payload_bytes)
+
+    def reset(self) -> None:
+        """計測値を破棄。"""
+        with self._lock:
+            self._operations.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """操作別の計測値と全体のカウンター合計を取得。
+
+        Returns:
+            operations（操作別のlatency_seconds、payload_bytes、カウンター）と
+            totals（カウンターの合計）を含む辞書
+        """
+        with self._lock:
+            operations = {
+                name: {
+                    **metrics.counters,
+                    'latency_seconds': metrics.latency.summary(),
+                    'payload_bytes': metrics.payload.summary(),
+                }
+                for name, metrics in sorted(self._operations.items())
+            }
+        totals = {counter: sum(op[counter] for op in operations.values()) for counter in COUNTERS}
+        return {'operations': operations, 'totals': totals}
+
+    def to_prometheus(self, quota: Optional[Dict[str, Any]] = None) -> str:
+        """Prometheusのテキスト形式で出力。
+
+        Args:
+            quota: get_quota_statusの結果（指定時はクォータのゲージも出力）
+        """
+        with self._lock:
+            operations = {
+                name: {
+                    'request_duration_seconds': (list(m.latency.counts), m.latency.count, m.latency.total),
+                    'response_payload_bytes': (list(m.payload.counts), m.payload.count, m.payload.total),
+                    'counters': dict(m.counters),
+                }
+                for name, m in sorted(self._operations.items())
+            }
+
+        lines: List[str] = []
+        histograms = (
+            ('request_duration_seconds', 'PA-API SDK call latency.', LATENCY_BUCKETS),
+            ('response_payload_bytes', 'PA-API response payload size.', PAYLOAD_BUCKETS),
+        )
+        for name, help_text, bounds in histograms:
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for operation, values in operations.items():
+                counts, count, total = values[name]
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{operation="{operation}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{operation="{operation}",le="+Inf"}} {count}')
+                lines.append(f'{metric}_sum{{operation="{operation}"}} {total:g}')
+                lines.append(f'{metric}_count{{operation="{operation}"}} {count}')
+
+        for counter in COUNTERS:
+            metric = f"{METRIC_PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for operation, values in operations.items():
+                lines.append(f'{metric}{{operation="{operation}"}} {values["counters"][counter]}')
+
+        if quota and quota.get('enabled'):
+            for key in ('used', 'remaining', 'limit', 'low_priority_remaining'):
+                metric = f"{METRIC_PREFIX}_quota_{key}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f'{metric}{{priority="{quota.get("priority")}"}} {quota[key]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def payload_size(response: Any) -> int:
+    """応答のJSON換算のバイト数。"""
+    try:
+        return len(json.dumps(response, ensure_ascii=False, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return 0
+
+
+def format_metrics(snapshot: Dict[str, Any]) -> str:
+    """get_metricsのスナップショットをJSON文字列に整形。"""
+    return json.dumps(snapshot, ensure_ascii=False, indent=2, sort_keys=True, default=str)
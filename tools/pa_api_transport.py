@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API呼び出しの記録・再生トランスポートとローカル代替サーバー
+
+実際の認証情報なしでエンドツーエンドのスループットを計測するため、
+PAAPIClientの接続プールに差し込めるAmazonApi互換のオブジェクトを提供する。
+
+- RecordingApi: 実APIへの呼び出しを中継し、応答を圧縮フィクスチャに保存
+- ReplayApi: フィクスチャから応答を再生（遅延・エラー注入・スロットリングを再現）
+- PAAPIStandInServer: ReplayApiをPA-API 5.0形式のHTTPで公開するローカルサーバー
+- HttpApi: 代替サーバー（またはPA-API互換エンドポイント）にHTTPで接続するクライアント
+
+GetItemsのフィクスチャはASIN単位で保存するため、記録時と異なる組み合わせの
+バッチ（リクエスト集約など）でも再生できる。
+
+python-amazon-paapi 5.xのAmazonApiはリクエストのResourcesを全項目に固定するため、
+ResourceAwareAmazonApiで要求リソースを絞ったリクエストを送る。sdk_paramsは、
+resources引数を受け付けないSDK（素のAmazonApiなど）への呼び出しからresourcesを取り除く。
+"""
+
+import os
+import gzip
+import inspect
+import json
+import time
+import random
+import hashlib
+import tempfile
+import threading
+import logging
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Callable
+
+from amazon_paapi import AmazonApi
+from amazon_paapi.errors import AsinNotFound, TooManyRequests, ItemsNotFound, RequestError
+from amazon_paapi.helpers import arguments, requests as sdk_requests
+from amazon_paapi.helpers.generators import get_list_chunks
+from amazon_paapi.helpers.items import sort_items
+
+from tools.pa_api_cache import normalize_params
+from tools.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# スロットリングの再現プロファイル（PA-API側のTPS上限）
+THROTTLE_PROFILES = {
+    'none': None,
+    'paapi-default': {'requests_per_second': 1.0, 'burst': 1},   # 新規アカウントの既定値
+    'paapi-10tps': {'requests_per_second': 10.0, 'burst': 10},
+}
+DEFAULT_THROTTLE_PROFILE = 'none'
+
+# 注入できるエラー
+INJECTABLE_ERRORS = {
+    'TooManyRequests': TooManyRequests,
+    'AsinNotFound': AsinNotFound,
+}
+
+# 代替サーバーのパスとSDKの操作名の対応（PA-API 5.0のエンドポイント）
+OPERATION_PATHS = {
+    '/paapi5/searchitems': 'search_items',
+    '/paapi5/getitems': 'get_items',
+}
+
+# PA-API 5.0のリクエストフィールドとSDKの引数名の対応
+REQUEST_FIELDS = {
+    'search_items': {
+        'Keywords': 'keywords',
+        'SearchIndex': 'search_index',
+        'ItemCount': 'item_count',
+        'ItemPage': 'item_page',
+        'Resources': 'resources',
+    },
+    'get_items': {
+        'ItemIds': 'items',
+        'Resources': 'resources',
+    },
+}
+
+DEFAULT_HTTP_TIMEOUT = 10.0
+
+
+class ResourceAwareAmazonApi(AmazonApi):
+    """要求リソースを指定してリクエストを送れるAmazonApi。
+
+    SDKはGetItems・SearchItemsのResourcesを全項目に固定するため、resourcesを
+    指定した場合はSDKのリクエストモデルを組み立てた後にResourcesだけを差し替えて
+    送信する（応答のペイロードが要求した分だけになる）。resourcesを省略した場合は
+    AmazonApiと同じ動作。
+    """
+
+    def get_items(self, items: Any, resources: Optional[List[str]] = None,
+                  include_unavailable: bool = False, **kwargs) -> List[Any]:
+        """ASIN指定で商品を取得（resourcesで取得項目を絞る）。"""
+        if not resources:
+            return super().get_items(items, include_unavailable=include_unavailable, **kwargs)
+
+        items_ids = arguments.get_items_ids(items)
+        results = []
+        for asin_chunk in get_list_chunks(list(set(items_ids)), chunk_size=10):
+            request = sdk_requests.get_items_request(self, asin_chunk, **kwargs)
+            request.resources = list(resources)
+            self._throttle()
+            results.extend(sdk_requests.get_items_response(self, request))
+        return sort_items(results, items_ids, include_unavailable)
+
+    def search_items(self, resources: Optional[List[str]] = None, **kwargs) -> Any:
+        """商品を検索（resourcesで取得項目を絞る）。"""
+        if not resources:
+            return super().search_items(**kwargs)
+
+        arguments.check_search_args(**kwargs)
+        request = sdk_requests.get_search_items_request(self, **kwargs)
+        request.resources = list(resources)
+        self._throttle()
+        return sdk_requests.get_search_items_response(self, request)
+
+
+@lru_cache(maxsize=64)
+def _accepts_resources(api_cls: type, operation_name: str) -> bool:
+    """SDK（互換）クラスの操作がresources引数を受け付けるか（クラス単位でキャッシュ）。"""
+    method = getattr(api_cls, operation_name, None)
+    if method is None:
+        # インスタンスごとに属性を持つオブジェクト（モックなど）は判定できないため渡す
+        return True
+    try:
+        parameters = inspect.signature(method).parameters
+    except (TypeError, ValueError):
+        return True
+    if 'resources' in parameters:
+        return True
+    if issubclass(api_cls, AmazonApi):
+        # python-amazon-paapi 5.xのAmazonApiは**kwargsをリクエストモデルにそのまま渡すが、
+        # resourcesは自身で固定値を設定するため、重複してMalformedRequestになる
+        return False
+    return any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values())
+
+
+def sdk_accepts_resources(api: Any, operation_name: str) -> bool:
+    """SDK（互換）オブジェクトの操作がresources引数を受け付けるか。
+
+    resourcesを明示的な引数に持つ場合と、AmazonApi以外の互換オブジェクト
+    （記録・再生用のラッパーなど）が**kwargsを受け付ける場合に真。
+    """
+    return _accepts_resources(type(api), operation_name)
+
+
+def sdk_params(api: Any, operation_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """SDKが受け付けない場合はresourcesを除いたパラメータを返す。
+
+    Args:
+        api: AmazonApi（互換）インスタンス
+        operation_name: 操作名（'search_items'、'get_items'）
+        params: 操作に渡すパラメータ
+
+    Returns:
+        SDKに渡すパラメータ（resourcesを除く場合は複製）
+    """
+    if 'resources' not in params or sdk_accepts_resources(api, operation_name):
+        return params
+    return {key: value for key, value in params.items() if key != 'resources'}
+
+
+class FixtureNotFoundError(LookupError):
+    """再生対象のフィクスチャが記録されていない場合のエラー。"""
+    pass
+
+
+def _to_dict(response: Any) -> Dict[str, Any]:
+    """SDKの応答を辞書に変換。"""
+    if isinstance(response, dict):
+        return response
+    if hasattr(response, 'to_dict'):
+        return response.to_dict()
+    raise TypeError(f"辞書に変換できない応答です: {type(response).__name__}")
+
+
+class FixtureStore:
+    """gzip圧縮したJSONファイルでPA-API応答を保存するフィクスチャ置き場。
+
+    SearchItemsは正規化したパラメータごと、GetItemsはASINごとに1ファイルとする。
+
+    Attributes:
+        root: フィクスチャのルートディレクトリ
+    """
+
+    def __init__(self, root: Path) -> None:
+        """フィクスチャ置き場を初期化。
+
+        Args:
+            root: フィクスチャのルートディレクトリ（無ければ作成）
+        """
+        self.root = Path(root)
+        (self.root / 'search_items').mkdir(parents=True, exist_ok=True)
+        (self.root / 'items').mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def search_key(params: Dict[str, Any]) -> str:
+        """検索パラメータからフィクスチャのキーを生成（resourcesは含めない）。"""
+        material = json.dumps(normalize_params(params), sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _search_path(self, params: Dict[str, Any]) -> Path:
+        return self.root / 'search_items' / f"{self.search_key(params)}.json.gz"
+
+    def _item_path(self, asin: str) -> Path:
+        return self.root / 'items' / f"{asin.strip().upper()}.json.gz"
+
+    def _write(self, path: Path, payload: Dict[str, Any]) -> None:
+        """一時ファイルに書き込んでから置き換える（並行して読まれても壊れない）。"""
+        data = gzip.compress(json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save_search(self, params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """SearchItemsの応答を保存。"""
+        self._write(self._search_path(params), {'params': normalize_params(params), 'response': response})
+
+    def load_search(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """SearchItemsの応答を読み込み（記録が無ければNone）。"""
+        record = self._read(self._search_path(params))
+        return record['response'] if record else None
+
+    def save_items(self, items: List[Dict[str, Any]]) -> int:
+        """GetItems応答のアイテムをASINごとに保存。
+
+        Returns:
+            保存したアイテム数
+        """
+        saved = 0
+        for item in items:
+            if isinstance(item, dict) and item.get('ASIN'):
+                self._write(self._item_path(str(item['ASIN'])), item)
+                saved += 1
+        return saved
+
+    def load_item(self, asin: str) -> Optional[Dict[str, Any]]:
+        """ASINのアイテムを読み込み（記録が無ければNone）。"""
+        return self._read(self._item_path(asin))
+
+    def asins(self) -> List[str]:
+        """記録済みのASIN一覧を取得。"""
+        return sorted(path.name[:-len('.json.gz')] for path in (self.root / 'items').glob('*.json.gz'))
+
+
+class RecordingApi:
+    """AmazonApiへの呼び出しを中継し、応答をフィクスチャに記録する。"""
+
+    def __init__(self, api: Any, store: FixtureStore) -> None:
+        """記録用ラッパーを初期化。
+
+        Args:
+            api: 実際に呼び出すAmazonApi（互換）インスタンス
+            store: 記録先のフィクスチャ置き場
+        """
+        self._api = api
+        self._store = store
+
+    def search_items(self, **params) -> Dict[str, Any]:
+        response = _to_dict(self._api.search_items(**sdk_params(self._api, 'search_items', params)))
+        self._store.save_search(params, response)
+        return response
+
+    def get_items(self, **params) -> Dict[str, Any]:
+        response = _to_dict(self._api.get_items(**sdk_params(self._api, 'get_items', params)))
+        items = response.get('data', {}).get('ItemsResult', {}).get('Items', [])
+        self._store.save_items(items)
+        return response
+
+
+class ReplayApi:
+    """フィクスチャから応答を再生するAmazonApi互換オブジェクト。
+
+    スレッドセーフで、接続プールの全スロットで1つのインスタンスを共有すると
+    スロットリングがアカウント単位で再現される。
+
+    Attributes:
+        latency: 1呼び出しあたりの基本遅延（秒）
+        jitter: 基本遅延に加える一様乱数の上限（秒）
+        error_rates: エラー名（INJECTABLE_ERRORSのキー）→発生確率
+    """
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, jitter: float = 0.0,
+                 error_rates: Optional[Dict[str, float]] = None,
+                 throttle: str = DEFAULT_THROTTLE_PROFILE, seed: Optional[int] = None,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        """再生用オブジェクトを初期化。
+
+        Args:
+            store: 再生元のフィクスチャ置き場
+            latency: 1呼び出しあたりの基本遅延（秒）
+            jitter: 基本遅延に加える一様乱数の上限（秒）
+            error_rates: エラー名→発生確率（例: {'TooManyRequests': 0.05}）
+            throttle: THROTTLE_PROFILESのプロファイル名
+            seed: 乱数のシード（再現可能な負荷試験用）
+            sleep: 遅延に使う関数（テスト用に差し替え可能）
+
+        Raises:
+            ValueError: 未知のエラー名・スロットリングプロファイル、または確率が範囲外の場合
+        """
+        error_rates = dict(error_rates or {})
+        for name, rate in error_rates.items():
+            if name not in INJECTABLE_ERRORS:
+                raise ValueError(
+                    f"注入できないエラーです: {name} (利用可能: {', '.join(INJECTABLE_ERRORS)})"
+                )
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"エラー発生確率は0.0から1.0の範囲で指定してください: {name}={rate}")
+        if throttle not in THROTTLE_PROFILES:
+            raise ValueError(
+                f"未知のスロットリングプロファイルです: {throttle} (利用可能: {', '.join(THROTTLE_PROFILES)})"
+            )
+
+        self.latency = max(0.0, latency)
+        self.jitter = max(0.0, jitter)
+        self.error_rates = error_rates
+        self._store = store
+        self._sleep = sleep
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        profile = THROTTLE_PROFILES[throttle]
+        self._bucket = (
+            TokenBucket(profile['requests_per_second'], profile['burst']) if profile else None
+        )
+        self._stats = {'calls': 0, 'throttled': 0, 'injected': 0, 'missing': 0}
+
+    def _before_call(self, operation: str) -> None:
+        """スロットリング判定・エラー注入・遅延を適用。"""
+        with self._lock:
+            self._stats['calls'] += 1
+            injected = None
+            for name, rate in self.error_rates.items():
+                if rate > 0 and self._random.random() < rate:
+                    injected = name
+                    break
+            delay = self.latency + (self._random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+
+        if self._bucket is not None and self._bucket.reserve(max_wait=0.0) is None:
+            with self._lock:
+                self._stats['throttled'] += 1
+            raise TooManyRequests(f"再生サーバーのスロットリング ({operation})")
+
+        if delay > 0:
+            self._sleep(delay)
+
+        if injected is not None:
+            with self._lock:
+                self._stats['injected'] += 1
+            raise INJECTABLE_ERRORS[injected](f"注入されたエラー ({operation})")
+
+    def _count_missing(self) -> None:
+        with self._lock:
+            self._stats['missing'] += 1
+
+    def search_items(self, **params) -> Dict[str, Any]:
+        self._before_call('search_items')
+        response = self._store.load_search(params)
+        if response is None:
+            self._count_missing()
+            raise FixtureNotFoundError(f"検索のフィクスチャが記録されていません: {normalize_params(params)}")
+        return response
+
+    def get_items(self, items: List[str], **params) -> Dict[str, Any]:
+        self._before_call('get_items')
+        asins = [items] if isinstance(items, str) else items
+        found = [item for item in (self._store.load_item(asin) for asin in asins) if item is not None]
+        if len(found) < len(asins):
+            self._count_missing()
+        if not found:
+            raise AsinNotFound(f"フィクスチャにASINがありません: {', '.join(asins)}")
+        return {'data': {'ItemsResult': {'Items': found}}}
+
+    def stats(self) -> Dict[str, Any]:
+        """呼び出し数・スロットリング数・注入エラー数・未記録数を取得。"""
+        with self._lock:
+            return dict(self._stats)
+
+
+def _error_body(code: str, message: str) -> Dict[str, Any]:
+    """PA-API 5.0形式のエラー応答本文を生成。"""
+    return {'Errors': [{'Code': code, 'Message': message}]}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """PA-API 5.0形式のリクエストをReplayApiに中継するハンドラ。"""
+
+    server_version = 'PAAPIStandIn/1.0'
+
+    def do_POST(self) -> None:
+        operation = OPERATION_PATHS.get(self.path.lower())
+        if operation is None:
+            self._respond(404, _error_body('UnrecognizedClient', f"未知のパスです: {self.path}"))
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            self._respond(400, _error_body('MalformedRequest', str(e)))
+            return
+
+        fields = REQUEST_FIELDS[operation]
+        params = {fields[name]: value for name, value in body.items() if name in fields}
+        backend = self.server.backend
+        try:
+            response = getattr(backend, operation)(**params)
+        except TooManyRequests as e:
+            self._respond(429, _error_body('TooManyRequests', str(e)))
+        except (AsinNotFound, FixtureNotFoundError) as e:
+            self._respond(404, _error_body('NoResults', str(e)))
+        except Exception as e:
+            self._respond(500, _error_body('InternalFailure', str(e)))
+        else:
+            self._respond(200, response.get('data', {}))
+
+    def _respond(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"代替サーバー: {format % args}")
+
+
+class PAAPIStandInServer:
+    """ReplayApiをPA-API 5.0形式のHTTPで公開するローカル代替サーバー。
+
+    with文で使用すると、ブロックの間だけバックグラウンドスレッドで待ち受ける。
+
+    Attributes:
+        backend: 応答を生成するReplayApi
+    """
+
+    def __init__(self, backend: ReplayApi, host: str = '127.0.0.1', port: int = 0) -> None:
+        """代替サーバーを初期化（portに0を指定すると空きポートを使用）。"""
+        self.backend = backend
+        self._httpd = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.backend = backend
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        """接続先のURL（例: http://127.0.0.1:54321）。"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'PAAPIStandInServer':
+        """バックグラウンドスレッドで待ち受けを開始。"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, name='paapi-standin', daemon=True
+            )
+            self._thread.start()
+            logger.info(f"PA-API代替サーバー起動: {self.endpoint}")
+        return self
+
+    def stop(self) -> None:
+        """待ち受けを停止してソケットを閉じる。"""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'PAAPIStandInServer':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+class HttpApi:
+    """PA-API 5.0形式のHTTPエンドポイントに接続するAmazonApi互換オブジェクト。
+
+    代替サーバーと組み合わせ、実際のHTTP往復を含めた負荷試験に使用する。
+    """
+
+    def __init__(self, endpoint: str, timeout: float = DEFAULT_HTTP_TIMEOUT) -> None:
+        """HTTPクライアントを初期化。
+
+        Args:
+            endpoint: 接続先のURL（例: PAAPIStandInServer.endpoint）
+            timeout: リクエストタイムアウト（秒）
+        """
+        self.endpoint = endpoint.rstrip('/')
+        self.timeout = timeout
+        self._paths = {operation: path for path, operation in OPERATION_PATHS.items()}
+
+    def _post(self, operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        fields = {arg: name for name, arg in REQUEST_FIELDS[operation].items()}
+        body = {fields[arg]: value for arg, value in params.items() if arg in fields and value is not None}
+        request = urllib.request.Request(
+            self.endpoint + self._paths[operation],
+            data=json.dumps(body).encode('utf-8'),
+            headers={'Content-Type': 'application/json; charset=utf-8'},
+            method='POST'
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return {'data': json.loads(response.read())}
+        except urllib.error.HTTPError as e:
+            message = e.reason
+            try:
+                message = json.loads(e.read())['Errors'][0]['Message']
+            except (ValueError, KeyError, IndexError):
+                pass
+            if e.code == 429:
+                raise TooManyRequests(message)
+            if e.code == 404:
+                raise (AsinNotFound if operation == 'get_items' else ItemsNotFound)(message)
+            raise RequestError(f"HTTP {e.code}: {message}") from e
+        except urllib.error.URLError as e:
+            raise RequestError(f"代替サーバーに接続できません: {e.reason}") from e
+
+    def search_items(self, **params) -> Dict[str, Any]:
+        return self._post('search_items', params)
+
+    def get_items(self, **params) -> Dict[str, Any]:
+        return self._post('get_items', params)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+プロセス間で共有するPA-API日次クォータ台帳
+
+cronジョブやCLIなど複数のプロセスが同じアカウントでPA-APIを呼び出しても
+1日の上限を超えないよう、呼び出し回数をSQLiteに記録する。
+予約はBEGIN IMMEDIATEトランザクション内で行うため、プロセスを跨いでも
+同じ枠を二重に消費することはない。
+
+優先度の低いジョブ（一括更新など）は、残り枠が予備分を下回った時点で
+予約を断られ、記事生成など通常優先度の呼び出しに枠を譲る。
+"""
+
+import time
+import sqlite3
+import threading
+import logging
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# 優先度
+PRIORITY_NORMAL = 'normal'
+PRIORITY_LOW = 'low'
+PRIORITIES = (PRIORITY_NORMAL, PRIORITY_LOW)
+
+# 低優先度ジョブが使用できない予備枠の割合
+DEFAULT_LOW_PRIORITY_RESERVE = 0.2
+
+
+class QuotaLedger:
+    """SQLiteベースの日次クォータ台帳。
+
+    日付はUTCで区切る。スコープ（アソシエイトタグとマーケットプレイス等）
+    ごとに独立して集計する。
+
+    Attributes:
+        path: 台帳データベースのパス
+        daily_limit: 1日あたりの呼び出し上限
+        low_priority_reserve: 低優先度ジョブに使わせない枠の割合（0.0-1.0）
+    """
+
+    def __init__(self, path: Path, daily_limit: int,
+                 low_priority_reserve: float = DEFAULT_LOW_PRIORITY_RESERVE,
+                 clock: Callable[[], float] = time.time) -> None:
+        """台帳を初期化（データベースが無ければ作成）。
+
+        Args:
+            path: 台帳データベースのパス
+            daily_limit: 1日あたりの呼び出し上限
+            low_priority_reserve: 低優先度ジョブに使わせない枠の割合
+            clock: 現在時刻（UNIX時間）を返す関数
+
+        Raises:
+            ValueError: daily_limitまたはlow_priority_reserveが不正な場合
+        """
+        if daily_limit < 1:
+            raise ValueError("daily_limitは1以上を指定してください")
+        if not 0.0 <= low_priority_reserve < 1.0:
+            raise ValueError("low_priority_reserveは0.0以上1.0未満を指定してください")
+
+        self.path = Path(path)
+        self.daily_limit = int(daily_limit)
+        self.low_priority_reserve = low_priority_reserve
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 自動トランザクションを無効化し、BEGIN IMMEDIATEで明示的に書き込みロックを取る
+        self._conn = sqlite3.connect(str(self.path), timeout=30,
+                                     check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                " day TEXT NOT NULL,"
+                " scope TEXT NOT NULL,"
+                " used INTEGER NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (day, scope))"
+            )
+
+    def _day(self, now: float) -> str:
+        """UNIX時間をUTCの日付文字列に変換。"""
+        return datetime.fromtimestamp(now, tz=timezone.utc).strftime('%Y-%m-%d')
+
+    def _limit_for(self, priority: str) -> int:
+        """優先度ごとに使用できる上限を取得。"""
+        if priority not in PRIORITIES:
+            raise ValueError(f"未知の優先度です: {priority} (利用可能: {', '.join(PRIORITIES)})")
+        if priority == PRIORITY_LOW:
+            return int(self.daily_limit * (1.0 - self.low_priority_reserve))
+        return self.daily_limit
+
+    def reserve(self, scope: str = 'default', count: int = 1,
+                priority: str = PRIORITY_NORMAL) -> bool:
+        """呼び出し枠を予約。
+
+        Args:
+            scope: 集計単位（例: 'tag:JP'）
+            count: 予約する呼び出し数
+            priority: 優先度（'normal'または'low'）
+
+        Returns:
+            予約できた場合True。上限（低優先度は予備枠を除いた上限）を超える場合False。
+
+        Raises:
+            ValueError: 未知の優先度が指定された場合
+        """
+        limit = self._limit_for(priority)
+        now = self._clock()
+        day = self._day(now)
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT used FROM usage WHERE day = ? AND scope = ?", (day, scope)
+                ).fetchone()
+                used = row[0] if row else 0
+                if used + count > limit:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.execute(
+                    "INSERT INTO usage (day, scope, used, updated_at) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(day, scope) DO UPDATE SET used = used + excluded.used,"
+                    " updated_at = excluded.updated_at",
+                    (day, scope, count, now)
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def used_today(self, scope: str = 'default') -> int:
+        """本日の使用済み呼び出し数を取得。"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT used FROM usage WHERE day = ? AND scope = ?",
+                (self._day(self._clock()), scope)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self, scope: str = 'default', priority: str = PRIORITY_NORMAL) -> int:
+        """本日の残り呼び出し数を取得（優先度ごとの上限基準）。"""
+        return max(0, self._limit_for(priority) - self.used_today(scope))
+
+    def status(self, scope: str = 'default') -> Dict[str, Any]:
+        """残り枠と枯渇見込み時刻を取得。
+
+        枯渇見込みは本日0時（UTC）からの平均消費ペースで算出し、
+        本日中に枯渇しない場合はNoneとする。
+
+        Returns:
+            day, used, limit, remaining, low_priority_remaining,
+            projected_exhaustion（ISO 8601文字列またはNone）を含む辞書
+        """
+        now = self._clock()
+        used = self.used_today(scope)
+        remaining = max(0, self.daily_limit - used)
+
+        day_start = datetime.fromtimestamp(now, tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        elapsed = now - day_start.timestamp()
+        projected: Optional[str] = None
+        if remaining == 0:
+            projected = datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
+        elif used > 0 and elapsed > 0:
+            exhaustion = now + remaining / (used / elapsed)
+            if exhaustion < (day_start + timedelta(days=1)).timestamp():
+                projected = datetime.fromtimestamp(exhaustion, tz=timezone.utc).isoformat()
+
+        return {
+            'day': self._day(now),
+            'used': used,
+            'limit': self.daily_limit,
+            'remaining': remaining,
+            'low_priority_remaining': self.remaining(scope, PRIORITY_LOW),
+            'projected_exhaustion': projected
+        }
+
+    def close(self) -> None:
+        """データベース接続を閉じる。"""
+        with self._lock:
+            self._conn.close()
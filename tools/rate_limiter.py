@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+トークンバケット方式のレート制限
+
+PA-APIの秒間リクエスト数（TPS）と1日あたりのリクエスト上限を
+事前に平準化するためのレートリミッター。TooManyRequestsを受けてから
+バックオフするのではなく、送信前にトークンを予約して待機する。
+
+予約（reserve）は待機時間を返すだけでスリープしないため、
+同一のリミッターをスレッドとコルーチンの双方から共有できる。
+"""
+
+import time
+import asyncio
+import threading
+import logging
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# 定数定義
+SECONDS_PER_DAY = 86400
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+
+
+class TokenBucket:
+    """スレッドセーフなトークンバケット。
+
+    トークンは一定レートで補充され、容量を上限に蓄積される。
+    予約時にトークンが不足していれば残高を負にして（前借り）、
+    補充されるまでの待機時間を呼び出し側に返す。
+
+    Attributes:
+        rate: 1秒あたりのトークン補充数
+        capacity: バケット容量（バースト上限）
+    """
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """トークンバケットを初期化。
+
+        Args:
+            rate: 1秒あたりのトークン補充数（正の値）
+            capacity: バケット容量（1以上）
+            clock: 単調増加する時刻関数（テスト用に差し替え可能）
+
+        Raises:
+            ValueError: rateまたはcapacityが不正な場合
+        """
+        if rate <= 0:
+            raise ValueError("rateは正の値を指定してください")
+        if capacity < 1:
+            raise ValueError("capacityは1以上を指定してください")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """経過時間に応じてトークンを補充（ロック保持中に呼び出す）。"""
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def reserve(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> Optional[float]:
+        """トークンを予約し、実行までに待機すべき秒数を返す。
+
+        Args:
+            tokens: 予約するトークン数
+            max_wait: 許容する最大待機秒数。超える場合は予約しない。
+
+        Returns:
+            待機秒数（0.0なら即時実行可）。max_waitを超える場合はNone。
+        """
+        with self._lock:
+            self._refill(self._clock())
+            deficit = tokens - self._tokens
+            wait = deficit / self.rate if deficit > 0 else 0.0
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    def refund(self, tokens: float = 1.0) -> None:
+        """予約済みトークンを返却。"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def available(self) -> float:
+        """現在利用可能なトークン数を取得。"""
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+
+class RateLimiter:
+    """PA-APIのTPSと1日の上限を同時に適用するレートリミッター。
+
+    秒間バケット（TPSの平準化）と日次バケット（1日の上限を
+    24時間かけて補充）の両方からトークンを予約する。
+
+    Attributes:
+        requests_per_second: 秒間リクエスト数の上限
+        requests_per_day: 1日あたりのリクエスト数の上限
+    """
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 requests_per_day: Optional[int] = None,
+                 burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        """レートリミッターを初期化。
+
+        Args:
+            requests_per_second: 秒間リクエスト数の上限
+            requests_per_day: 1日あたりのリクエスト数の上限（Noneで無制限）
+            burst: 秒間バケットの容量。Noneの場合はmax(1, requests_per_second)。
+            clock: 単調増加する時刻関数
+            sleep: 同期待機に使用する関数
+        """
+        self.requests_per_second = requests_per_second
+        self.requests_per_day = requests_per_day
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+        self._second_bucket = TokenBucket(
+            rate=requests_per_second,
+            capacity=burst if burst is not None else max(1.0, requests_per_second),
+            clock=clock
+        )
+        self._daily_bucket = None
+        if requests_per_day:
+            self._daily_bucket = TokenBucket(
+                rate=requests_per_day / SECONDS_PER_DAY,
+                capacity=requests_per_day,
+                clock=clock
+            )
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """1リクエスト分のトークンを両バケットから予約。
+
+        Args:
+            max_wait: 許容する最大待機秒数
+
+        Returns:
+            待機秒数。いずれかのバケットでmax_waitを超える場合はNone（予約なし）。
+        """
+        with self._lock:
+            second_wait = self._second_bucket.reserve(max_wait=max_wait)
+            if second_wait is None:
+                return None
+
+            daily_wait = 0.0
+            if self._daily_bucket is not None:
+                daily_wait = self._daily_bucket.reserve(max_wait=max_wait)
+                if daily_wait is None:
+                    self._second_bucket.refund()
+                    return None
+
+            return max(second_wait, daily_wait)
+
+    def refund(self) -> None:
+        """予約済みの1リクエスト分のトークンを両バケットに返却（送信しなかった場合）。"""
+        with self._lock:
+            self._second_bucket.refund()
+            if self._daily_bucket is not None:
+                self._daily_bucket.refund()
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """トークンを予約し、必要な時間だけ同期的に待機。
+
+        Returns:
+            実行可能になった場合True、max_wait内に確保できない場合False
+        """
+        wait = self.reserve(max_wait=max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            logger.debug(f"レート制限により{wait:.3f}秒待機")
+            self._sleep(wait)
+        return True
+
+    async def acquire_async(self, max_wait: Optional[float] = None) -> bool:
+        """acquireの非同期版。イベントループをブロックせずに待機する。"""
+        wait = self.reserve(max_wait=max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """現在のトークン残量を取得。"""
+        return {
+            'requests_per_second': self.requests_per_second,
+            'requests_per_day': self.requests_per_day,
+            'second_tokens': self._second_bucket.available(),
+            'daily_tokens': self._daily_bucket.available() if self._daily_bucket else None
+        }
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+同一キーの同時リクエストを集約するコアレッサー（singleflight）
+
+複数の呼び出し元が同じキー（ASIN等）を同時に要求した場合、
+取得中のキーは同じFutureを共有し、未送信のキーは呼び出し元を跨いで
+最大batch_size件のリクエストにまとめて送信する。
+
+専用のディスパッチスレッドは持たず、キーを登録した呼び出し元自身が
+バッチを送信する。バッチが満杯にならない場合、他の呼び出し元のキーが
+送信待ち・取得中であればlinger秒だけ合流を待ってから残りをまとめて送信する。
+他に呼び出し元がいない場合は待たずに送信する（単独の呼び出しに遅延を加えない）。
+"""
+
+import time
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, List, Hashable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# 定数定義
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_LINGER_SECONDS = 0.02
+
+
+class RequestCoalescer:
+    """キー単位で取得中のリクエストを共有し、未送信キーをバッチ化する。
+
+    Attributes:
+        batch_size: 1リクエストあたりの最大キー数
+        linger: バッチが満杯でなく、他の呼び出し元がいる場合に合流を待つ秒数
+    """
+
+    def __init__(self, fetch_batch: Callable[[List[Hashable]], Dict[Hashable, Any]],
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 linger: float = DEFAULT_LINGER_SECONDS) -> None:
+        """コアレッサーを初期化。
+
+        Args:
+            fetch_batch: キーのリストを受け取り、キー→結果の辞書を返す関数。
+                辞書に含まれないキーの結果はNoneとなる。
+            batch_size: 1リクエストあたりの最大キー数
+            linger: バッチが満杯でなく、他の呼び出し元がいる場合に合流を待つ秒数
+
+        Raises:
+            ValueError: batch_sizeが1未満の場合
+        """
+        if batch_size < 1:
+            raise ValueError("batch_sizeは1以上を指定してください")
+
+        self.batch_size = batch_size
+        self.linger = max(0.0, linger)
+        self._fetch_batch = fetch_batch
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._pending: Dict[Hashable, None] = {}  # 送信待ちのキー（挿入順を保持）
+        self._stats = {'requested': 0, 'coalesced': 0, 'batches': 0}
+
+    def fetch(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """キーの結果を取得（取得中・送信待ちのキーは共有する）。
+
+        Args:
+            keys: 取得したいキー
+
+        Returns:
+            キー→結果の辞書
+
+        Raises:
+            Exception: バッチ取得で発生した例外（同じバッチを待つ全呼び出し元に伝播）
+        """
+        futures: Dict[Hashable, Future] = {}
+        own_keys = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                self._stats['requested'] += 1
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    self._pending[key] = None
+                    own_keys.append(key)
+                else:
+                    self._stats['coalesced'] += 1
+                futures[key] = future
+
+        if own_keys:
+            # 満杯のバッチは即座に送信
+            self._dispatch(force=False)
+            if self._has_pending(own_keys):
+                # 他の呼び出し元がいる場合のみ合流を待ってから残りを送信
+                if self.linger > 0 and self._has_other_callers(own_keys):
+                    time.sleep(self.linger)
+                self._dispatch(force=True)
+
+        return {key: future.result() for key, future in futures.items()}
+
+    def _has_pending(self, keys: List[Hashable]) -> bool:
+        """指定キーのうち未送信のものがあるか。"""
+        with self._lock:
+            return any(key in self._pending for key in keys)
+
+    def _has_other_callers(self, own_keys: List[Hashable]) -> bool:
+        """自分以外の呼び出し元のキーが送信待ち・取得中か。"""
+        own = set(own_keys)
+        with self._lock:
+            return any(key not in own for key in self._inflight)
+
+    def _take_batch(self, force: bool) -> List[Hashable]:
+        """送信待ちキーからバッチを取り出す（満杯でなければforce時のみ）。"""
+        with self._lock:
+            if not self._pending or (len(self._pending) < self.batch_size and not force):
+                return []
+            batch = []
+            for key in self._pending:
+                batch.append(key)
+                if len(batch) >= self.batch_size:
+                    break
+            for key in batch:
+                del self._pending[key]
+            self._stats['batches'] += 1
+            return batch
+
+    def _dispatch(self, force: bool) -> None:
+        """取り出せる限りバッチを送信し、結果をFutureに設定。"""
+        while True:
+            batch = self._take_batch(force)
+            if not batch:
+                return
+            try:
+                results = self._fetch_batch(batch)
+            except BaseException as e:
+                self._complete(batch, error=e)
+                if not isinstance(e, Exception):
+                    raise
+            else:
+                self._complete(batch, results=results)
+
+    def _complete(self, batch: List[Hashable], results: Dict[Hashable, Any] = None,
+                  error: BaseException = None) -> None:
+        """バッチの結果を設定し、取得中キーから外す。"""
+        with self._lock:
+            futures = [self._inflight.pop(key) for key in batch]
+        for key, future in zip(batch, futures):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results.get(key))
+
+    def stats(self) -> Dict[str, Any]:
+        """要求キー数・集約されたキー数・送信バッチ数を取得。"""
+        with self._lock:
+            return {**self._stats, 'inflight': len(self._inflight)}
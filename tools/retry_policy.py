@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PA-API呼び出しのリトライポリシー
+
+例外をスロットリング・一時的な通信障害・致命的エラーに分類し、
+前2者のみをリトライする。SDKのRequestErrorは認証失敗や4xxでも送出されるため、
+原因の例外が通信障害または5xx応答の場合のみ一時的な障害とみなす。待機時間はdecorrelated jitter
+（前回の待機時間の3倍までの一様乱数）で決めるため、並行ワーカーの
+リトライが同じ時刻に集中して再び429を受けることを防ぐ。
+
+呼び出しごとに期限（deadline）を指定すると、待機を含めた合計時間が
+期限を超える前にリトライを打ち切る。
+"""
+
+import time
+import random
+import logging
+import urllib.error
+from typing import Callable, Optional
+
+from amazon_paapi.errors import TooManyRequests, RequestError
+from amazon_paapi.sdk.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+# 例外の分類
+ERROR_THROTTLED = 'throttled'   # スロットリング（リトライする）
+ERROR_TRANSIENT = 'transient'   # 一時的な通信障害（リトライする）
+ERROR_FATAL = 'fatal'           # 不正なリクエストやプログラムの誤り（リトライしない）
+RETRYABLE_ERRORS = (ERROR_THROTTLED, ERROR_TRANSIENT)
+
+# 一時的な通信障害とみなす例外の送出元モジュール
+TRANSIENT_ERROR_MODULES = ('urllib3', 'requests', 'botocore', 'http.client', 'socket')
+
+# 一時的な障害とみなすHTTPステータスの下限
+TRANSIENT_STATUS_MIN = 500
+
+# スロットリングを示すエラーコード（botocoreのClientError等）
+THROTTLING_ERROR_CODES = ('TooManyRequests', 'RequestThrottled', 'Throttling', 'ThrottlingException')
+
+# 定数定義
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+JITTER_MULTIPLIER = 3.0
+
+
+def _error_response(error: BaseException) -> dict:
+    """botocoreのClientError形式のresponse属性を取得（無ければ空辞書）。"""
+    response = getattr(error, 'response', None)
+    return response if isinstance(response, dict) else {}
+
+
+def _http_status(error: BaseException) -> Optional[int]:
+    """例外が持つHTTPステータス（SDKのApiException.status、urllibのHTTPError.code）。"""
+    for name in ('status', 'code'):
+        value = getattr(error, name, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _cause(error: BaseException) -> Optional[BaseException]:
+    """例外の原因（raise fromの指定、無ければ処理中だった例外）。"""
+    return error.__cause__ or error.__context__
+
+
+def is_network_error(error: BaseException) -> bool:
+    """応答を受け取れなかった通信障害（接続断・タイムアウト等）かを判定。
+
+    SDKのRequestErrorは原因の例外で判定する（原因が無い場合は通信障害とみなさない）。
+    """
+    if isinstance(error, RequestError):
+        cause = _cause(error)
+        return cause is not None and is_network_error(cause)
+    if isinstance(error, ApiException):
+        # SDKは接続・SSLの失敗をstatus=0のApiExceptionとして送出する
+        return not error.status
+    if isinstance(error, urllib.error.URLError):
+        return not isinstance(error, urllib.error.HTTPError)
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    module = type(error).__module__ or ''
+    return module.startswith(TRANSIENT_ERROR_MODULES)
+
+
+def classify_error(error: BaseException) -> str:
+    """例外をリトライの観点で分類。
+
+    Args:
+        error: SDK呼び出しで発生した例外
+
+    Returns:
+        ERROR_THROTTLED、ERROR_TRANSIENT、ERROR_FATALのいずれか
+    """
+    if isinstance(error, TooManyRequests):
+        return ERROR_THROTTLED
+
+    response = _error_response(error)
+    code = response.get('Error', {}).get('Code')
+    if code in THROTTLING_ERROR_CODES:
+        return ERROR_THROTTLED
+    if code is not None:
+        # エラーコード付きの応答は5xxのみ一時的な障害とみなす
+        status = response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+        return ERROR_TRANSIENT if status >= 500 else ERROR_FATAL
+
+    if isinstance(error, RequestError):
+        # SDKは429以外の未分類の応答（401/403の署名・認証エラーや4xx）もRequestErrorにする
+        cause = _cause(error)
+        if cause is None:
+            return ERROR_FATAL
+        if is_network_error(cause):
+            return ERROR_TRANSIENT
+        status = _http_status(cause)
+        return ERROR_TRANSIENT if status is not None and status >= TRANSIENT_STATUS_MIN else ERROR_FATAL
+    return ERROR_TRANSIENT if is_network_error(error) else ERROR_FATAL
+
+
+class RetryPolicy:
+    """decorrelated jitterによるリトライポリシー。
+
+    Attributes:
+        max_attempts: 初回を含む最大試行回数
+        base_delay: 最小の待機秒数
+        max_delay: 待機秒数の上限
+        deadline: 既定の期限（初回試行からの秒数、Noneで無期限）
+    """
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY,
+                 deadline: Optional[float] = None,
+                 rng: Optional[random.Random] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """リトライポリシーを初期化。
+
+        Args:
+            max_attempts: 初回を含む最大試行回数（1以上）
+            base_delay: 最小の待機秒数
+            max_delay: 待機秒数の上限
+            deadline: 既定の期限（秒、Noneで無期限）
+            rng: 乱数生成器（テスト用に差し替え可能）
+            clock: 単調増加する時刻関数
+
+        Raises:
+            ValueError: max_attemptsが1未満の場合
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attemptsは1以上を指定してください")
+
+        self.max_attempts = max_attempts
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.deadline = deadline
+        self._rng = rng or random.Random()
+        self._clock = clock
+
+    def next_delay(self, previous: float) -> float:
+        """前回の待機秒数から次の待機秒数を算出。"""
+        upper = max(self.base_delay, previous * JITTER_MULTIPLIER)
+        return min(self.max_delay, self._rng.uniform(self.base_delay, upper))
+
+    def start(self, deadline: Optional[float] = None) -> 'RetryState':
+        """1回の呼び出しのリトライ状態を開始。
+
+        Args:
+            deadline: この呼び出しの期限（秒）。Noneの場合はポリシーの既定値。
+        """
+        return RetryState(self, self.deadline if deadline is None else deadline)
+
+
+class RetryState:
+    """1回の呼び出しにおける試行回数・待機時間・期限を管理する。
+
+    Attributes:
+        attempts: これまでに送信した回数
+    """
+
+    def __init__(self, policy: RetryPolicy, deadline: Optional[float]) -> None:
+        self._policy = policy
+        self._deadline_at = None if deadline is None else policy._clock() + deadline
+        self._delay = policy.base_delay
+        self.attempts = 0
+
+    def remaining(self) -> Optional[float]:
+        """期限までの残り秒数（無期限の場合はNone）。"""
+        if self._deadline_at is None:
+            return None
+        return max(0.0, self._deadline_at - self._policy._clock())
+
+    def record_attempt(self) -> None:
+        """送信を1回記録。"""
+        self.attempts += 1
+
+    def next_delay(self, error_class: str) -> Optional[float]:
+        """リトライまでの待機秒数を決定。
+
+        Args:
+            error_class: classify_errorによる分類
+
+        Returns:
+            待機秒数。リトライしない場合（致命的エラー、試行回数の上限、
+            待機すると期限を超える場合）はNone。
+        """
+        if error_class not in RETRYABLE_ERRORS or self.attempts >= self._policy.max_attempts:
+            return None
+        delay = self._policy.next_delay(self._delay)
+        remaining = self.remaining()
+        if remaining is not None and delay >= remaining:
+            logger.info(f"期限内にリトライできないため打ち切ります (残り{remaining:.2f}秒, 待機{delay:.2f}秒)")
+            return None
+        self._delay = delay
+        return delay
@@ -11,17 +11,52 @@ TDD GREEN Phase: テストを通過させる最小限の実装
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
-import pandas as pd
 import numpy as np
 import logging
 from scipy import stats
 
-from tools.models import Product, ProductReview, SakuraScore
+from tools.models import Product, ProductReview, SakuraScore, ProductTable, ReviewFrame
 
 logger = logging.getLogger(__name__)
 
+# 商品群の引数にはProductのリストとProductTableのどちらも指定できる
+ProductCollection = Union[List[Product], ProductTable]
+
+
+# レビュー群の引数にはProductReviewのリストとReviewFrameのどちらも指定できる
+ReviewCollection = Union[List[ProductReview], ReviewFrame]
+
+
+def _rating_columns(products: ProductCollection) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    商品群から評価・評価の有効値マスク・レビュー数の配列を取得
+    
+    ProductTableは列をそのまま使う。リストの場合は全列のテーブルを組み立てず、
+    統計に使う2属性だけを読む（Productは生成時に範囲検証済み）。
+    
+    Args:
+        products: 商品リストまたはProductTable
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: (評価, 評価の有効値マスク, レビュー数)
+    """
+    if isinstance(products, ProductTable):
+        return products.column('rating'), products.valid('rating'), products.column('reviews_count')
+    ratings = [p.rating for p in products]
+    has_rating = np.array([rating is not None for rating in ratings], dtype=bool)
+    rating_values = np.array([np.nan if rating is None else rating for rating in ratings], dtype=np.float64)
+    reviews = np.array([p.reviews_count for p in products], dtype=np.int64)
+    return rating_values, has_rating, reviews
+
+
+def _as_frame(reviews: ReviewCollection) -> ReviewFrame:
+    """レビュー群をReviewFrameに変換（ReviewFrameはそのまま返す）"""
+    if isinstance(reviews, ReviewFrame):
+        return reviews
+    return ReviewFrame.from_reviews(reviews)
+
 
 @dataclass
 class StatisticalAnomaly:
@@ -114,19 +149,23 @@ class SakuraDetector:
         logger.info(f"SakuraDetector initialized with threshold={anomaly_threshold}")
     
     def analyze_product(self, product: Product, 
-                       reviews: Optional[List[ProductReview]] = None,
+                       reviews: Optional[ReviewCollection] = None,
                        rating_history: Optional[List[Dict]] = None) -> SakuraAnalysisResult:
         """
         商品のサクラ度を総合分析（時系列分析を含む）
         
         Args:
             product: 分析対象の商品
-            reviews: 商品のレビューリスト（オプション）
+            reviews: 商品のレビューリストまたはReviewFrame（オプション）
             rating_history: 評価履歴データ（オプション）
             
         Returns:
             SakuraAnalysisResult: 分析結果
         """
+        # 各分析で共有するため、レビューは1回だけ列指向に変換
+        if reviews is not None:
+            reviews = _as_frame(reviews)
+        
         warnings = []
         analysis_details = {}
         confidence_level = 1.0
@@ -260,12 +299,12 @@ class SakuraDetector:
         """
         return surge_score > 0.5
     
-    def analyze_temporal_burst(self, reviews: List[ProductReview]) -> float:
+    def analyze_temporal_burst(self, reviews: ReviewCollection) -> float:
         """
         時系列レビューバースト分析
         
         Args:
-            reviews: レビューリスト
+            reviews: レビューリストまたはReviewFrame
             
         Returns:
             float: バーストスコア（0.0-1.0）
@@ -274,15 +313,14 @@ class SakuraDetector:
             return 0.0
         
         # 日付でグループ化
-        dates = [r.review_date for r in reviews]
-        date_counts = pd.Series(dates).dt.date.value_counts()
+        _, date_counts = np.unique(_as_frame(reviews).days(), return_counts=True)
         
         if len(date_counts) < 2:
             return 0.0
         
         # 短期間（3日以内）での集中度をチェック
         total_reviews = len(reviews)
-        top3_days = date_counts.nlargest(3).sum()
+        top3_days = np.sort(date_counts)[-3:].sum()
         concentration_ratio = top3_days / total_reviews
         
         # 3日間で70%以上集中している場合は異常
@@ -294,7 +332,7 @@ class SakuraDetector:
         # 統計的異常値検出も並行実行
         if len(date_counts) >= 3:
             mean_reviews = date_counts.mean()
-            std_reviews = date_counts.std()
+            std_reviews = date_counts.std(ddof=1)
             
             if std_reviews > 0:
                 max_reviews_per_day = date_counts.max()
@@ -306,12 +344,12 @@ class SakuraDetector:
         
         return max(concentration_ratio * 0.5, 0.0)
     
-    def detect_periodic_patterns(self, reviews: List[ProductReview]) -> float:
+    def detect_periodic_patterns(self, reviews: ReviewCollection) -> float:
         """
         周期的パターンを検出
         
         Args:
-            reviews: レビューリスト
+            reviews: レビューリストまたはReviewFrame
             
         Returns:
             float: 周期性スコア（0.0-1.0）
@@ -320,8 +358,7 @@ class SakuraDetector:
             return 0.0
         
         # 曜日別の分布を分析
-        weekdays = [r.review_date.weekday() for r in reviews]
-        weekday_counts = pd.Series(weekdays).value_counts()
+        weekday_counts = np.bincount(_as_frame(reviews).weekdays(), minlength=7)
         
         # 分布の偏りを計算
         total = len(reviews)
@@ -350,13 +387,13 @@ class SakuraDetector:
         return periodicity_score > 0.6
     
     def calculate_temporal_analysis_score(self, rating_history: List[Dict], 
-                                        reviews: List[ProductReview]) -> float:
+                                        reviews: ReviewCollection) -> float:
         """
         総合的な時系列分析スコア計算（最適化版）
         
         Args:
             rating_history: 評価履歴データ
-            reviews: レビューデータ
+            reviews: レビューデータ（リストまたはReviewFrame）
             
         Returns:
             float: 総合時系列スコア（0.0-1.0）
@@ -377,6 +414,7 @@ class SakuraDetector:
         
         # レビューパターン分析（効率化：一度にまとめて実行）
         if reviews and len(reviews) >= 10:
+            reviews = _as_frame(reviews)
             burst_score = self.analyze_temporal_burst(reviews)
             weighted_scores.append(burst_score * WEIGHTS['review_burst'])
             
@@ -396,20 +434,20 @@ class SakuraDetector:
         return min(sum(weighted_scores) / total_weight, 1.0)
     
     def detect_statistical_anomaly(self, product: Product, 
-                                  category_products: List[Product]) -> StatisticalAnomaly:
+                                  category_products: ProductCollection) -> StatisticalAnomaly:
         """
         カテゴリ内での統計的異常値を検出
         
         Args:
             product: 分析対象の商品
-            category_products: 同カテゴリの商品リスト
+            category_products: 同カテゴリの商品リストまたはProductTable
             
         Returns:
             StatisticalAnomaly: 異常値検出結果
         """
         # カテゴリ内の評価とレビュー数の統計
-        ratings = [p.rating for p in category_products if p.rating is not None]
-        reviews = [p.reviews_count for p in category_products]
+        rating_values, has_rating, reviews = _rating_columns(category_products)
+        ratings = rating_values[has_rating]
         
         mean_rating = np.mean(ratings)
         std_rating = np.std(ratings)
@@ -453,17 +491,17 @@ class SakuraDetector:
             category_std_reviews=std_reviews
         )
     
-    def analyze_review_pattern(self, reviews: List[ProductReview]) -> ReviewPattern:
+    def analyze_review_pattern(self, reviews: ReviewCollection) -> ReviewPattern:
         """
         レビューパターンを分析
         
         Args:
-            reviews: レビューリスト
+            reviews: レビューリストまたはReviewFrame
             
         Returns:
             ReviewPattern: パターン分析結果
         """
-        if not reviews:
+        if len(reviews) == 0:
             return ReviewPattern(
                 five_star_ratio=0.0,
                 verified_purchase_ratio=0.0,
@@ -473,30 +511,26 @@ class SakuraDetector:
                 has_suspicious_pattern=False
             )
         
+        frame = _as_frame(reviews)
+        total = len(frame)
+        
         # 5つ星レビューの比率
-        five_star_count = sum(1 for r in reviews if r.rating == 5)
-        five_star_ratio = five_star_count / len(reviews)
+        five_star_ratio = int(np.count_nonzero(frame.ratings == 5)) / total
         
         # 購入確認済みレビューの比率
-        verified_count = sum(1 for r in reviews if r.verified_purchase)
-        verified_purchase_ratio = verified_count / len(reviews)
+        verified_purchase_ratio = int(np.count_nonzero(frame.verified)) / total
         
         # 平均コンテンツ長
-        content_lengths = [len(r.content) for r in reviews]
-        average_content_length = np.mean(content_lengths)
+        average_content_length = np.mean(frame.content_lengths)
         
-        # 汎用的な名前の比率
-        generic_names = ['レビュアー', 'カスタマー', '購入者', 'ユーザー']
-        generic_count = sum(1 for r in reviews 
-                          if any(name in r.reviewer_name for name in generic_names))
-        generic_name_ratio = generic_count / len(reviews)
+        # 汎用的な名前の比率（名前の判定は重複を除いた名前ごとに1回）
+        generic_name_ratio = int(np.count_nonzero(frame.generic_name_mask())) / total
         
         # 役立つ票の比率
-        helpful_ratios = []
-        for r in reviews:
-            if r.total_votes > 0:
-                helpful_ratios.append(r.helpful_count / r.total_votes)
-        helpful_ratio = np.mean(helpful_ratios) if helpful_ratios else 0.0
+        voted = frame.total_votes > 0
+        helpful_ratio = (
+            np.mean(frame.helpful_counts[voted] / frame.total_votes[voted]) if voted.any() else 0.0
+        )
         
         return ReviewPattern(
             five_star_ratio=five_star_ratio,
@@ -507,12 +541,12 @@ class SakuraDetector:
             has_suspicious_pattern=False  # __post_init__で設定される
         )
     
-    def calculate_review_velocity(self, reviews: List[ProductReview]) -> float:
+    def calculate_review_velocity(self, reviews: ReviewCollection) -> float:
         """
         レビュー投稿速度を計算
         
         Args:
-            reviews: レビューリスト
+            reviews: レビューリストまたはReviewFrame
             
         Returns:
             float: 日あたりのレビュー数
@@ -520,13 +554,9 @@ class SakuraDetector:
         if len(reviews) < 2:
             return 0.0
         
-        # レビュー日付でソート
-        sorted_reviews = sorted(reviews, key=lambda r: r.review_date)
-        
-        # 期間を計算
-        first_date = sorted_reviews[0].review_date
-        last_date = sorted_reviews[-1].review_date
-        days_diff = (last_date - first_date).days
+        # 期間を計算（最初と最後の投稿日時の差の日数、端数切り捨て）
+        dates = _as_frame(reviews).dates
+        days_diff = int((dates.max() - dates.min()) // np.timedelta64(1, 'D'))
         
         if days_diff == 0:
             return len(reviews)  # 同日に全レビュー
@@ -690,23 +720,24 @@ class SakuraDetector:
         return min(bias_score, 1.0)
     
     def analyze_correlation_anomaly(self, product: Product, 
-                                  category_products: List[Product]) -> float:
+                                  category_products: ProductCollection) -> float:
         """
         レビュー数と評価の相関から異常を検出
         
         Args:
             product: 分析対象の商品
-            category_products: 同カテゴリの商品群
+            category_products: 同カテゴリの商品リストまたはProductTable
             
         Returns:
             float: 異常度スコア（0.0-1.0）
         """
-        if not category_products:
+        if len(category_products) == 0:
             return 0.0
         
-        # カテゴリ内の評価とレビュー数を取得
-        ratings = [p.rating for p in category_products if p.rating is not None]
-        reviews = [p.reviews_count for p in category_products]
+        # カテゴリ内の評価とレビュー数を取得（評価のある商品の組のみ）
+        rating_values, has_rating, review_counts = _rating_columns(category_products)
+        ratings = rating_values[has_rating]
+        reviews = review_counts[has_rating]
         
         if len(ratings) < 2:
             return 0.0
@@ -728,12 +759,12 @@ class SakuraDetector:
         
         return 0.0
     
-    def detect_review_burst(self, reviews: List[ProductReview]) -> float:
+    def detect_review_burst(self, reviews: ReviewCollection) -> float:
         """
         レビューバースト（短期間の大量投稿）を検出
         
         Args:
-            reviews: レビューリスト
+            reviews: レビューリストまたはReviewFrame
             
         Returns:
             float: バーストスコア（0.0-1.0）
@@ -741,16 +772,13 @@ class SakuraDetector:
         if len(reviews) < 10:
             return 0.0
         
-        # 日付でグループ化
-        dates = [r.review_date for r in reviews]
-        date_counts = pd.Series(dates).value_counts()
+        # 投稿日時でグループ化
+        dates = _as_frame(reviews).dates
+        _, date_counts = np.unique(dates, return_counts=True)
         
-        # 移動平均を計算
         if len(date_counts) > 3:
-            rolling_mean = date_counts.rolling(window=3).mean()
-            
             # 標準偏差の3倍を超える日があるか
-            std = date_counts.std()
+            std = date_counts.std(ddof=1)
             mean = date_counts.mean()
             
             if std > 0:
@@ -759,69 +787,59 @@ class SakuraDetector:
                     return min(max_burst / 5, 1.0)
         
         # 3日間で総レビューの50%以上が投稿された場合
-        sorted_dates = sorted(dates)
-        for i in range(len(sorted_dates) - 2):
-            three_day_window = [d for d in dates 
-                               if sorted_dates[i] <= d <= sorted_dates[i] + pd.Timedelta(days=3)]
-            if len(three_day_window) / len(reviews) >= 0.5:
-                return 0.85
+        sorted_dates = np.sort(dates)
+        starts = sorted_dates[:-2]
+        window_counts = (np.searchsorted(sorted_dates, starts + np.timedelta64(3, 'D'), side='right')
+                         - np.searchsorted(sorted_dates, starts, side='left'))
+        if (window_counts / len(reviews) >= 0.5).any():
+            return 0.85
         
         return 0.0
     
-    def analyze_sentiment_consistency(self, reviews: List[ProductReview]) -> float:
+    def analyze_sentiment_consistency(self, reviews: ReviewCollection) -> float:
         """
         レビューの感情一貫性を分析
         
         Args:
-            reviews: レビューリスト
+            reviews: レビューリストまたはReviewFrame
             
         Returns:
             float: 一貫性スコア（0.0-1.0、高いほど一貫している）
         """
-        if not reviews:
+        if len(reviews) == 0:
             return 1.0
         
-        inconsistencies = 0
+        # 簡易的な感情分析（肯定語・否定語の有無はReviewFrame作成時に判定済み）
+        frame = _as_frame(reviews)
         
-        for review in reviews:
-            # 簡易的な感情分析（実際はより高度な分析が必要）
-            positive_words = ['素晴らしい', '最高', '完璧', '良い', 'おすすめ']
-            negative_words = ['最悪', '悪い', 'ダメ', '失敗', '買わない']
-            
-            title_positive = any(word in review.title for word in positive_words)
-            title_negative = any(word in review.title for word in negative_words)
-            content_positive = any(word in review.content for word in positive_words)
-            content_negative = any(word in review.content for word in negative_words)
-            
-            # 高評価なのにネガティブな内容
-            if review.rating >= 4 and (title_negative or content_negative):
-                inconsistencies += 1
-            
-            # 低評価なのにポジティブな内容
-            if review.rating <= 2 and (title_positive or content_positive):
-                inconsistencies += 1
+        # 高評価なのにネガティブな内容、低評価なのにポジティブな内容
+        inconsistencies = int(
+            np.count_nonzero((frame.ratings >= 4) & frame.has_negative)
+            + np.count_nonzero((frame.ratings <= 2) & frame.has_positive)
+        )
         
         consistency_score = 1.0 - (inconsistencies / len(reviews))
         return max(consistency_score, 0.0)
     
     def calculate_merchant_reliability(self, merchant_id: str, 
-                                      merchant_products: List[Product]) -> float:
+                                      merchant_products: ProductCollection) -> float:
         """
         販売者の信頼度を計算
         
         Args:
             merchant_id: 販売者ID
-            merchant_products: 販売者の商品リスト
+            merchant_products: 販売者の商品リストまたはProductTable
             
         Returns:
             float: 信頼度スコア（0.0-1.0）
         """
-        if not merchant_products:
+        if len(merchant_products) == 0:
             return 0.5  # デフォルト値
         
         # 全商品が異常に高評価の場合は疑わしい
-        ratings = [p.rating for p in merchant_products if p.rating is not None]
-        if ratings:
+        rating_values, has_rating, _ = _rating_columns(merchant_products)
+        ratings = rating_values[has_rating]
+        if len(ratings):
             avg_rating = np.mean(ratings)
             if avg_rating > 4.7:  # 平均4.7以上は異常
                 return 0.2